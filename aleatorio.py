@@ -0,0 +1,79 @@
+import numpy as np
+
+# Finalidades com fluxo aleatório próprio (cada uma tem sua semente derivada)
+FINALIDADES = ('chegadas', 'revista', 'caminhada', 'catracas')
+
+# Coeficientes da aproximação racional de Acklam para a inversa da normal (erro relativo < 1.2e-9)
+_ACKLAM_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+             1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_ACKLAM_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+             6.680131188771972e+01, -1.328068155288572e+01, 1.0)
+_ACKLAM_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+             -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_ACKLAM_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+             3.754408661907416e+00, 1.0)
+_ACKLAM_CAUDA = 0.02425
+
+def quantil_normal(p: np.ndarray) -> np.ndarray:
+    """Inversa da CDF da normal padrão, vetorizada, para p em (0, 1)"""
+    p = np.asarray(p, dtype=float)
+    # caudas usam a mesma expressão: a de cima espelhada na de baixo
+    cauda = np.minimum(p, 1 - p)
+    q = np.sqrt(-2 * np.log(np.maximum(cauda, np.finfo(float).tiny)))
+    x_cauda = np.polyval(_ACKLAM_C, q) / np.polyval(_ACKLAM_D, q)
+    x_cauda = np.where(p < 0.5, x_cauda, -x_cauda)
+
+    q = p - 0.5
+    r = q * q
+    x_centro = q * np.polyval(_ACKLAM_A, r) / np.polyval(_ACKLAM_B, r)
+    return np.where(cauda < _ACKLAM_CAUDA, x_cauda, x_centro)
+
+class GeradorAntitetico:
+    """
+    Embrulha um np.random.Generator. No modo antitético devolve 1-U no lugar
+    de U e -Z no lugar de Z: a replicação espelhada usa os mesmos sorteios
+    da original, só que do "outro lado" da distribuição.
+    """
+
+    def __init__(self, gerador: np.random.Generator, antitetico: bool = False):
+        self._gerador = gerador
+        self.antitetico = antitetico
+
+    def random(self, size=None):
+        u = self._gerador.random(size)
+        return 1.0 - u if self.antitetico else u
+
+    def standard_normal(self, size=None):
+        z = self._gerador.standard_normal(size)
+        return -z if self.antitetico else z
+
+    def normal(self, loc: float = 0.0, scale: float = 1.0, size=None):
+        return loc + scale * self.standard_normal(size)
+
+    def uniform(self, low: float = 0.0, high: float = 1.0, size=None):
+        return low + (high - low) * self.random(size)
+
+    def lognormal(self, mean: float = 0.0, sigma: float = 1.0, size=None):
+        return np.exp(self.normal(mean, sigma, size))
+
+class FluxosAleatorios:
+    """
+    Um fluxo aleatório independente por finalidade (chegadas, revista,
+    caminhada, catracas), todos derivados de uma única semente.
+    Duas simulações com a mesma semente usam os mesmos números em cada etapa
+    (números aleatórios comuns), mesmo que a configuração mude.
+    """
+
+    def __init__(self, semente=None, antitetico: bool = False):
+        # deriva os fluxos de uma cópia (entropia + spawn_key): a mesma semente
+        # passada de novo, como no par antitético, recria exatamente os mesmos fluxos
+        if not isinstance(semente, np.random.SeedSequence):
+            semente = np.random.SeedSequence(semente)
+        self.semente = semente
+        self.antitetico = antitetico
+
+        base = np.random.SeedSequence(semente.entropy, spawn_key=semente.spawn_key)
+        sementes = base.spawn(len(FINALIDADES))
+        for finalidade, semente_filha in zip(FINALIDADES, sementes):
+            gerador = GeradorAntitetico(np.random.default_rng(semente_filha), antitetico)
+            setattr(self, finalidade, gerador)
@@ -0,0 +1,211 @@
+import math
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+
+import configuracao as config
+
+def _cdf_normal(z) -> np.ndarray:
+    z = np.asarray(z, dtype=float)
+    return 0.5 * (1.0 + np.array([math.erf(v / math.sqrt(2.0)) for v in z.ravel()]).reshape(z.shape))
+
+def _pdf_normal(z: float) -> float:
+    return math.exp(-0.5 * z * z) / math.sqrt(2.0 * math.pi)
+
+def momentos_revista() -> Tuple[float, float]:
+    """Média e 2º momento do tempo de revista (normal com piso de 5 s)"""
+    mu, sigma, piso = config.TEMPO_REVISTA_MEDIA, config.TEMPO_REVISTA_DESVIO, 5.0
+    z = (piso - mu) / sigma
+    abaixo = float(_cdf_normal(z))
+    media = piso * abaixo + mu * (1 - abaixo) + sigma * _pdf_normal(z)
+    segundo = piso ** 2 * abaixo + (mu ** 2 + sigma ** 2) * (1 - abaixo) + sigma * (mu + piso) * _pdf_normal(z)
+    return media, segundo
+
+def momentos_catraca() -> Tuple[float, float]:
+    """Média e 2º momento do tempo de catraca (lognormal rápida + extra quando dá problema)"""
+    def lognormal(media_config: float, desvio_config: float) -> Tuple[float, float]:
+        mu = math.log(media_config)
+        sigma = desvio_config / media_config
+        return math.exp(mu + sigma ** 2 / 2), math.exp(2 * mu + 2 * sigma ** 2)
+
+    media_rapido, segundo_rapido = lognormal(config.CATRACA_RAPIDA_MEDIA, config.CATRACA_RAPIDA_DESVIO)
+    media_extra, segundo_extra = lognormal(config.CATRACA_PROBLEMA_MEDIA, config.CATRACA_PROBLEMA_DESVIO)
+    p = config.PROBABILIDADE_PROBLEMA
+    return media_rapido + p * media_extra, segundo_rapido + 2 * p * media_rapido * media_extra + p * segundo_extra
+
+def probabilidade_espera(servidores: int, carga: np.ndarray) -> np.ndarray:
+    """
+    Erlang C: probabilidade de esperar numa M/M/c com carga oferecida
+    `carga` = λ/μ, vetorizado nos intervalos (1 quando ρ >= 1)
+    """
+    erlang_b = np.ones_like(carga)
+    for k in range(1, servidores + 1):
+        erlang_b = carga * erlang_b / (k + carga * erlang_b)
+    rho = carga / servidores
+    with np.errstate(divide='ignore', invalid='ignore'):
+        erlang_c = erlang_b / (1 - rho * (1 - erlang_b))
+    return np.where(rho < 1, erlang_c, 1.0)
+
+def deslocar(fluxo: np.ndarray, atraso, resolucao: float) -> np.ndarray:
+    """
+    Atrasa a massa de cada intervalo em `atraso` segundos (escalar ou um por
+    intervalo), dividindo-a entre os dois intervalos de destino. O que passa
+    do horizonte fica no último intervalo.
+    """
+    n = len(fluxo)
+    deslocamento = np.broadcast_to(np.asarray(atraso, dtype=float), (n,)) / resolucao
+    inteiro = np.floor(deslocamento).astype(int)
+    fracao = deslocamento - inteiro
+    destino = np.arange(n) + inteiro
+    resultado = np.zeros(n)
+    np.add.at(resultado, np.minimum(destino, n - 1), fluxo * (1 - fracao))
+    np.add.at(resultado, np.minimum(destino + 1, n - 1), fluxo * fracao)
+    return resultado
+
+class EstacaoAnalitica:
+    """
+    Uma etapa com `servidores` em paralelo e fila única, avaliada intervalo a
+    intervalo: modelo fluido para a fila que acumula quando a chegada passa
+    da capacidade, mais a espera estacionária M/G/c (Erlang C com a correção
+    de Allen-Cunneen) nos intervalos com folga.
+    """
+
+    def __init__(self, servidores: int, media_servico: float, segundo_momento: float, resolucao: float):
+        if servidores < 1:
+            # capacidade zero: a fila fluida e a espera não têm solução finita
+            raise ValueError(f"Etapa sem servidores ({servidores}): ninguém seria atendido")
+        self.servidores = servidores
+        self.media_servico = media_servico
+        self.resolucao = resolucao
+        self.capacidade = servidores * resolucao / media_servico  # atendimentos por intervalo
+
+        # chegadas de Poisson (ca² = 1) e variabilidade do serviço (cs²)
+        cs2 = segundo_momento / media_servico ** 2 - 1
+        self._fator_variabilidade = (1 + cs2) / 2
+
+    def avaliar(self, chegadas: np.ndarray) -> Dict[str, np.ndarray]:
+        """Espera, fila, utilização e saídas por intervalo a partir das chegadas esperadas"""
+        # fila fluida: recursão de Lindley com capacidade constante, resolvida com soma acumulada
+        soma = np.concatenate(([0.0], np.cumsum(chegadas - self.capacidade)))
+        fila_fluida = soma - np.minimum.accumulate(soma)
+        atendidos = chegadas - np.diff(fila_fluida)
+        espera_fluida = (fila_fluida[:-1] + fila_fluida[1:]) / 2 / self.capacidade * self.resolucao
+
+        # espera estacionária nos intervalos sem sobrecarga
+        taxa = chegadas / self.resolucao
+        carga = taxa * self.media_servico
+        rho = carga / self.servidores
+        with np.errstate(divide='ignore', invalid='ignore'):
+            espera_estacionaria = np.where(
+                rho < 1,
+                probabilidade_espera(self.servidores, carga) * self.media_servico
+                / (self.servidores * (1 - rho)) * self._fator_variabilidade,
+                0.0
+            )
+
+        return {
+            'chegadas': chegadas,
+            'espera': espera_fluida + espera_estacionaria,
+            'fila': fila_fluida[1:] + taxa * espera_estacionaria,
+            'utilizacao': np.minimum(atendidos / self.capacidade, 1.0),
+            # quem começa a ser atendido no intervalo sai depois da espera estacionária e do serviço
+            'saidas': deslocar(atendidos, espera_estacionaria + self.media_servico, self.resolucao)
+        }
+
+class ModeloAnalitico:
+    """
+    Avaliação aproximada de um cenário em milissegundos, para descartar
+    configurações ruins antes de rodar o SimuladorMineirao. A curva de
+    chegadas esperada (a mesma normal truncada do GeradorChegadas) passa
+    pela revista (M/G/c com os agentes) e, depois da caminhada de cada
+    esplanada, pela fila de cada portão (M/G/c com as catracas do portão).
+    Aceita os mesmos parâmetros de cenário do simulador.
+    """
+
+    def __init__(self, total_torcedores: int = None, agentes_revista: int = None,
+                 catracas_por_portao: Dict[str, int] = None, proporcao_esplanada_norte: float = None,
+                 resolucao: float = None, fim_minutos: float = None):
+        self.total_torcedores = total_torcedores if total_torcedores is not None else config.TOTAL_TORCEDORES
+        self.agentes_revista = agentes_revista if agentes_revista is not None else config.AGENTES_REVISTA
+        self.catracas_por_portao = {**config.CATRACAS_POR_PORTAO, **(catracas_por_portao or {})}
+        self.proporcao_esplanada_norte = (proporcao_esplanada_norte if proporcao_esplanada_norte is not None
+                                          else config.PROPORCAO_ESPLANADA_NORTE)
+        self.resolucao = resolucao if resolucao is not None else config.ANALITICO_RESOLUCAO
+        fim_minutos = fim_minutos if fim_minutos is not None else config.ANALITICO_FIM_MINUTOS
+
+        # horizonte em intervalos, com o início do jogo (t = 0) numa borda de intervalo
+        self._intervalos_antes_jogo = math.ceil(config.TEMPO_PRE_JOGO * 60 / self.resolucao)
+        self.inicio = -self._intervalos_antes_jogo * self.resolucao
+        self.num_intervalos = self._intervalos_antes_jogo + math.ceil(fim_minutos * 60 / self.resolucao)
+        self.portoes = config.obter_portoes()
+
+    def curva_chegadas(self) -> np.ndarray:
+        """Número esperado de chegadas em cada intervalo"""
+        centro = -config.CHEGADAS_CENTRO_MINUTOS * 60
+        desvio = config.CHEGADAS_DESVIO_MINUTOS * 60
+        limites = np.array([-config.CHEGADAS_INICIO_MINUTOS * 60, -config.CHEGADAS_FIM_MINUTOS * 60], dtype=float)
+        bordas = self.inicio + np.arange(self.num_intervalos + 1) * self.resolucao
+
+        acumulada = _cdf_normal((np.clip(bordas, limites[0], limites[1]) - centro) / desvio)
+        massa = np.diff(_cdf_normal((limites - centro) / desvio))[0]
+        return self.total_torcedores * np.diff(acumulada) / massa
+
+    def avaliar(self) -> Dict[str, Any]:
+        """Passa a curva de chegadas pelas etapas e resume as métricas do cenário"""
+        revista = EstacaoAnalitica(self.agentes_revista, *momentos_revista(), self.resolucao)
+        etapa_revista = revista.avaliar(self.curva_chegadas())
+
+        # portão proporcional à capacidade; caminhada base de cada esplanada (fator médio 1)
+        pesos = np.array([config.CAPACIDADES_PORTOES[p] for p in self.portoes], dtype=float)
+        pesos /= pesos.sum()
+        proporcoes = {'Norte': self.proporcao_esplanada_norte, 'Sul': 1 - self.proporcao_esplanada_norte}
+        media_catraca, segundo_catraca = momentos_catraca()
+
+        etapas_catracas = {}
+        for portao, peso in zip(self.portoes, pesos):
+            chegadas = sum(
+                deslocar(etapa_revista['saidas'] * peso * proporcao,
+                         config.TEMPOS_CAMINHADA[esplanada][portao], self.resolucao)
+                for esplanada, proporcao in proporcoes.items()
+            )
+            estacao = EstacaoAnalitica(self.catracas_por_portao[portao], media_catraca, segundo_catraca,
+                                       self.resolucao)
+            etapas_catracas[portao] = estacao.avaliar(chegadas)
+
+        return self._relatorio(etapa_revista, etapas_catracas)
+
+    def _relatorio(self, etapa_revista: Dict[str, np.ndarray],
+                   etapas_catracas: Dict[str, Dict[str, np.ndarray]]) -> Dict[str, Any]:
+        def espera_media(etapas: List[Dict[str, np.ndarray]]) -> float:
+            chegadas = sum(e['chegadas'].sum() for e in etapas)
+            return float(sum((e['chegadas'] * e['espera']).sum() for e in etapas) / chegadas) if chegadas > 0 else 0.0
+
+        antes_jogo = self._intervalos_antes_jogo
+        percentual_por_portao = {}
+        dentro = 0.0
+        for portao, etapa in etapas_catracas.items():
+            dentro_portao = etapa['saidas'][:antes_jogo].sum()
+            total_portao = etapa['chegadas'].sum()
+            percentual_por_portao[portao] = float(dentro_portao / total_portao * 100) if total_portao > 0 else 0.0
+            dentro += dentro_portao
+
+        espera_revista = espera_media([etapa_revista])
+        espera_catraca = espera_media(list(etapas_catracas.values()))
+
+        linha_do_tempo = {'tempo_minutos': (self.inicio + np.arange(self.num_intervalos) * self.resolucao) / 60,
+                          'revista_fila': etapa_revista['fila'],
+                          'revista_utilizacao': etapa_revista['utilizacao']}
+        for portao, etapa in etapas_catracas.items():
+            linha_do_tempo[f'portao_{portao}_fila'] = etapa['fila']
+            linha_do_tempo[f'portao_{portao}_utilizacao'] = etapa['utilizacao']
+
+        return {
+            'percentual_entrada_antes_jogo': float(dentro / self.total_torcedores * 100),
+            'percentual_antes_jogo_por_portao': percentual_por_portao,
+            'tempo_medio_espera_revista': espera_revista,
+            'tempo_medio_espera_catraca': espera_catraca,
+            'tempo_medio_fila_total': espera_revista + espera_catraca,
+            'fila_maxima_revista': float(etapa_revista['fila'].max()),
+            'filas_maximas_catracas': {p: float(e['fila'].max()) for p, e in etapas_catracas.items()},
+            'linha_do_tempo': linha_do_tempo
+        }
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+import configuracao as config
+
+# Módulos cujo código entra na chave: mudou o simulador, muda a chave
+MODULOS_SIMULADOR = ('aleatorio.py', 'eventos.py', 'recursos.py', 'estatisticas.py',
+                     'linha_do_tempo.py', 'motor_vetorizado.py', 'main.py')
+
+# Parâmetros de execução que não mudam o resultado de uma replicação
+PARAMETROS_FORA_DA_CHAVE = {'NUMERO_SIMULACOES', 'NUM_PROCESSOS', 'SEMENTE', 'PARADA_SEQUENCIAL'}
+PREFIXOS_FORA_DA_CHAVE = ('PRECISAO_', 'VARREDURA_', 'CACHE_', 'OTIMIZACAO_', 'EXPORTACAO_', 'RASTRO_')
+
+_versao_codigo: Optional[str] = None
+
+def versao_codigo() -> str:
+    """Hash do código-fonte do simulador (calculado uma vez por processo)"""
+    global _versao_codigo
+    if _versao_codigo is None:
+        diretorio = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.sha256()
+        for modulo in MODULOS_SIMULADOR:
+            with open(os.path.join(diretorio, modulo), 'rb') as f:
+                h.update(f.read())
+        _versao_codigo = h.hexdigest()
+    return _versao_codigo
+
+def parametros_configuracao() -> Dict[str, str]:
+    """Todos os parâmetros de configuracao.py que afetam a simulação (como texto)"""
+    return {
+        nome: repr(valor)
+        for nome, valor in sorted(vars(config).items())
+        if nome.isupper() and nome not in PARAMETROS_FORA_DA_CHAVE
+        and not nome.startswith(PREFIXOS_FORA_DA_CHAVE)
+    }
+
+def chave_replicacao(semente, total_torcedores: int = None, antitetico: bool = False,
+                     cenario: Dict = None) -> str:
+    """Chave de uma replicação: configuração + cenário + semente + versão do código"""
+    if not isinstance(semente, np.random.SeedSequence):
+        semente = np.random.SeedSequence(semente) if semente is not None else None
+    conteudo = {
+        'configuracao': parametros_configuracao(),
+        'cenario': json.dumps(cenario or {}, sort_keys=True, default=repr),
+        'semente': None if semente is None else [str(semente.entropy), list(semente.spawn_key)],
+        'total_torcedores': total_torcedores or config.TOTAL_TORCEDORES,
+        'antitetico': antitetico,
+        'codigo': versao_codigo()
+    }
+    return hashlib.sha256(json.dumps(conteudo, sort_keys=True).encode()).hexdigest()
+
+class CacheResultados:
+    """
+    Cache em disco dos resumos de replicação (um pickle por chave).
+    Cada leitura atualiza a data do arquivo; ao passar do tamanho máximo,
+    os arquivos usados há mais tempo são apagados (LRU).
+    """
+    
+    def __init__(self, diretorio: str = None, tamanho_maximo_mb: float = None):
+        self.diretorio = diretorio or config.CACHE_DIRETORIO
+        tamanho_maximo_mb = tamanho_maximo_mb if tamanho_maximo_mb is not None else config.CACHE_TAMANHO_MAXIMO_MB
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        os.makedirs(self.diretorio, exist_ok=True)
+    
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, f'{chave}.pkl')
+    
+    def obter(self, chave: str) -> Optional[Dict[str, Any]]:
+        """Resultado guardado para a chave, ou None"""
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'rb') as f:
+                resultado = pickle.load(f)
+            os.utime(caminho)  # marca como usado agora (ordem do LRU)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        return resultado
+    
+    def guardar(self, chave: str, resultado: Dict[str, Any]):
+        """Grava o resultado (escrita atômica, seguro com vários processos) e aplica o limite"""
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix='.tmp')
+        with os.fdopen(descritor, 'wb') as f:
+            pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, self._caminho(chave))
+        self._aplicar_limite()
+    
+    def _arquivos(self):
+        arquivos = []
+        for entrada in os.scandir(self.diretorio):
+            if entrada.name.endswith('.pkl'):
+                info = entrada.stat()
+                arquivos.append((info.st_mtime, info.st_size, entrada.path))
+        return arquivos
+    
+    def tamanho_total(self) -> int:
+        """Bytes ocupados pelo cache"""
+        return sum(tamanho for _, tamanho, _ in self._arquivos())
+    
+    def _aplicar_limite(self):
+        arquivos = sorted(self._arquivos())
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, caminho in arquivos:
+            if total <= self.tamanho_maximo:
+                break
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass  # outro processo já apagou
+            total -= tamanho
+    
+    def limpar(self):
+        for _, _, caminho in self._arquivos():
+            os.remove(caminho)
@@ -5,16 +5,87 @@ TOTAL_TORCEDORES = 50000
 NUMERO_SIMULACOES = 3
 AGENTES_REVISTA = 200
 
+# Execução das replicações
+NUM_PROCESSOS = 1   # > 1 roda as replicações em paralelo (ProcessPoolExecutor)
+SEMENTE = None      # semente base; cada replicação recebe uma semente derivada dela
+REPLICACOES_ANTITETICAS = False  # replicações em pares espelhados (NUMERO_SIMULACOES par)
+
+# Parada sequencial: replica em lotes até o IC das métricas ficar estreito
+PARADA_SEQUENCIAL = False
+PRECISAO_METRICAS = ['percentual_entrada_antes_jogo', 'tempo_medio_fila_total']
+PRECISAO_RELATIVA = 0.02         # meia-largura do IC / média
+PRECISAO_CONFIANCA = 0.95
+PRECISAO_LOTE = 6                # replicações por lote (par, por causa do modo antitético)
+PRECISAO_MAXIMO_SIMULACOES = 200
+
 # Tempos (minutos)
 TEMPO_PRE_JOGO = 180  # começa 2h antes do jogo
 INICIO_JOGO = 0
 PICO_CHEGADAS_MINUTOS = 60  # pico aos 60 min antes
 CHEGADAS_INICIO_MINUTOS = TEMPO_PRE_JOGO
 CHEGADAS_FIM_MINUTOS = 0
+CHEGADAS_CENTRO_MINUTOS = 55  # centro da normal das chegadas (min antes do jogo)
+CHEGADAS_DESVIO_MINUTOS = 17
+
+# Varredura de parâmetros (varredura.py): cenários × replicações num CSV
+VARREDURA_ARQUIVO = 'varredura.csv'
+VARREDURA_REPLICACOES = 5
+VARREDURA_GRADE = {
+    'agentes_revista': [160, 180, 200, 220, 240]
+}
+VARREDURA_TRIAGEM_MINIMA = None  # % mínimo previsto pelo modelo analítico para simular o cenário
+
+# Dimensionamento (dimensionamento.py): menor equipe que atinge a meta de entrada
+OTIMIZACAO_META = 98.0                 # % dentro do estádio no início do jogo
+OTIMIZACAO_CONFIANCA = 0.95            # confiança do limite inferior
+OTIMIZACAO_REPLICACOES_INICIAIS = 5
+OTIMIZACAO_LOTE = 5                    # replicações extras enquanto a decisão estiver incerta
+OTIMIZACAO_MAXIMO_REPLICACOES = 30
+OTIMIZACAO_LIMITES_AGENTES = (50, 400)
+OTIMIZACAO_MAXIMO_CATRACAS = 60        # por portão
+OTIMIZACAO_METAS_POR_PORTAO = False    # exige a meta também em cada portão (Bonferroni na confiança)
+OTIMIZACAO_TRIAGEM_FOLGA = 5.0         # pontos abaixo da meta aceitos pelo modelo analítico (None desliga)
+
+# Modelo analítico (analitico.py): triagem rápida de cenários antes do DES
+ANALITICO_RESOLUCAO = 30         # segundos por intervalo
+ANALITICO_FIM_MINUTOS = 120      # horizonte depois do início do jogo
+
+# Cache em disco das replicações (só para semente fixa)
+CACHE_RESULTADOS = False
+CACHE_DIRETORIO = '.cache_resultados'
+CACHE_TAMANHO_MAXIMO_MB = 500    # acima disso apaga os usados há mais tempo (LRU)
+
+# Exportação da tabela de torcedores de cada replicação (exportacao.py): um .npy
+# por coluna em <diretório>/replicacao_NNNN, para abrir com mmap. None desliga
+EXPORTACAO_DIRETORIO = None
+
+# Estrutura da FEL: 'heap' (heap binário) ou 'calendario' (calendar queue).
+# A ordem dos eventos é a mesma nas duas, mas aqui a FEL é pequena (as chegadas
+# entram como fluxo) e a calendar queue fica ~10-30% mais lenta (50 mil
+# torcedores: ~1,4-1,8 s no heap e ~1,9-2,3 s na calendar queue): use o heap
+BACKEND_FEL = 'heap'
+
+# Motor: 'eventos' (laço de eventos com a FEL) ou 'vetorizado' (mesmos tempos,
+# calculados etapa por etapa com um heap de servidores livres)
+MOTOR_SIMULACAO = 'eventos'
+
+# Replicações do motor vetorizado simuladas juntas (arrays replicações × torcedores).
+# 0 desliga; > 0 é o tamanho do bloco usado pelo GerenciadorSimulacoes
+REPLICACOES_LOTE_VETORIZADO = 0
+
+# Rastro de eventos (rastreamento.py), ligado com SimuladorMineirao(arquivo_rastro=...)
+RASTRO_TAMANHO_BLOCO = 65536     # registros por bloco gravado
+RASTRO_COMPRESSAO = None         # None, 'zlib', 'lzma' ou 'bz2'
 
 # Gráficos
 INTERVALO_HISTOGRAMA_MINUTOS = 5
 
+# Linha do tempo das filas (opcional): min/média/máx por intervalo fixo
+LINHA_DO_TEMPO = False
+LINHA_DO_TEMPO_RESOLUCAO = 10                      # segundos por intervalo
+LINHA_DO_TEMPO_INICIO_MINUTOS = -TEMPO_PRE_JOGO    # relativo ao início do jogo
+LINHA_DO_TEMPO_FIM_MINUTOS = 120
+
 # Esplanadas
 PROPORCAO_ESPLANADA_NORTE = 0.5
 
@@ -74,10 +145,18 @@ PROBABILIDADE_PROBLEMA = 0.15
 CATRACA_PROBLEMA_MEDIA = 20
 CATRACA_PROBLEMA_DESVIO = 8
 
+# Estatísticas streaming: memória constante no número de torcedores
+ESTATISTICAS_STREAMING = False   # True: Welford + t-digest em vez das listas de amostras
+TDIGEST_COMPRESSAO = 200         # mais alto = percentis mais precisos (e mais centroides)
+TAMANHO_BUFFER_STREAMING = 4096  # amostras acumuladas antes de cada descarga em lote
+
 # algumas funções úteis
 def obter_portoes():
     return list(CAPACIDADES_PORTOES.keys())
 
+def obter_esplanadas():
+    return list(TEMPOS_CAMINHADA.keys())
+
 def capacidade_total():
     return sum(CAPACIDADES_PORTOES.values())
 
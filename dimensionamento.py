@@ -0,0 +1,356 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Optional
+import math
+import statistics
+
+import numpy as np
+
+from main import executar_replicacao
+from analitico import ModeloAnalitico
+from estatisticas import quantil_t_student
+import configuracao as config
+
+def avaliar_replicacao(semente: np.random.SeedSequence, total_torcedores: int,
+                       agentes_revista: int, catracas_por_portao: Dict[str, int],
+                       usar_cache: bool = True) -> Dict[str, float]:
+    """
+    Percentual de torcedores dentro no início do jogo (geral e por portão)
+    numa replicação. No nível do módulo para rodar no ProcessPoolExecutor.
+    """
+    cenario = {'agentes_revista': agentes_revista, 'catracas_por_portao': catracas_por_portao}
+    resultado = executar_replicacao(0, semente, total_torcedores, cenario=cenario, usar_cache=usar_cache)
+    relatorio = resultado['relatorio']
+    metricas = {'geral': relatorio['resumo_geral']['percentual_entrada_antes_jogo']}
+    for portao, dados in relatorio['distribuicao_por_portao'].items():
+        metricas[portao] = dados['percentual_antes_jogo']
+    return metricas
+
+class OtimizadorDimensionamento:
+    """
+    Procura o menor número de agentes de revista e de catracas por portão
+    que colocam pelo menos `meta`% dos torcedores dentro do estádio no início
+    do jogo, com a confiança pedida (limite inferior do IC unilateral).
+    
+    Busca por bisseção: primeiro nos agentes (com as catracas no máximo),
+    depois nas catracas. Com a meta só no geral, as catracas descem numa
+    escala proporcional à capacidade dos portões e depois cada portão desce
+    sozinho até onde a meta geral deixa (nenhum portão perde uma catraca sem
+    quebrar a meta). Com `metas_por_portao`, cada portão também precisa da
+    meta, as bisseções dos portões andam juntas e a confiança de cada teste
+    é corrigida por Bonferroni para valer no conjunto das 1 + 6 metas.
+    
+    Todas as configurações usam as mesmas sementes (números aleatórios
+    comuns) e cada avaliação só roda mais replicações enquanto a decisão
+    estiver incerta. Com `folga_triagem`, o modelo analítico sobe o limite
+    inferior das bisseções até onde ele prevê pelo menos meta - folga (o
+    que fica abaixo nem é simulado).
+    """
+    
+    def __init__(self, meta: float = None, confianca: float = None, semente: int = None,
+                 replicacoes_iniciais: int = None, tamanho_lote: int = None, maximo_replicacoes: int = None,
+                 limites_agentes: Tuple[int, int] = None, maximo_catracas: int = None,
+                 total_torcedores: int = None, num_processos: int = None, folga_triagem: float = None,
+                 metas_por_portao: bool = None):
+        self.meta = meta if meta is not None else config.OTIMIZACAO_META
+        self.confianca = confianca or config.OTIMIZACAO_CONFIANCA
+        self.replicacoes_iniciais = replicacoes_iniciais or config.OTIMIZACAO_REPLICACOES_INICIAIS
+        self.tamanho_lote = tamanho_lote or config.OTIMIZACAO_LOTE
+        self.maximo_replicacoes = maximo_replicacoes or config.OTIMIZACAO_MAXIMO_REPLICACOES
+        self.limites_agentes = limites_agentes or config.OTIMIZACAO_LIMITES_AGENTES
+        self.maximo_catracas = maximo_catracas or config.OTIMIZACAO_MAXIMO_CATRACAS
+        self.total_torcedores = total_torcedores or config.TOTAL_TORCEDORES
+        self.num_processos = num_processos or config.NUM_PROCESSOS
+        self.folga_triagem = folga_triagem if folga_triagem is not None else config.OTIMIZACAO_TRIAGEM_FOLGA
+        self.portoes = config.obter_portoes()
+        self.metas_por_portao = (metas_por_portao if metas_por_portao is not None
+                                 else config.OTIMIZACAO_METAS_POR_PORTAO)
+        
+        # métricas que precisam da meta; com várias, Bonferroni na confiança de cada teste
+        self._metricas_meta = ['geral'] + self.portoes if self.metas_por_portao else ['geral']
+        self._confianca_teste = 1 - (1 - self.confianca) / len(self._metricas_meta)
+        
+        # semente fixa: a replicação r é a mesma em todas as configurações
+        semente = semente if semente is not None else config.SEMENTE
+        # semente sorteada aqui não se repete em outra execução: não vale a pena guardar no cache
+        self._usar_cache = semente is not None
+        if semente is None:
+            semente = np.random.SeedSequence().entropy
+        self.semente = semente
+        self._sementes = np.random.SeedSequence(semente).spawn(self.maximo_replicacoes)
+        
+        # amostras já rodadas por configuração (agentes, catracas por portão)
+        self._amostras: Dict[Tuple, List[Dict[str, float]]] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.replicacoes_executadas = 0
+    
+    def _chave(self, agentes: int, catracas: Dict[str, int]) -> Tuple:
+        return (agentes,) + tuple(catracas[p] for p in self.portoes)
+    
+    def _amostrar(self, agentes: int, catracas: Dict[str, int], quantidade: int) -> List[Dict[str, float]]:
+        """Garante `quantidade` replicações da configuração (reaproveita as já rodadas)"""
+        amostras = self._amostras.setdefault(self._chave(agentes, catracas), [])
+        novas = range(len(amostras), min(quantidade, self.maximo_replicacoes))
+        if not novas:
+            return amostras
+        
+        sementes = [self._sementes[r] for r in novas]
+        if self._executor is not None and len(sementes) > 1:
+            n = len(sementes)
+            amostras.extend(self._executor.map(
+                avaliar_replicacao, sementes, [self.total_torcedores] * n, [agentes] * n, [catracas] * n,
+                [self._usar_cache] * n
+            ))
+        else:
+            amostras.extend(
+                avaliar_replicacao(s, self.total_torcedores, agentes, catracas, self._usar_cache)
+                for s in sementes
+            )
+        self.replicacoes_executadas += len(sementes)
+        return amostras
+    
+    def _intervalo(self, valores: List[float]) -> Tuple[float, float, float]:
+        """Média e limites unilaterais (inferior, superior) com a confiança de cada teste"""
+        media = statistics.mean(valores)
+        n = len(valores)
+        if n < 2:
+            return media, -math.inf, math.inf
+        meia_largura = quantil_t_student(self._confianca_teste, n - 1) * statistics.stdev(valores) / math.sqrt(n)
+        return media, media - meia_largura, media + meia_largura
+    
+    def _decidir(self, agentes: int, catracas: Dict[str, int], metricas: List[str]) -> Dict[str, bool]:
+        """
+        Decide para cada métrica se atinge a meta. Roda lotes enquanto alguma
+        estiver indefinida (limite inferior < meta <= limite superior); no
+        máximo de replicações, indefinida conta como não atingida.
+        """
+        quantidade = self.replicacoes_iniciais
+        while True:
+            amostras = self._amostrar(agentes, catracas, quantidade)
+            decisoes = {}
+            indefinidas = False
+            for metrica in metricas:
+                _, inferior, superior = self._intervalo([a[metrica] for a in amostras])
+                if inferior >= self.meta:
+                    decisoes[metrica] = True
+                elif superior < self.meta:
+                    decisoes[metrica] = False
+                else:
+                    decisoes[metrica] = False
+                    indefinidas = True
+            if not indefinidas or len(amostras) >= self.maximo_replicacoes:
+                return decisoes
+            quantidade = len(amostras) + self.tamanho_lote
+    
+    def _atinge_meta(self, agentes: int, catracas: Dict[str, int]) -> bool:
+        """Meta geral atingida (e a de todos os portões, com metas_por_portao)"""
+        return all(self._decidir(agentes, catracas, self._metricas_meta).values())
+    
+    def _bissecao(self, atinge, baixo: int, alto: int) -> int:
+        """Menor valor em [baixo, alto] com atinge(valor) (alto se nenhum menor atinge)"""
+        while baixo < alto:
+            meio = (baixo + alto) // 2
+            if atinge(meio):
+                alto = meio
+            else:
+                baixo = meio + 1
+        return alto
+    
+    def minimo_agentes(self, catracas: Dict[str, int], inicio: int = None) -> Optional[int]:
+        """
+        Menor número de agentes que atinge a meta com essas catracas (None se
+        nem o máximo atinge). A fila da revista é compartilhada, então agentes
+        de menos derrubam os portões também.
+        """
+        baixo = inicio or self.limites_agentes[0]
+        alto = self.limites_agentes[1]
+        if not self._atinge_meta(alto, catracas):
+            return None
+        return self._bissecao(lambda agentes: self._atinge_meta(agentes, catracas), baixo, alto)
+    
+    def catracas_escalonadas(self, escala: int) -> Dict[str, int]:
+        """Catracas proporcionais à capacidade de cada portão (o maior fica com `escala`)"""
+        maior = max(config.CAPACIDADES_PORTOES[p] for p in self.portoes)
+        return {p: max(1, math.ceil(escala * config.CAPACIDADES_PORTOES[p] / maior)) for p in self.portoes}
+    
+    def minimo_catracas(self, agentes: int, inicio=None) -> Dict[str, Optional[int]]:
+        """
+        Menos catracas por portão que mantêm a meta com esses agentes (None nos
+        portões sem solução). `inicio` é o limite inferior vindo da triagem:
+        a escala (meta geral) ou um dicionário por portão (metas_por_portao).
+        """
+        if self.metas_por_portao:
+            return self._minimo_catracas_por_portao(agentes, inicio)
+        return self._minimo_catracas_geral(agentes, inicio)
+    
+    def _minimo_catracas_geral(self, agentes: int, inicio: int = None) -> Dict[str, Optional[int]]:
+        """
+        Meta só no geral: bisseção na escala proporcional (portões equilibrados)
+        e depois cada portão desce sozinho, com os outros fixos (com a triagem,
+        só até onde o modelo analítico ainda prevê a meta)
+        """
+        maximas = {p: self.maximo_catracas for p in self.portoes}
+        if not self._atinge_meta(agentes, maximas):
+            return {p: None for p in self.portoes}
+        
+        if self._atinge_meta(agentes, self.catracas_escalonadas(self.maximo_catracas)):
+            escala = self._bissecao(lambda e: self._atinge_meta(agentes, self.catracas_escalonadas(e)),
+                                    min(inicio or 1, self.maximo_catracas), self.maximo_catracas)
+            catracas = self.catracas_escalonadas(escala)
+        else:
+            catracas = maximas
+        
+        for portao in self.portoes:
+            baixo = 1
+            if self.folga_triagem is not None:
+                # o que o modelo analítico já reprova (com os outros portões fixos) nem é simulado
+                baixo = self._bissecao(lambda c: self._previsto_atinge(agentes, {**catracas, portao: c}),
+                                       1, catracas[portao])
+            catracas[portao] = self._bissecao(
+                lambda c: self._atinge_meta(agentes, {**catracas, portao: c}), baixo, catracas[portao]
+            )
+        return catracas
+    
+    def _minimo_catracas_por_portao(self, agentes: int, inicio: Dict[str, int] = None) -> Dict[str, Optional[int]]:
+        """
+        Menor número de catracas de cada portão que atinge a meta do portão.
+        As bisseções dos portões andam juntas: cada simulação testa o ponto
+        médio de todos os portões ainda indefinidos.
+        """
+        baixo = {p: (inicio or {}).get(p, 1) for p in self.portoes}
+        alto = {p: self.maximo_catracas for p in self.portoes}
+        
+        decisoes = self._decidir(agentes, alto, self.portoes)
+        inviaveis = [p for p in self.portoes if not decisoes[p]]
+        
+        while any(baixo[p] < alto[p] for p in self.portoes if p not in inviaveis):
+            meio = {p: (baixo[p] + alto[p]) // 2 if p not in inviaveis else alto[p] for p in self.portoes}
+            em_busca = [p for p in self.portoes if p not in inviaveis and baixo[p] < alto[p]]
+            decisoes = self._decidir(agentes, meio, em_busca)
+            for p in em_busca:
+                if decisoes[p]:
+                    alto[p] = meio[p]
+                else:
+                    baixo[p] = meio[p] + 1
+        
+        return {p: (None if p in inviaveis else alto[p]) for p in self.portoes}
+    
+    def _previsto_atinge(self, agentes: int, catracas: Dict[str, int]) -> bool:
+        """O modelo analítico prevê pelo menos meta - folga nas métricas da meta"""
+        limiar = self.meta - self.folga_triagem
+        previsto = ModeloAnalitico(self.total_torcedores, agentes, catracas).avaliar()
+        if previsto['percentual_entrada_antes_jogo'] < limiar:
+            return False
+        return not self.metas_por_portao or all(
+            v >= limiar for v in previsto['percentual_antes_jogo_por_portao'].values()
+        )
+    
+    def triagem_agentes(self, catracas: Dict[str, int]) -> int:
+        """Limite inferior de agentes segundo o modelo analítico"""
+        return self._bissecao(lambda agentes: self._previsto_atinge(agentes, catracas),
+                                      *self.limites_agentes)
+    
+    def triagem_catracas(self, agentes: int):
+        """
+        Limite inferior das catracas segundo o modelo analítico: a escala
+        proporcional (meta geral) ou as catracas de cada portão (metas_por_portao)
+        """
+        if not self.metas_por_portao:
+            return self._bissecao(
+                lambda escala: self._previsto_atinge(agentes, self.catracas_escalonadas(escala)),
+                1, self.maximo_catracas
+            )
+        
+        limiar = self.meta - self.folga_triagem
+        catracas_maximas = {p: self.maximo_catracas for p in self.portoes}
+        
+        def atinge_portao(portao: str):
+            def atinge(catracas: int) -> bool:
+                previsto = ModeloAnalitico(self.total_torcedores, agentes, {**catracas_maximas, portao: catracas})
+                return previsto.avaliar()['percentual_antes_jogo_por_portao'][portao] >= limiar
+            return atinge
+        
+        return {p: self._bissecao(atinge_portao(p), 1, self.maximo_catracas) for p in self.portoes}
+    
+    def otimizar(self, verbose: bool = True) -> Dict:
+        """Executa a busca completa e devolve a configuração mínima encontrada"""
+        if self.num_processos > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.num_processos)
+        try:
+            return self._otimizar(verbose)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+    
+    def _otimizar(self, verbose: bool) -> Dict:
+        if verbose:
+            alcance = "no geral e em cada portão" if self.metas_por_portao else "no geral"
+            print(f"🎯 Meta: ≥{self.meta:.1f}% dentro no início do jogo ({alcance}) com {self.confianca:.0%} de confiança")
+            print(f"🔢 Replicações por configuração: {self.replicacoes_iniciais} a {self.maximo_replicacoes}")
+        
+        # 1) agentes, com todas as catracas no máximo
+        catracas_maximas = {p: self.maximo_catracas for p in self.portoes}
+        inicio_agentes = None
+        if self.folga_triagem is not None:
+            inicio_agentes = self.triagem_agentes(catracas_maximas)
+            if verbose:
+                print(f"🧮 Triagem analítica: a partir de {inicio_agentes} agentes")
+        agentes = self.minimo_agentes(catracas_maximas, inicio=inicio_agentes)
+        if agentes is None:
+            raise ValueError(f"Nem {self.limites_agentes[1]} agentes atingem a meta; aumente OTIMIZACAO_LIMITES_AGENTES")
+        if verbose:
+            print(f"👥 Agentes de revista: {agentes} (catracas no máximo)")
+        
+        # 2) catracas de cada portão com esses agentes
+        inicio_catracas = None
+        if self.folga_triagem is not None:
+            inicio_catracas = self.triagem_catracas(agentes)
+            if verbose:
+                print(f"🧮 Triagem analítica: catracas a partir de {inicio_catracas}")
+        catracas = self.minimo_catracas(agentes, inicio=inicio_catracas)
+        sem_solucao = [p for p, c in catracas.items() if c is None]
+        if sem_solucao:
+            raise ValueError(f"Meta não atingida nem com {self.maximo_catracas} catracas (portões {sem_solucao})")
+        if verbose:
+            print(f"🚪 Catracas por portão: {catracas}")
+        
+        # 3) confere as metas com as catracas reduzidas (se falhar, sobe os agentes)
+        if not self._atinge_meta(agentes, catracas):
+            agentes = self.minimo_agentes(catracas, inicio=agentes + 1)
+            if agentes is None:
+                raise ValueError("Metas não atingidas com as catracas mínimas por portão")
+            if verbose:
+                print(f"👥 Agentes ajustados para {agentes} com as catracas reduzidas")
+        
+        amostras = self._amostrar(agentes, catracas, self.replicacoes_iniciais)
+        media, inferior, _ = self._intervalo([a['geral'] for a in amostras])
+        
+        resultado = {
+            'agentes_revista': agentes,
+            'catracas_por_portao': catracas,
+            'percentual_entrada_antes_jogo': media,
+            'limite_inferior': inferior,
+            'replicacoes_na_solucao': len(amostras),
+            'configuracoes_avaliadas': len(self._amostras),
+            'replicacoes_executadas': self.replicacoes_executadas,
+            'limites_agentes': tuple(self.limites_agentes),
+            'limites_catracas': (1, self.maximo_catracas)
+        }
+        
+        if verbose:
+            print("=" * 60)
+            print(f"✅ {agentes} agentes | catracas {catracas} (total {sum(catracas.values())})")
+            print(f"📊 Dentro no início do jogo: {media:.2f}% (limite inferior {inferior:.2f}%, "
+                  f"{len(amostras)} replicações)")
+            print(f"⚙️  {self.replicacoes_executadas} replicações em {len(self._amostras)} configurações "
+                  f"(busca em agentes {self.limites_agentes[0]}-{self.limites_agentes[1]}, "
+                  f"catracas 1-{self.maximo_catracas} por portão)")
+        return resultado
+
+def main():
+    print("🏟️ DIMENSIONAMENTO DE EQUIPE - ESTÁDIO MINEIRÃO")
+    print("=" * 50)
+    OtimizadorDimensionamento().otimizar()
+
+if __name__ == "__main__":
+    main()
@@ -1,196 +1,490 @@
 import statistics
+import math
 from typing import List, Dict, Any
-from recursos import Torcedor
+
+import numpy as np
+
+from recursos import CadastroTorcedores
 import configuracao as config
 
-class EstatisticasSimulacao:
+def quantil_t_student(probabilidade: float, graus_liberdade: int) -> float:
+    """
+    Quantil da t de Student. Exato para 1 e 2 graus de liberdade; acima disso
+    usa a expansão de Cornish-Fisher em torno do quantil da normal.
+    """
+    if graus_liberdade == 1:
+        return math.tan(math.pi * (probabilidade - 0.5))
+    if graus_liberdade == 2:
+        return (2 * probabilidade - 1) / math.sqrt(2 * probabilidade * (1 - probabilidade))
+    
+    z = statistics.NormalDist().inv_cdf(probabilidade)
+    v = graus_liberdade
+    return (z
+            + (z**3 + z) / (4 * v)
+            + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * v**2)
+            + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * v**3)
+            + (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / (92160 * v**4))
+
+class AcumuladorWelford:
+    """Contagem, média e variância em uma passada (Welford), com memória constante"""
+    
     def __init__(self):
-        self.torcedores_completos: List[Torcedor] = []
-        self.torcedores_por_portao: Dict[str, List[Torcedor]] = {
-            portao: [] for portao in config.obter_portoes()
+        self.count = 0
+        self.media = 0.0
+        self._m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+    
+    def adicionar(self, valor: float):
+        self.count += 1
+        delta = valor - self.media
+        self.media += delta / self.count
+        self._m2 += delta * (valor - self.media)
+        self.minimo = min(self.minimo, valor)
+        self.maximo = max(self.maximo, valor)
+    
+    def adicionar_lote(self, valores: np.ndarray):
+        """Junta um lote de valores de uma vez (mesma conta da mescla)"""
+        if len(valores) == 0:
+            return
+        lote = AcumuladorWelford()
+        lote.count = len(valores)
+        lote.media = float(np.mean(valores))
+        lote._m2 = float(np.sum((valores - lote.media) ** 2))
+        lote.minimo = float(np.min(valores))
+        lote.maximo = float(np.max(valores))
+        self.mesclar(lote)
+    
+    def mesclar(self, outro: 'AcumuladorWelford'):
+        """Junta outro acumulador (fórmula de Chan para variâncias combinadas)"""
+        if outro.count == 0:
+            return
+        total = self.count + outro.count
+        delta = outro.media - self.media
+        self._m2 += outro._m2 + delta * delta * self.count * outro.count / total
+        self.media += delta * outro.count / total
+        self.count = total
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+    
+    @property
+    def variancia(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    @property
+    def desvio_padrao(self) -> float:
+        return math.sqrt(self.variancia)
+
+class TDigest:
+    """
+    Esboço de quantis t-digest (versão com mescla). Guarda no máximo algumas
+    centenas de centroides, qualquer que seja o número de valores, e dois
+    esboços podem ser mesclados (percentis agregados de várias replicações).
+    """
+    
+    def __init__(self, compressao: float = None):
+        self.compressao = compressao or config.TDIGEST_COMPRESSAO
+        self.medias = np.empty(0)
+        self.pesos = np.empty(0)
+        self.minimo = math.inf
+        self.maximo = -math.inf
+    
+    @property
+    def count(self) -> float:
+        return float(self.pesos.sum())
+    
+    def adicionar_lote(self, valores: np.ndarray):
+        if len(valores) == 0:
+            return
+        self.minimo = min(self.minimo, float(np.min(valores)))
+        self.maximo = max(self.maximo, float(np.max(valores)))
+        self._comprimir(np.asarray(valores, dtype=float), np.ones(len(valores)))
+    
+    def mesclar(self, outro: 'TDigest'):
+        if len(outro.medias) == 0:
+            return
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+        self._comprimir(outro.medias, outro.pesos)
+    
+    def _limite_quantil(self, q: float) -> float:
+        """Maior quantil que o centroide iniciado em q pode alcançar (escala k1)"""
+        k = self.compressao / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= self.compressao / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compressao) + 1) / 2
+    
+    def _comprimir(self, medias_novas: np.ndarray, pesos_novos: np.ndarray):
+        medias = np.concatenate((self.medias, medias_novas))
+        pesos = np.concatenate((self.pesos, pesos_novos))
+        ordem = np.argsort(medias, kind='stable')
+        medias = medias[ordem].tolist()
+        pesos = pesos[ordem].tolist()
+        total = sum(pesos)
+        
+        # percorre em ordem juntando vizinhos enquanto o centroide couber no limite
+        novas_medias, novos_pesos = [], []
+        media_atual, peso_atual = medias[0], pesos[0]
+        q_inicio = 0.0
+        limite = self._limite_quantil(q_inicio)
+        for media, peso in zip(medias[1:], pesos[1:]):
+            if q_inicio + (peso_atual + peso) / total <= limite:
+                peso_atual += peso
+                media_atual += (media - media_atual) * peso / peso_atual
+            else:
+                novas_medias.append(media_atual)
+                novos_pesos.append(peso_atual)
+                q_inicio += peso_atual / total
+                limite = self._limite_quantil(q_inicio)
+                media_atual, peso_atual = media, peso
+        novas_medias.append(media_atual)
+        novos_pesos.append(peso_atual)
+        
+        self.medias = np.array(novas_medias)
+        self.pesos = np.array(novos_pesos)
+    
+    def quantil(self, q: float) -> float:
+        if len(self.medias) == 0:
+            return 0.0
+        total = self.count
+        # interpola entre os centros dos centroides, ancorado no mínimo e no máximo
+        centros = np.cumsum(self.pesos) - self.pesos / 2
+        x = np.concatenate(([0.0], centros, [total]))
+        y = np.concatenate(([self.minimo], self.medias, [self.maximo]))
+        return float(np.interp(q * total, x, y))
+
+class ResumoStreaming:
+    """
+    Estatísticas de uma métrica sem guardar as amostras: Welford para
+    média/desvio e t-digest para mediana e percentis. As amostras passam por um
+    buffer de tamanho fixo e são descarregadas em lote.
+    """
+    
+    def __init__(self, tamanho_buffer: int = None, compressao: float = None):
+        self.tamanho_buffer = tamanho_buffer or config.TAMANHO_BUFFER_STREAMING
+        self.acumulador = AcumuladorWelford()
+        self.digest = TDigest(compressao)
+        self._buffer: List[float] = []
+    
+    def adicionar(self, valor: float):
+        self._buffer.append(valor)
+        if len(self._buffer) >= self.tamanho_buffer:
+            self._descarregar()
+    
+    def _descarregar(self):
+        if not self._buffer:
+            return
+        lote = np.array(self._buffer)
+        self._buffer = []
+        self.acumulador.adicionar_lote(lote)
+        self.digest.adicionar_lote(lote)
+    
+    def mesclar(self, outro: 'ResumoStreaming'):
+        self._descarregar()
+        outro._descarregar()
+        self.acumulador.mesclar(outro.acumulador)
+        self.digest.mesclar(outro.digest)
+    
+    @property
+    def count(self) -> int:
+        return self.acumulador.count + len(self._buffer)
+    
+    @property
+    def media(self) -> float:
+        self._descarregar()
+        return self.acumulador.media
+    
+    def resumo(self) -> Dict[str, float]:
+        """Mesmo formato de EstatisticasSimulacao.calcular_estatisticas_lista"""
+        self._descarregar()
+        if self.acumulador.count == 0:
+            return {
+                'count': 0, 'media': 0.0, 'mediana': 0.0, 'desvio_padrao': 0.0,
+                'minimo': 0.0, 'maximo': 0.0, 'p90': 0.0, 'p95': 0.0, 'p99': 0.0
+            }
+        
+        return {
+            'count': self.acumulador.count,
+            'media': self.acumulador.media,
+            'mediana': self.digest.quantil(0.50),
+            'desvio_padrao': self.acumulador.desvio_padrao,
+            'minimo': self.acumulador.minimo,
+            'maximo': self.acumulador.maximo,
+            'p90': self.digest.quantil(0.90),
+            'p95': self.digest.quantil(0.95),
+            'p99': self.digest.quantil(0.99)
+        }
+
+# Métricas de tempo por torcedor, na ordem do relatório
+METRICAS_TEMPOS = (
+    'tempos_espera_revista', 'tempos_servico_revista', 'tempos_caminhada',
+    'tempos_espera_catraca', 'tempos_servico_catraca', 'tempos_total'
+)
+
+class EstatisticasSimulacao:
+    def __init__(self, cadastro: CadastroTorcedores, streaming: bool = None):
+        # os tempos de cada torcedor ficam no cadastro; aqui só os ids de quem terminou
+        self.cadastro = cadastro
+        self.streaming = streaming if streaming is not None else config.ESTATISTICAS_STREAMING
+        self.ids_completos: List[int] = []
+        self.completos_por_portao: Dict[str, int] = {
+            portao: 0 for portao in config.obter_portoes()
         }
         self.inicio_jogo = config.INICIO_JOGO
-        # Métricas temporais
-        self.tempos_espera_revista: List[float] = []
-        self.tempos_servico_revista: List[float] = []
-        self.tempos_caminhada: List[float] = []
-        self.tempos_espera_catraca: List[float] = []
-        self.tempos_servico_catraca: List[float] = []
-        self.tempos_total: List[float] = []
-    
-    def adicionar_torcedor(self, torcedor: Torcedor):
-        if torcedor.tempo_fim_catraca is None:
-            return  # ainda não terminou
         
-        self.torcedores_completos.append(torcedor)
-        self.torcedores_por_portao[torcedor.portao].append(torcedor)
-        self._calcular_metricas_torcedor(torcedor)
+        # Modo streaming: resumos de memória constante e contadores, sem guardar ids.
+        # No modo normal as métricas saem direto das colunas do cadastro no relatório.
+        self.resumos: Dict[str, ResumoStreaming] = None
+        if self.streaming:
+            self.resumos = {nome: ResumoStreaming() for nome in METRICAS_TEMPOS}
+        self._total_completos = 0
+        self._entradas_antes_jogo = 0
+        self._tempo_final_entrada = -math.inf
+        self._soma_fila_total = 0.0
+        self._entradas_por_minuto: Dict[int, int] = {}
+        self._antes_jogo_por_portao: Dict[str, int] = {portao: 0 for portao in config.obter_portoes()}
     
-    def _calcular_metricas_torcedor(self, t: Torcedor):
-        # Tempo de espera na revista
-        if t.tempo_inicio_revista and t.tempo_chegada:
-            tempo_espera_revista = t.tempo_inicio_revista - t.tempo_chegada
-            self.tempos_espera_revista.append(tempo_espera_revista)
-        
-        # Tempo de serviço na revista
-        if t.tempo_fim_revista and t.tempo_inicio_revista:
-            tempo_servico_revista = t.tempo_fim_revista - t.tempo_inicio_revista
-            self.tempos_servico_revista.append(tempo_servico_revista)
-        
-        # Tempo de caminhada
-        if t.tempo_chegada_portao and t.tempo_fim_revista:
-            tempo_caminhada = t.tempo_chegada_portao - t.tempo_fim_revista
-            self.tempos_caminhada.append(tempo_caminhada)
-        
-        # Tempo de espera na catraca
-        if t.tempo_inicio_catraca and t.tempo_chegada_portao:
-            tempo_espera_catraca = t.tempo_inicio_catraca - t.tempo_chegada_portao
-            self.tempos_espera_catraca.append(tempo_espera_catraca)
+    @property
+    def total_completos(self) -> int:
+        return self._total_completos if self.streaming else len(self.ids_completos)
+    
+    def adicionar_torcedor(self, torcedor_id: int):
+        if math.isnan(self.cadastro.tempo_fim_catraca[torcedor_id]):
+            return  # ainda não terminou
         
-        # Tempo de serviço na catraca
-        if t.tempo_fim_catraca and t.tempo_inicio_catraca:
-            tempo_servico_catraca = t.tempo_fim_catraca - t.tempo_inicio_catraca
-            self.tempos_servico_catraca.append(tempo_servico_catraca)
+        portao = self.cadastro.portao(torcedor_id)
+        self.completos_por_portao[portao] += 1
+        if self.streaming:
+            self._total_completos += 1
+            if self.cadastro.tempo_fim_catraca[torcedor_id] <= self.inicio_jogo:
+                self._antes_jogo_por_portao[portao] += 1
+            self._calcular_metricas_torcedor(torcedor_id)
+        else:
+            self.ids_completos.append(torcedor_id)
+    
+    def adicionar_torcedores(self, ids: np.ndarray):
+        """Vários torcedores de uma vez, na ordem em que terminaram (motor vetorizado)"""
+        # só quem passou pela catraca: NaN (não chegou) e +inf (nunca atendido) ficam de fora
+        ids = ids[np.isfinite(self.cadastro.tempo_fim_catraca[ids])]
+        if self.streaming:
+            for torcedor_id in ids.tolist():
+                self.adicionar_torcedor(torcedor_id)
+            return
+        
+        por_portao = np.bincount(self.cadastro.codigo_portao[ids], minlength=len(self.cadastro.portoes))
+        for portao, quantidade in zip(self.cadastro.portoes, por_portao.tolist()):
+            self.completos_por_portao[portao] += quantidade
+        self.ids_completos.extend(ids.tolist())
+    
+    def _calcular_metricas_torcedor(self, torcedor_id: int):
+        """Atualiza os resumos streaming com os tempos de um torcedor"""
+        c = self.cadastro
+        chegada = float(c.tempo_chegada[torcedor_id])
+        inicio_revista = float(c.tempo_inicio_revista[torcedor_id])
+        fim_revista = float(c.tempo_fim_revista[torcedor_id])
+        chegada_portao = float(c.tempo_chegada_portao[torcedor_id])
+        inicio_catraca = float(c.tempo_inicio_catraca[torcedor_id])
+        fim_catraca = float(c.tempo_fim_catraca[torcedor_id])
+        
+        self._entradas_antes_jogo += fim_catraca <= self.inicio_jogo
+        self._tempo_final_entrada = max(self._tempo_final_entrada, fim_catraca)
+        self._soma_fila_total += (inicio_revista - chegada) + (inicio_catraca - chegada_portao)
+        minuto = math.floor(fim_catraca / 60)
+        self._entradas_por_minuto[minuto] = self._entradas_por_minuto.get(minuto, 0) + 1
+        
+        # quem passou pela catraca tem todos os tempos preenchidos
+        resumos = self.resumos
+        resumos['tempos_espera_revista'].adicionar(inicio_revista - chegada)
+        resumos['tempos_servico_revista'].adicionar(fim_revista - inicio_revista)
+        resumos['tempos_caminhada'].adicionar(chegada_portao - fim_revista)
+        resumos['tempos_espera_catraca'].adicionar(inicio_catraca - chegada_portao)
+        resumos['tempos_servico_catraca'].adicionar(fim_catraca - inicio_catraca)
         
         # Tempo total
-        tempo_total = t.tempo_total()
+        tempo_total = fim_catraca - chegada
         if tempo_total > 0:
-            self.tempos_total.append(tempo_total)
+            resumos['tempos_total'].adicionar(tempo_total)
+    
+    def _coluna_completos(self, coluna: str) -> np.ndarray:
+        """Valores de uma coluna do cadastro só para quem já entrou"""
+        return getattr(self.cadastro, coluna)[self.ids_completos]
     
-    def calcular_estatisticas_lista(self, valores: List[float]) -> Dict[str, float]:
-        if not valores:
+    def amostras_tempos(self) -> Dict[str, np.ndarray]:
+        """Tempos de cada etapa dos torcedores completos, calculados das colunas do cadastro"""
+        ids = np.asarray(self.ids_completos, dtype=np.int64)
+        c = self.cadastro
+        chegada = c.tempo_chegada[ids]
+        inicio_revista = c.tempo_inicio_revista[ids]
+        fim_revista = c.tempo_fim_revista[ids]
+        chegada_portao = c.tempo_chegada_portao[ids]
+        inicio_catraca = c.tempo_inicio_catraca[ids]
+        fim_catraca = c.tempo_fim_catraca[ids]
+        
+        tempo_total = fim_catraca - chegada
+        return {
+            'tempos_espera_revista': inicio_revista - chegada,
+            'tempos_servico_revista': fim_revista - inicio_revista,
+            'tempos_caminhada': chegada_portao - fim_revista,
+            'tempos_espera_catraca': inicio_catraca - chegada_portao,
+            'tempos_servico_catraca': fim_catraca - inicio_catraca,
+            'tempos_total': tempo_total[tempo_total > 0]
+        }
+    
+    def calcular_estatisticas_lista(self, valores) -> Dict[str, float]:
+        if len(valores) == 0:
             return {
                 'count': 0, 'media': 0.0, 'mediana': 0.0, 'desvio_padrao': 0.0,
                 'minimo': 0.0, 'maximo': 0.0, 'p90': 0.0, 'p95': 0.0, 'p99': 0.0
             }
         
-        valores_ordenados = sorted(valores)
-        n = len(valores)
+        # uma ordenação serve para mediana, extremos e percentis
+        valores_ordenados = np.sort(np.asarray(valores, dtype=float))
+        n = len(valores_ordenados)
+        meio = n // 2
+        mediana = valores_ordenados[meio] if n % 2 else (valores_ordenados[meio - 1] + valores_ordenados[meio]) / 2
         
         return {
             'count': n,
-            'media': statistics.mean(valores),
-            'mediana': statistics.median(valores),
-            'desvio_padrao': statistics.stdev(valores) if n > 1 else 0.0,
-            'minimo': min(valores),
-            'maximo': max(valores),
-            'p90': valores_ordenados[int(0.90 * n)] if n > 0 else 0.0,
-            'p95': valores_ordenados[int(0.95 * n)] if n > 0 else 0.0,
-            'p99': valores_ordenados[int(0.99 * n)] if n > 0 else 0.0
+            'media': float(np.mean(valores_ordenados)),
+            'mediana': float(mediana),
+            'desvio_padrao': float(np.std(valores_ordenados, ddof=1)) if n > 1 else 0.0,
+            'minimo': float(valores_ordenados[0]),
+            'maximo': float(valores_ordenados[-1]),
+            'p90': float(valores_ordenados[int(0.90 * n)]),
+            'p95': float(valores_ordenados[int(0.95 * n)]),
+            'p99': float(valores_ordenados[int(0.99 * n)])
         }
     
     def distribuicao_por_portao(self) -> Dict[str, Dict[str, Any]]:
         """Calcula distribuição de torcedores por portão"""
-        total_torcedores = len(self.torcedores_completos)
+        total_torcedores = self.total_completos
+        antes_do_jogo = self._entradas_antes_jogo_por_portao()
         
         resultado = {}
         for portao in config.obter_portoes():
-            torcedores_portao = self.torcedores_por_portao[portao]
-            count = len(torcedores_portao)
+            count = self.completos_por_portao[portao]
             
             resultado[portao] = {
                 'quantidade': count,
                 'percentual': (count / total_torcedores * 100) if total_torcedores > 0 else 0.0,
+                'percentual_antes_jogo': (antes_do_jogo[portao] / count * 100) if count > 0 else 0.0,
                 'capacidade_maxima': config.CAPACIDADES_PORTOES[portao],
                 'utilizacao': (count / config.CAPACIDADES_PORTOES[portao] * 100) if config.CAPACIDADES_PORTOES[portao] > 0 else 0.0
             }
         
         return resultado
     
+    def _entradas_antes_jogo_por_portao(self) -> Dict[str, int]:
+        """Quantos torcedores de cada portão entraram antes do início do jogo"""
+        if self.streaming or not self.ids_completos:
+            return dict(self._antes_jogo_por_portao)
+        
+        antes_do_jogo = self._coluna_completos('tempo_fim_catraca') <= self.inicio_jogo
+        codigos = self.cadastro.codigo_portao[self.ids_completos]
+        contagens = np.bincount(codigos[antes_do_jogo], minlength=len(self.cadastro.portoes))
+        return {portao: int(contagens[k]) for k, portao in enumerate(self.cadastro.portoes)}
+    
     def percentual_entrada_antes_jogo(self) -> float:
         """Calcula percentual de torcedores que entraram antes do início do jogo"""
-        if not self.torcedores_completos:
+        if not self.total_completos:
             return 0.0
+        if self.streaming:
+            return (self._entradas_antes_jogo / self._total_completos) * 100
         
-        antes_do_jogo = sum(1 for t in self.torcedores_completos 
-                           if t.tempo_fim_catraca and t.tempo_fim_catraca <= self.inicio_jogo)
+        fim_catraca = self._coluna_completos('tempo_fim_catraca')
+        antes_do_jogo = int(np.count_nonzero(fim_catraca <= self.inicio_jogo))
         
-        return (antes_do_jogo / len(self.torcedores_completos)) * 100
+        return (antes_do_jogo / len(self.ids_completos)) * 100
     
     def tempo_final_entrada(self) -> float:
         """Retorna o tempo em que o último torcedor entrou no estádio"""
-        if not self.torcedores_completos:
+        if not self.total_completos:
             return 0.0
+        if self.streaming:
+            return float(self._tempo_final_entrada)
         
-        return max(t.tempo_fim_catraca for t in self.torcedores_completos if t.tempo_fim_catraca)
+        return float(self._coluna_completos('tempo_fim_catraca').max())
     
     def tempo_medio_fila_total(self) -> float:
         """Calcula tempo médio total de espera em filas (revista + catraca)"""
-        tempos_fila = []
+        if not self.total_completos:
+            return 0.0
+        if self.streaming:
+            return self._soma_fila_total / self._total_completos
         
-        for t in self.torcedores_completos:
-            tempo_fila = 0.0
-            
-            # Tempo de espera na revista
-            if t.tempo_inicio_revista and t.tempo_chegada:
-                tempo_fila += t.tempo_inicio_revista - t.tempo_chegada
-            
-            # Tempo de espera na catraca
-            if t.tempo_inicio_catraca and t.tempo_chegada_portao:
-                tempo_fila += t.tempo_inicio_catraca - t.tempo_chegada_portao
-            
-            tempos_fila.append(tempo_fila)
+        espera_revista = self._coluna_completos('tempo_inicio_revista') - self._coluna_completos('tempo_chegada')
+        espera_catraca = self._coluna_completos('tempo_inicio_catraca') - self._coluna_completos('tempo_chegada_portao')
         
-        return statistics.mean(tempos_fila) if tempos_fila else 0.0
+        return float(np.mean(espera_revista + espera_catraca))
     
     def tempo_medio_entrada_total(self) -> float:
         """Calcula tempo médio total que um torcedor demorou para entrar no estádio"""
-        if not self.tempos_total:
-            return 0.0
-        return statistics.mean(self.tempos_total)
+        if self.streaming:
+            tempos_total = self.resumos['tempos_total']
+            return tempos_total.media if tempos_total.count else 0.0
+        
+        tempos_total = self.amostras_tempos()['tempos_total']
+        return float(np.mean(tempos_total)) if len(tempos_total) else 0.0
     
     def distribuicao_temporal_entradas(self, intervalos_minutos: int = 10) -> List[Dict[str, Any]]:
         """Distribui as entradas por intervalos de tempo"""
-        if not self.torcedores_completos:
+        if not self.total_completos:
             return []
         
-        # Converter para minutos (tempos estão em segundos)
-        tempos_entrada = [t.tempo_fim_catraca / 60 for t in self.torcedores_completos 
-                         if t.tempo_fim_catraca is not None]
-        
-        if not tempos_entrada:
-            return []
+        # contagem por minuto inteiro (tempos estão em segundos)
+        if self.streaming:
+            minutos = np.fromiter(self._entradas_por_minuto.keys(), dtype=np.int64)
+            contagens = np.fromiter(self._entradas_por_minuto.values(), dtype=np.int64)
+        else:
+            minutos = np.floor(self._coluna_completos('tempo_fim_catraca') / 60).astype(np.int64)
+            contagens = None
         
         # Encontrar intervalos
-        tempo_min = int(min(tempos_entrada) // intervalos_minutos) * intervalos_minutos
-        tempo_max = int(max(tempos_entrada) // intervalos_minutos + 1) * intervalos_minutos
-        
-        distribuicao = []
-        for inicio in range(tempo_min, tempo_max, intervalos_minutos):
-            fim = inicio + intervalos_minutos
-            count = sum(1 for t in tempos_entrada if inicio <= t < fim)
-            
-            distribuicao.append({
-                'intervalo_inicio': inicio,
-                'intervalo_fim': fim,
-                'quantidade': count,
-                'percentual': (count / len(tempos_entrada) * 100) if tempos_entrada else 0.0
-            })
-        
-        return distribuicao
+        tempo_min = (int(minutos.min()) // intervalos_minutos) * intervalos_minutos
+        tempo_max = (int(minutos.max()) // intervalos_minutos + 1) * intervalos_minutos
+        num_intervalos = (tempo_max - tempo_min) // intervalos_minutos
+        
+        quantidades = np.bincount((minutos - tempo_min) // intervalos_minutos,
+                                  weights=contagens, minlength=num_intervalos).astype(np.int64)
+        total = self.total_completos
+        
+        return [{
+            'intervalo_inicio': tempo_min + k * intervalos_minutos,
+            'intervalo_fim': tempo_min + (k + 1) * intervalos_minutos,
+            'quantidade': int(count),
+            'percentual': count / total * 100
+        } for k, count in enumerate(quantidades.tolist())]
     
     def relatorio_completo(self) -> Dict[str, Any]:
         """Gera relatório completo de estatísticas"""
         
-        return {
+        if self.streaming:
+            estatisticas_tempos = {nome: self.resumos[nome].resumo() for nome in METRICAS_TEMPOS}
+            tempo_medio_entrada_total = self.tempo_medio_entrada_total()
+        else:
+            # todas as amostras saem das colunas do cadastro de uma vez
+            amostras = self.amostras_tempos()
+            estatisticas_tempos = {nome: self.calcular_estatisticas_lista(amostras[nome]) for nome in METRICAS_TEMPOS}
+            tempo_medio_entrada_total = estatisticas_tempos['tempos_total']['media']
+        
+        relatorio = {
             'resumo_geral': {
-                'total_torcedores_processados': len(self.torcedores_completos),
+                'total_torcedores_processados': self.total_completos,
                 'percentual_entrada_antes_jogo': self.percentual_entrada_antes_jogo(),
                 'tempo_final_entrada': self.tempo_final_entrada(),
                 'tempo_medio_fila_total': self.tempo_medio_fila_total(),
-                'tempo_medio_entrada_total': self.tempo_medio_entrada_total()
+                'tempo_medio_entrada_total': tempo_medio_entrada_total
             },
-            
-            'tempos_espera_revista': self.calcular_estatisticas_lista(self.tempos_espera_revista),
-            'tempos_servico_revista': self.calcular_estatisticas_lista(self.tempos_servico_revista),
-            'tempos_caminhada': self.calcular_estatisticas_lista(self.tempos_caminhada),
-            'tempos_espera_catraca': self.calcular_estatisticas_lista(self.tempos_espera_catraca),
-            'tempos_servico_catraca': self.calcular_estatisticas_lista(self.tempos_servico_catraca),
-            'tempos_total': self.calcular_estatisticas_lista(self.tempos_total),
-            
+            **estatisticas_tempos,
             'distribuicao_por_portao': self.distribuicao_por_portao(),
             'distribuicao_temporal': self.distribuicao_temporal_entradas()
         }
+        
+        if self.streaming:
+            # resumos mescláveis, para percentis agregados entre replicações
+            relatorio['resumos_tempos'] = self.resumos
+        
+        return relatorio
     
     def imprimir_relatorio(self):
         """Imprime relatório formatado com informações destacadas"""
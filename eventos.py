@@ -1,35 +1,28 @@
 import heapq
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
-from enum import Enum
+from bisect import insort
+from typing import Any, Dict, List, Optional, Tuple
+from enum import IntEnum
 
-class TipoEvento(Enum):
-    CHEGADA = 'chegada'
-    FIM_REVISTA = 'fim_revista'
-    CHEGADA_PORTAO = 'chegada_portao'
-    FIM_CATRACA = 'fim_catraca'
+import configuracao as config
 
-@dataclass
-class Evento:
-    tempo: float
-    tipo: TipoEvento
-    torcedor_id: int
-    dados: Dict[str, Any] = None
-    
-    def __lt__(self, other):
-        return self.tempo < other.tempo
-    
-    def __eq__(self, other):
-        return self.tempo == other.tempo and self.torcedor_id == other.torcedor_id
+class TipoEvento(IntEnum):
+    CHEGADA = 0
+    FIM_REVISTA = 1
+    CHEGADA_PORTAO = 2
+    FIM_CATRACA = 3
+
+# Evento compacto: tupla (tempo, contador, tipo, torcedor_id, servidor_id)
+# servidor_id é o agente (FIM_REVISTA) ou a catraca (FIM_CATRACA); -1 nos demais
+Evento = Tuple[float, int, TipoEvento, int, int]
 
 class FutureEventList:
     def __init__(self):
         self._eventos = []
         self._contador = 0  # pra manter ordem FIFO em empates
     
-    def agendar(self, tempo: float, tipo: TipoEvento, torcedor_id: int, dados: Dict[str, Any] = None):
-        evento = Evento(tempo, tipo, torcedor_id, dados or {})
-        heapq.heappush(self._eventos, (tempo, self._contador, evento))
+    def agendar(self, tempo: float, tipo: TipoEvento, torcedor_id: int, servidor_id: int = -1):
+        # o contador é único, então a comparação nunca chega no tipo/ids
+        heapq.heappush(self._eventos, (tempo, self._contador, tipo, torcedor_id, servidor_id))
         self._contador += 1
     
     def proximo_evento(self) -> Optional[Evento]:
@@ -37,8 +30,7 @@ class FutureEventList:
         if not self._eventos:
             return None
         
-        _, _, evento = heapq.heappop(self._eventos)
-        return evento
+        return heapq.heappop(self._eventos)
     
     def tem_eventos(self) -> bool:
         """Verifica se há eventos pendentes"""
@@ -59,59 +51,210 @@ class FutureEventList:
         self._eventos.clear()
         self._contador = 0
 
+class FilaCalendario:
+    """
+    FEL como calendar queue (Brown, 1988): os eventos ficam em "dias"
+    (buckets) de largura fixa, cada um uma lista ordenada. Inserção e
+    remoção ficam perto de O(1) quando a largura acompanha o espaçamento
+    médio dos eventos; o número de dias dobra/cai pela metade conforme o
+    tamanho e a largura é reestimada a cada redimensionamento.
+    Mesma interface e mesma ordem (tempo, contador) da FutureEventList.
+    """
+    
+    BUCKETS_MINIMO = 16
+    
+    def __init__(self, num_buckets: int = BUCKETS_MINIMO, largura: float = 1.0):
+        self._contador = 0
+        self._tamanho = 0
+        self._montar(num_buckets, largura)
+    
+    def _montar(self, num_buckets: int, largura: float):
+        self._num_buckets = num_buckets
+        self._largura = largura
+        self._buckets = [[] for _ in range(num_buckets)]
+        self._dia_atual = None  # índice "absoluto" do dia onde está o próximo evento
+    
+    def _inserir(self, evento: Evento):
+        dia = int(evento[0] // self._largura)
+        insort(self._buckets[dia % self._num_buckets], evento)
+        if self._dia_atual is None or dia < self._dia_atual:
+            self._dia_atual = dia
+    
+    def agendar(self, tempo: float, tipo: TipoEvento, torcedor_id: int, servidor_id: int = -1):
+        self._inserir((tempo, self._contador, tipo, torcedor_id, servidor_id))
+        self._contador += 1
+        self._tamanho += 1
+        if self._tamanho > 2 * self._num_buckets:
+            self._redimensionar(2 * self._num_buckets)
+    
+    def _localizar(self) -> Optional[list]:
+        """Avança o calendário até o dia do próximo evento e retorna o bucket dele"""
+        if self._tamanho == 0:
+            return None
+        
+        dia = self._dia_atual
+        largura = self._largura
+        for _ in range(self._num_buckets):
+            bucket = self._buckets[dia % self._num_buckets]
+            if bucket and bucket[0][0] // largura <= dia:
+                self._dia_atual = dia
+                return bucket
+            dia += 1
+        
+        # deu a volta no ano sem achar: busca direta pelo menor evento
+        menor = min(bucket[0] for bucket in self._buckets if bucket)
+        self._dia_atual = int(menor[0] // largura)
+        return self._buckets[self._dia_atual % self._num_buckets]
+    
+    def _redimensionar(self, num_buckets: int):
+        eventos = [evento for bucket in self._buckets for evento in bucket]
+        
+        # nova largura: ~3x o espaçamento médio entre os próximos eventos
+        largura = self._largura
+        proximos = heapq.nsmallest(min(25, len(eventos)), eventos)
+        if len(proximos) > 1:
+            separacao = (proximos[-1][0] - proximos[0][0]) / (len(proximos) - 1)
+            if separacao > 0:
+                largura = 3.0 * separacao
+        
+        self._montar(num_buckets, largura)
+        for evento in eventos:
+            self._inserir(evento)
+    
+    def proximo_evento(self) -> Optional[Evento]:
+        """Remove e retorna o próximo evento"""
+        bucket = self._localizar()
+        if bucket is None:
+            return None
+        
+        evento = bucket.pop(0)
+        self._tamanho -= 1
+        if self._num_buckets > self.BUCKETS_MINIMO and self._tamanho < self._num_buckets // 2:
+            self._redimensionar(self._num_buckets // 2)
+        return evento
+    
+    def tem_eventos(self) -> bool:
+        """Verifica se há eventos pendentes"""
+        return self._tamanho > 0
+    
+    def tempo_proximo_evento(self) -> Optional[float]:
+        """Retorna o tempo do próximo evento sem removê-lo"""
+        bucket = self._localizar()
+        if bucket is None:
+            return None
+        return bucket[0][0]
+    
+    def tamanho(self) -> int:
+        """Retorna número de eventos pendentes"""
+        return self._tamanho
+    
+    def limpar(self):
+        """Remove todos os eventos"""
+        self._contador = 0
+        self._tamanho = 0
+        self._montar(self.BUCKETS_MINIMO, self._largura)
+
+# Backends de FEL disponíveis (escolhidos pelo nome em GerenciadorEventos)
+BACKENDS_FEL = {
+    'heap': FutureEventList,
+    'calendario': FilaCalendario
+}
+
 class GerenciadorEventos:
     """
     Gerenciador principal do sistema de eventos
     """
     
-    def __init__(self):
-        self.fel = FutureEventList()
+    def __init__(self, backend: str = None):
+        backend = backend or config.BACKEND_FEL
+        if backend not in BACKENDS_FEL:
+            raise ValueError(f"Backend de FEL desconhecido: {backend} (opções: {list(BACKENDS_FEL)})")
+        
+        self.backend = backend
+        self.fel = BACKENDS_FEL[backend]()
         self.tempo_atual = 0.0
         self.eventos_processados = 0
+        self._limpar_fluxo()
+    
+    def _limpar_fluxo(self):
+        self._fluxo_tempos: List[float] = []
+        self._fluxo_ids: List[int] = []
+        self._fluxo_tipo = None
+        self._fluxo_pos = 0
+    
+    def agendar_fluxo(self, tempos: List[float], tipo: TipoEvento, torcedor_ids: List[int]):
+        """
+        Registra uma sequência de eventos já ordenada por tempo (ex.: as chegadas).
+        Ela não entra na FEL: proximo_evento intercala o próximo item do fluxo com
+        a FEL na hora certa, então a FEL só guarda os eventos em andamento.
+        Em empate de tempo o fluxo sai primeiro, como se tivesse sido agendado antes.
+        """
+        self._fluxo_tempos = list(tempos)
+        self._fluxo_ids = list(torcedor_ids)
+        self._fluxo_tipo = tipo
+        self._fluxo_pos = 0
+    
+    def _eventos_fluxo_pendentes(self) -> int:
+        return len(self._fluxo_tempos) - self._fluxo_pos
     
     def agendar_evento(self, tempo_delay: float, tipo: TipoEvento, 
-                      torcedor_id: int, dados: Dict[str, Any] = None):
+                      torcedor_id: int, servidor_id: int = -1):
         """
         Agenda um evento para tempo_atual + tempo_delay
         """
         tempo_evento = self.tempo_atual + tempo_delay
-        self.fel.agendar(tempo_evento, tipo, torcedor_id, dados)
+        self.fel.agendar(tempo_evento, tipo, torcedor_id, servidor_id)
     
     def agendar_evento_absoluto(self, tempo_absoluto: float, tipo: TipoEvento,
-                               torcedor_id: int, dados: Dict[str, Any] = None):
+                               torcedor_id: int, servidor_id: int = -1):
         """
         Agenda um evento para um tempo absoluto específico
         """
-        self.fel.agendar(tempo_absoluto, tipo, torcedor_id, dados)
+        self.fel.agendar(tempo_absoluto, tipo, torcedor_id, servidor_id)
     
     def proximo_evento(self) -> Optional[Evento]:
         """
         Remove e retorna o próximo evento, atualizando tempo_atual
         """
+        pos = self._fluxo_pos
+        if pos < len(self._fluxo_tempos):
+            tempo_fluxo = self._fluxo_tempos[pos]
+            tempo_fel = self.fel.tempo_proximo_evento()
+            if tempo_fel is None or tempo_fluxo <= tempo_fel:
+                self._fluxo_pos = pos + 1
+                self.tempo_atual = tempo_fluxo
+                self.eventos_processados += 1
+                return (tempo_fluxo, pos, self._fluxo_tipo, self._fluxo_ids[pos], -1)
+        
         evento = self.fel.proximo_evento()
         if evento:
-            self.tempo_atual = evento.tempo
+            self.tempo_atual = evento[0]
             self.eventos_processados += 1
         return evento
     
     def tem_eventos(self) -> bool:
         """Verifica se há eventos pendentes"""
-        return self.fel.tem_eventos()
+        return self.fel.tem_eventos() or self._eventos_fluxo_pendentes() > 0
     
     def resetar(self):
         """Reseta o gerenciador para nova simulação"""
         self.fel.limpar()
         self.tempo_atual = 0.0
         self.eventos_processados = 0
+        self._limpar_fluxo()
     
     def estatisticas_fel(self) -> Dict[str, Any]:
         """Retorna estatísticas da FEL"""
+        proximo_tempo = self.fel.tempo_proximo_evento()
+        if self._eventos_fluxo_pendentes() > 0:
+            tempo_fluxo = self._fluxo_tempos[self._fluxo_pos]
+            if proximo_tempo is None or tempo_fluxo < proximo_tempo:
+                proximo_tempo = tempo_fluxo
+        
         return {
-            'eventos_pendentes': self.fel.tamanho(),
+            'eventos_pendentes': self.fel.tamanho() + self._eventos_fluxo_pendentes(),
+            'eventos_na_fel': self.fel.tamanho(),
             'eventos_processados': self.eventos_processados,
             'tempo_atual': self.tempo_atual,
-            'proximo_evento_tempo': self.fel.tempo_proximo_evento()
+            'proximo_evento_tempo': proximo_tempo
         }
-
-# Instância global do gerenciador de eventos
-gerenciador_eventos = GerenciadorEventos()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+
+# Colunas exportadas por torcedor (linha k = torcedor k+1) e seus tipos no disco
+COLUNAS_EXPORTACAO = {
+    'id': np.int32,
+    'codigo_esplanada': np.int8,
+    'codigo_portao': np.int8,
+    'tempo_chegada': np.float64,
+    'tempo_inicio_revista': np.float64,
+    'tempo_fim_revista': np.float64,
+    'tempo_chegada_portao': np.float64,
+    'tempo_inicio_catraca': np.float64,
+    'tempo_fim_catraca': np.float64
+}
+ARQUIVO_METADADOS = 'metadados.json'
+
+def diretorio_replicacao(diretorio: str, simulacao_id: int) -> str:
+    return os.path.join(diretorio, f'replicacao_{simulacao_id:04d}')
+
+def exportar_torcedores(cadastro, diretorio: str, simulacao_id: int = None, cenario: Dict = None) -> str:
+    """
+    Grava a tabela de torcedores de uma replicação (CadastroTorcedores já
+    simulado) como um .npy por coluna, mais os nomes de esplanadas e portões
+    para decodificar os códigos. Com `simulacao_id`, grava num subdiretório
+    replicacao_NNNN. Devolve o diretório usado.
+    """
+    if simulacao_id is not None:
+        diretorio = diretorio_replicacao(diretorio, simulacao_id)
+    os.makedirs(diretorio, exist_ok=True)
+
+    for coluna, tipo in COLUNAS_EXPORTACAO.items():
+        valores = cadastro.ids() if coluna == 'id' else getattr(cadastro, coluna)[1:]
+        np.save(os.path.join(diretorio, f'{coluna}.npy'), np.ascontiguousarray(valores, dtype=tipo))
+
+    metadados = {
+        'simulacao_id': simulacao_id,
+        'total_torcedores': cadastro.total,
+        'esplanadas': list(cadastro.esplanadas),
+        'portoes': list(cadastro.portoes),
+        'cenario': cenario or {}
+    }
+    with open(os.path.join(diretorio, ARQUIVO_METADADOS), 'w', encoding='utf-8') as f:
+        json.dump(metadados, f, ensure_ascii=False, indent=2, default=repr)
+    return diretorio
+
+def carregar_torcedores(diretorio: str, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Colunas de uma replicação exportada. Com `mmap`, cada coluna é mapeada
+    em memória (somente leitura): nada é lido até ser usado.
+    """
+    return {
+        coluna: np.load(os.path.join(diretorio, f'{coluna}.npy'), mmap_mode='r' if mmap else None)
+        for coluna in COLUNAS_EXPORTACAO
+    }
+
+def carregar_metadados(diretorio: str) -> Dict:
+    with open(os.path.join(diretorio, ARQUIVO_METADADOS), encoding='utf-8') as f:
+        return json.load(f)
+
+def replicacoes_exportadas(diretorio: str) -> List[str]:
+    """Subdiretórios replicacao_NNNN de uma exportação, em ordem"""
+    return sorted(
+        entrada.path for entrada in os.scandir(diretorio)
+        if entrada.is_dir() and entrada.name.startswith('replicacao_')
+    )
+
+def carregar_exportacao(diretorio: str, mmap: bool = True) -> List[Dict[str, np.ndarray]]:
+    """Colunas de todas as replicações exportadas em `diretorio`"""
+    return [carregar_torcedores(caminho, mmap) for caminho in replicacoes_exportadas(diretorio)]
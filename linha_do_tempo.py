@@ -0,0 +1,129 @@
+import math
+from typing import Dict, List
+
+import numpy as np
+
+import configuracao as config
+
+class LinhaDoTempoFila:
+    """
+    Tamanho de uma fila ao longo do tempo, reduzido a intervalos fixos
+    (ex.: 10 s) em arrays NumPy pré-alocados: mínimo, média (ponderada pelo
+    tempo) e máximo por intervalo. A memória depende só do horizonte e da
+    resolução, não do número de eventos.
+    """
+    
+    def __init__(self, nome: str, inicio: float, resolucao: float, num_intervalos: int):
+        self.nome = nome
+        self.inicio = inicio
+        self.resolucao = resolucao
+        self.num_intervalos = num_intervalos
+        
+        self.minimo = np.zeros(num_intervalos)
+        self.maximo = np.zeros(num_intervalos)
+        self.area = np.zeros(num_intervalos)
+        self._fim = inicio + num_intervalos * resolucao
+        
+        # intervalo corrente acumulado em floats Python; vai para os arrays
+        # quando o tempo passa para o próximo intervalo (a fila começa vazia)
+        self._valor = 0
+        self._tempo_ultima_mudanca = inicio
+        self._indice = 0
+        self._area = 0.0
+        self._minimo = 0
+        self._maximo = 0
+    
+    def registrar(self, tamanho: int, tempo_atual: float):
+        """Nova mudança de tamanho (assinatura de observador da FilaFIFO)"""
+        self._avancar(tempo_atual)
+        self._valor = tamanho
+        if self._tempo_ultima_mudanca == self.inicio + self._indice * self.resolucao:
+            # mudança bem no início do intervalo: o valor anterior não chegou a valer nele
+            self._minimo = self._maximo = tamanho
+        elif tamanho < self._minimo:
+            self._minimo = tamanho
+        elif tamanho > self._maximo:
+            self._maximo = tamanho
+    
+    def _avancar(self, tempo_atual: float):
+        """Acumula o valor atual até `tempo_atual` (fora do horizonte é limitado às pontas)"""
+        tempo = min(max(tempo_atual, self.inicio), self._fim)
+        indice = int((tempo - self.inicio) // self.resolucao)
+        valor = self._valor
+        
+        if indice == self._indice:
+            # caso comum: mudança dentro do mesmo intervalo
+            self._area += valor * (tempo - self._tempo_ultima_mudanca)
+            self._tempo_ultima_mudanca = tempo
+            return
+        
+        # fecha o intervalo corrente
+        fim_corrente = self.inicio + (self._indice + 1) * self.resolucao
+        self.area[self._indice] = self._area + valor * (fim_corrente - self._tempo_ultima_mudanca)
+        self.minimo[self._indice] = self._minimo
+        self.maximo[self._indice] = self._maximo
+        
+        # intervalos inteiros em que o valor não mudou
+        self.area[self._indice + 1:indice] = valor * self.resolucao
+        self.minimo[self._indice + 1:indice] = valor
+        self.maximo[self._indice + 1:indice] = valor
+        
+        # abre o novo intervalo com o valor que vinha valendo
+        inicio_novo = self.inicio + indice * self.resolucao
+        self._indice = indice
+        self._area = valor * (tempo - inicio_novo)
+        self._minimo = self._maximo = valor
+        self._tempo_ultima_mudanca = tempo
+    
+    def fechar(self):
+        """Estende o último tamanho até o fim do horizonte (chamar ao fim da simulação)"""
+        self._avancar(self._fim)
+    
+    def media(self) -> np.ndarray:
+        return self.area / self.resolucao
+
+class RegistradorLinhaDoTempo:
+    """
+    Linhas do tempo da fila de revista e da fila de cada portão, alimentadas
+    pelos observadores das filas (custo O(1) por mudança de tamanho).
+    """
+    
+    def __init__(self, resolucao: float = None, inicio_minutos: float = None, fim_minutos: float = None):
+        self.resolucao = resolucao or config.LINHA_DO_TEMPO_RESOLUCAO
+        inicio_minutos = inicio_minutos if inicio_minutos is not None else config.LINHA_DO_TEMPO_INICIO_MINUTOS
+        fim_minutos = fim_minutos if fim_minutos is not None else config.LINHA_DO_TEMPO_FIM_MINUTOS
+        
+        self.inicio = inicio_minutos * 60
+        self.num_intervalos = math.ceil((fim_minutos - inicio_minutos) * 60 / self.resolucao)
+        
+        self.revista = self._nova_linha('revista')
+        self.catracas = {portao: self._nova_linha(f'portao_{portao}') for portao in config.obter_portoes()}
+    
+    def _nova_linha(self, nome: str) -> LinhaDoTempoFila:
+        return LinhaDoTempoFila(nome, self.inicio, self.resolucao, self.num_intervalos)
+    
+    def conectar(self, sistema_revista, sistema_catracas):
+        """Registra as linhas do tempo como observadoras das filas"""
+        sistema_revista.registrar_observador_fila(self.revista.registrar)
+        for portao, fila in sistema_catracas.filas.items():
+            fila.registrar_observador(self.catracas[portao].registrar)
+    
+    def linhas(self) -> List[LinhaDoTempoFila]:
+        return [self.revista] + list(self.catracas.values())
+    
+    def fechar(self):
+        for linha in self.linhas():
+            linha.fechar()
+    
+    def dados(self) -> Dict[str, np.ndarray]:
+        """Arrays prontos para gráfico: início de cada intervalo (min) e min/média/máx de cada fila"""
+        dados = {'tempo_minutos': (self.inicio + np.arange(self.num_intervalos) * self.resolucao) / 60}
+        for linha in self.linhas():
+            dados[f'{linha.nome}_min'] = linha.minimo
+            dados[f'{linha.nome}_media'] = linha.media()
+            dados[f'{linha.nome}_max'] = linha.maximo
+        return dados
+    
+    def exportar(self, caminho: str):
+        """Salva as linhas do tempo em .npz (ler com np.load)"""
+        np.savez_compressed(caminho, **self.dados())
@@ -1,117 +1,146 @@
-import random
 import math
+import statistics
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List
 
-from eventos import gerenciador_eventos, TipoEvento
-from recursos import Torcedor, SistemaRevista, SistemaCatracas
-from estatisticas import EstatisticasSimulacao
+from aleatorio import FluxosAleatorios, quantil_normal
+from eventos import GerenciadorEventos, TipoEvento
+from recursos import CadastroTorcedores, SistemaRevista, SistemaCatracas
+from linha_do_tempo import RegistradorLinhaDoTempo
+from motor_vetorizado import executar_vetorizado, executar_lote_vetorizado
+from cache_resultados import CacheResultados, chave_replicacao
+from exportacao import exportar_torcedores
+from rastreamento import GravadorRastro
+from estatisticas import EstatisticasSimulacao, ResumoStreaming, METRICAS_TEMPOS, quantil_t_student
 import configuracao as config
 
 class GeradorChegadas:
-    def __init__(self, total_torcedores: int):
+    def __init__(self, total_torcedores: int, rng: np.random.Generator = None,
+                 proporcao_esplanada_norte: float = None):
         self.total_torcedores = total_torcedores
         self.torcedor_id = 0
+        self.rng = rng or np.random.default_rng()
+        self.proporcao_esplanada_norte = (proporcao_esplanada_norte if proporcao_esplanada_norte is not None
+                                          else config.PROPORCAO_ESPLANADA_NORTE)
+        
+        # pesos dos portões (capacidades) acumulados, na ordem de config.obter_portoes()
+        self._pesos_acumulados = np.cumsum([config.CAPACIDADES_PORTOES[p] for p in config.obter_portoes()],
+                                           dtype=float)
     
-    def gerar_tempos_chegada(self) -> List[float]:
-        # tempos em segundos (negativos = antes do jogo)
+    def gerar_tempos_chegada_vetorizado(self) -> np.ndarray:
+        """
+        Gera todos os tempos de chegada de uma vez, já em ordem: a normal
+        truncada sai pela inversa da CDF aplicada a uniformes ordenadas
+        (somas acumuladas de exponenciais). Consome exatamente n + 1
+        uniformes, então na replicação espelhada o torcedor k vem dos mesmos
+        sorteios (1 - U) e os sorteios seguintes (esplanadas, portões)
+        continuam alinhados com a original.
+        """
         inicio_segundos = -config.CHEGADAS_INICIO_MINUTOS * 60
         fim_segundos = -config.CHEGADAS_FIM_MINUTOS * 60
-        pico_segundos = -config.PICO_CHEGADAS_MINUTOS * 60
-        
-        tempos = []
-        
-        for _ in range(self.total_torcedores):
-            tempo = self._gerar_tempo_chegada_realista(inicio_segundos, fim_segundos, pico_segundos)
-            tempos.append(tempo)
-        
-        return sorted(tempos)  # ordena por tempo de chegada
-    
-    def _gerar_tempo_chegada_realista(self, inicio: float, fim: float, pico: float) -> float:
-        """Gera tempo de chegada usando distribuição normal"""
-        # Distribuição normal centrada em -55 min com desvio de 17 min
-        centro_segundos = -55 * 60
-        desvio_segundos = 17 * 60
-        
-        while True:
-            tempo = np.random.normal(centro_segundos, desvio_segundos)
-            if inicio <= tempo <= fim:
-                return tempo
-    
-    def escolher_esplanada(self) -> str:
-        """Escolhe esplanada baseado na proporção configurada"""
-        return 'Norte' if random.random() < config.PROPORCAO_ESPLANADA_NORTE else 'Sul'
-    
-    def escolher_portao(self) -> str:
-        """Escolhe portão proporcional à capacidade máxima"""
-        portoes = list(config.CAPACIDADES_PORTOES.keys())
-        pesos = list(config.CAPACIDADES_PORTOES.values())
-        return random.choices(portoes, weights=pesos)[0]
-    
-    def gerar_torcedores(self) -> List[Torcedor]:
-        """Gera lista completa de torcedores com tempos de chegada"""
-        tempos_chegada = self.gerar_tempos_chegada()
-        torcedores = []
-        
-        for tempo in tempos_chegada:
-            self.torcedor_id += 1
-            esplanada = self.escolher_esplanada()
-            portao = self.escolher_portao()
-            
-            torcedor = Torcedor(
-                id=self.torcedor_id,
-                esplanada=esplanada,
-                portao=portao,
-                tempo_chegada=tempo
-            )
-            torcedores.append(torcedor)
+        centro_segundos = -config.CHEGADAS_CENTRO_MINUTOS * 60
+        desvio_segundos = config.CHEGADAS_DESVIO_MINUTOS * 60
         
-        return torcedores
-
-class TemposServico:
-    """Gera tempos de serviço para revista e catracas"""
-    
-    @staticmethod
-    def tempo_revista() -> float:
-        """Tempo de revista (distribuição normal)"""
-        tempo = random.normalvariate(config.TEMPO_REVISTA_MEDIA, config.TEMPO_REVISTA_DESVIO)
-        return max(tempo, 5.0)
-    
-    @staticmethod
-    def tempo_caminhada(esplanada: str, portao: str) -> float:
-        """Tempo de caminhada da esplanada até o portão"""
-        tempo_base = config.TEMPOS_CAMINHADA[esplanada][portao]
-        return tempo_base * random.uniform(0.8, 1.2)  # varia uns 20% pra cima ou pra baixo
-    
-    @staticmethod
-    def tempo_catraca() -> float:
-        # tem dois casos: passa normal ou dá problema
-        mu = math.log(config.CATRACA_RAPIDA_MEDIA)
-        sigma = config.CATRACA_RAPIDA_DESVIO / config.CATRACA_RAPIDA_MEDIA
-        
-        tempo_rapido = random.lognormvariate(mu, sigma)
-        
-        if random.random() < config.PROBABILIDADE_PROBLEMA:
-            mu_problema = math.log(config.CATRACA_PROBLEMA_MEDIA)
-            sigma_problema = config.CATRACA_PROBLEMA_DESVIO / config.CATRACA_PROBLEMA_MEDIA
-            tempo_extra = random.lognormvariate(mu_problema, sigma_problema)
-            return tempo_rapido + tempo_extra
-        
-        return tempo_rapido
-
+        # faixa da CDF que cai dentro do intervalo de chegadas
+        normal = statistics.NormalDist(centro_segundos, desvio_segundos)
+        cdf_inicio, cdf_fim = normal.cdf(inicio_segundos), normal.cdf(fim_segundos)
+        
+        # k-ésima uniforme ordenada = k-ésima soma acumulada / soma total (sem ordenar)
+        restos = 1.0 - self.rng.random(self.total_torcedores + 1)
+        somas = np.cumsum(-np.log(np.maximum(restos, np.finfo(float).tiny)))
+        uniformes = somas[:-1] / somas[-1]
+        
+        return centro_segundos + desvio_segundos * quantil_normal(cdf_inicio + uniformes * (cdf_fim - cdf_inicio))
+    
+    def gerar_populacao(self) -> Dict[str, np.ndarray]:
+        """
+        Gera a população inteira como arrays NumPy (modo em lote).
+        Esplanadas e portões vêm como códigos inteiros, índices de
+        config.obter_esplanadas() e config.obter_portoes().
+        """
+        tempos = self.gerar_tempos_chegada_vetorizado()
+        n = len(tempos)
+        
+        # 0 = Norte, 1 = Sul
+        esplanadas = (self.rng.random(n) >= self.proporcao_esplanada_norte).astype(np.int8)
+        
+        # portão proporcional à capacidade (CDF acumulada + busca binária)
+        sorteios = self.rng.random(n) * self._pesos_acumulados[-1]
+        portoes = np.searchsorted(self._pesos_acumulados, sorteios, side='right').astype(np.int8)
+        
+        ids = np.arange(self.torcedor_id + 1, self.torcedor_id + n + 1)
+        self.torcedor_id += n
+        
+        return {
+            'ids': ids,
+            'tempos_chegada': tempos,
+            'esplanadas': esplanadas,
+            'portoes': portoes
+        }
+    
+class AmostradorTempos:
+    """
+    Sorteia os tempos de serviço de uma etapa inteira de uma vez com NumPy
+    (revista, caminhada e catraca, um valor por torcedor).
+    """
+    
+    def __init__(self, rng: np.random.Generator = None, fluxos: FluxosAleatorios = None):
+        # com fluxos, cada etapa sorteia do seu próprio fluxo (números aleatórios comuns)
+        if fluxos is not None:
+            self._rng_revista = fluxos.revista
+            self._rng_caminhada = fluxos.caminhada
+            self._rng_catraca = fluxos.catracas
+        else:
+            rng = rng or np.random.default_rng()
+            self._rng_revista = self._rng_caminhada = self._rng_catraca = rng
+        
+        # tempo base de caminhada em matriz [esplanada, portão] (mesmos códigos do cadastro)
+        self._base_caminhada = np.array([
+            [config.TEMPOS_CAMINHADA[esplanada][portao] for portao in config.obter_portoes()]
+            for esplanada in config.obter_esplanadas()
+        ], dtype=float)
+        
+        # parâmetros das lognormais calculados uma vez só
+        self._mu_rapido = math.log(config.CATRACA_RAPIDA_MEDIA)
+        self._sigma_rapido = config.CATRACA_RAPIDA_DESVIO / config.CATRACA_RAPIDA_MEDIA
+        self._mu_problema = math.log(config.CATRACA_PROBLEMA_MEDIA)
+        self._sigma_problema = config.CATRACA_PROBLEMA_DESVIO / config.CATRACA_PROBLEMA_MEDIA
+    
+    def amostrar_revista(self, n: int) -> np.ndarray:
+        """Sorteia n tempos de revista (normal com piso de 5s)"""
+        tempos = self._rng_revista.normal(config.TEMPO_REVISTA_MEDIA, config.TEMPO_REVISTA_DESVIO, n)
+        return np.maximum(tempos, 5.0)
+    
+    def amostrar_fatores_caminhada(self, n: int) -> np.ndarray:
+        """Sorteia n fatores de variação da caminhada (uniforme 0.8 a 1.2)"""
+        return self._rng_caminhada.uniform(0.8, 1.2, n)
+    
+    def amostrar_caminhada(self, esplanadas: np.ndarray, portoes: np.ndarray) -> np.ndarray:
+        """Sorteia a caminhada de cada torcedor a partir dos códigos de esplanada e portão"""
+        return self._base_caminhada[esplanadas, portoes] * self.amostrar_fatores_caminhada(len(esplanadas))
+    
+    def amostrar_catraca(self, n: int) -> np.ndarray:
+        """Sorteia n tempos de catraca (lognormal rápida + extra quando dá problema)"""
+        tempos = self._rng_catraca.lognormal(self._mu_rapido, self._sigma_rapido, n)
+        problema = self._rng_catraca.random(n) < config.PROBABILIDADE_PROBLEMA
+        # o extra é sorteado para todos (e só somado em quem teve problema) para o
+        # i-ésimo sorteio ser sempre do i-ésimo torcedor, em qualquer cenário
+        extra = self._rng_catraca.lognormal(self._mu_problema, self._sigma_problema, n)
+        return np.where(problema, tempos + extra, tempos)
+    
 class MonitorDetalhado:
     def __init__(self):
         # tamanhos máximos das filas
         self.tamanho_max_fila_revista = 0
         self.tamanho_max_fila_catracas = {portao: 0 for portao in config.CAPACIDADES_PORTOES.keys()}
         
-        # histórico de tamanhos das filas (opcional)
-        self.historico_fila_revista = []
-        self.historico_fila_catracas = {portao: [] for portao in config.CAPACIDADES_PORTOES.keys()}
+        # linha do tempo das filas (opcional, ver RegistradorLinhaDoTempo)
+        self.linha_do_tempo = None
         
-        # controle de ocupação dos recursos
-        self.tempo_ocupacao_agentes_revista = {}  # quanto tempo cada agente ficou ocupado
-        self.tempo_ocupacao_catracas = {}  # {(portao, catraca_id): tempo_total_ocupado}
+        # sistemas observados (as integrais de fila e ocupação ficam neles)
+        self.sistema_revista = None
+        self.sistema_catracas = None
         
         # Tempo de início da simulação (para calcular duração total)
         self.tempo_inicio_simulacao = None
@@ -122,8 +151,35 @@ class MonitorDetalhado:
         self.total_revistas_finalizadas = 0
         self.total_entradas_finalizadas = 0
     
+    def conectar(self, sistema_revista, sistema_catracas):
+        """Passa a receber avisos das filas (só quando elas mudam de tamanho)"""
+        self.sistema_revista = sistema_revista
+        self.sistema_catracas = sistema_catracas
+        sistema_revista.registrar_observador_fila(self._ao_alterar_fila_revista, self._ao_carregar_fila_revista)
+        sistema_catracas.registrar_observador_filas(self._ao_alterar_fila_catraca, self._ao_carregar_fila_catraca)
+    
+    def _ao_alterar_fila_revista(self, tamanho: int, tempo_atual: float):
+        if tamanho > self.tamanho_max_fila_revista:
+            self.tamanho_max_fila_revista = tamanho
+    
+    def _ao_alterar_fila_catraca(self, portao: str, tamanho: int, tempo_atual: float):
+        if tamanho > self.tamanho_max_fila_catracas[portao]:
+            self.tamanho_max_fila_catracas[portao] = tamanho
+    
+    # versões em lote (motor vetorizado): a trajetória inteira da fila de uma vez
+    def _ao_carregar_fila_revista(self, tamanhos: np.ndarray, tempos: np.ndarray):
+        self.tamanho_max_fila_revista = max(self.tamanho_max_fila_revista, int(tamanhos.max()))
+    
+    def _ao_carregar_fila_catraca(self, portao: str, tamanhos: np.ndarray, tempos: np.ndarray):
+        self.tamanho_max_fila_catracas[portao] = max(self.tamanho_max_fila_catracas[portao], int(tamanhos.max()))
+    
     def atualizar_estatisticas(self, sistema_revista, sistema_catracas, tempo_atual, evento_tipo=None):
         """Atualiza estatísticas com dados atuais dos sistemas"""
+        # os máximos das filas já chegam pelos observadores (ver conectar)
+        self.registrar_evento(tempo_atual, evento_tipo)
+    
+    def registrar_evento(self, tempo_atual: float, evento_tipo=None):
+        """Atualiza tempos e contadores do monitor em O(1)"""
         
         # Marcar tempo de início da simulação
         if self.tempo_inicio_simulacao is None:
@@ -139,47 +195,15 @@ class MonitorDetalhado:
             self.total_revistas_finalizadas += 1
         elif evento_tipo == TipoEvento.FIM_CATRACA:
             self.total_entradas_finalizadas += 1
-        
-        # Atualizar tamanho máximo da fila de revista
-        tamanho_atual_revista = sistema_revista.fila.tamanho()
-        self.tamanho_max_fila_revista = max(self.tamanho_max_fila_revista, tamanho_atual_revista)
-        
-        # Atualizar tamanhos máximos das filas das catracas
-        for portao in sistema_catracas.filas:
-            tamanho_atual = sistema_catracas.filas[portao].tamanho()
-            self.tamanho_max_fila_catracas[portao] = max(
-                self.tamanho_max_fila_catracas[portao], 
-                tamanho_atual
-            )
-    
-    def registrar_inicio_servico_agente(self, agente_id: int, tempo_inicio: float):
-        """Registra o início de serviço de um agente de revista"""
-        if agente_id not in self.tempo_ocupacao_agentes_revista:
-            self.tempo_ocupacao_agentes_revista[agente_id] = 0.0
-        # O tempo de ocupação será calculado quando o serviço terminar
-    
-    def registrar_fim_servico_agente(self, agente_id: int, tempo_inicio: float, tempo_fim: float):
-        """Registra o fim de serviço de um agente de revista"""
-        if agente_id not in self.tempo_ocupacao_agentes_revista:
-            self.tempo_ocupacao_agentes_revista[agente_id] = 0.0
-        
-        duracao_servico = tempo_fim - tempo_inicio
-        self.tempo_ocupacao_agentes_revista[agente_id] += duracao_servico
     
-    def registrar_inicio_servico_catraca(self, portao: str, catraca_id: int, tempo_inicio: float):
-        """Registra o início de serviço de uma catraca"""
-        chave = (portao, catraca_id)
-        if chave not in self.tempo_ocupacao_catracas:
-            self.tempo_ocupacao_catracas[chave] = 0.0
-    
-    def registrar_fim_servico_catraca(self, portao: str, catraca_id: int, tempo_inicio: float, tempo_fim: float):
-        """Registra o fim de serviço de uma catraca"""
-        chave = (portao, catraca_id)
-        if chave not in self.tempo_ocupacao_catracas:
-            self.tempo_ocupacao_catracas[chave] = 0.0
-        
-        duracao_servico = tempo_fim - tempo_inicio
-        self.tempo_ocupacao_catracas[chave] += duracao_servico
+    def registrar_lote(self, tempo_inicio: float, tempo_fim: float, chegadas: int,
+                       revistas_finalizadas: int, entradas_finalizadas: int):
+        """Tempos e contadores de uma simulação inteira de uma vez (motor vetorizado)"""
+        self.tempo_inicio_simulacao = tempo_inicio
+        self.tempo_fim_simulacao = tempo_fim
+        self.total_chegadas += chegadas
+        self.total_revistas_finalizadas += revistas_finalizadas
+        self.total_entradas_finalizadas += entradas_finalizadas
     
     def obter_relatorio_detalhado(self) -> Dict:
         """Retorna relatório detalhado das estatísticas coletadas"""
@@ -189,42 +213,30 @@ class MonitorDetalhado:
         if self.tempo_inicio_simulacao is not None and self.tempo_fim_simulacao is not None:
             duracao_total = self.tempo_fim_simulacao - self.tempo_inicio_simulacao
         
-        # *** NOVA ABORDAGEM: Cálculo preciso de utilização ***
-        
-        # Utilização da revista baseada em tempo real de ocupação
+        # Utilização e fila média exatas, pelas integrais no tempo mantidas nos sistemas
         utilizacao_media_revista = 0.0
-        if duracao_total > 0 and self.tempo_ocupacao_agentes_revista:
-            tempo_total_ocupado_revista = sum(self.tempo_ocupacao_agentes_revista.values())
-            num_agentes_revista = len(self.tempo_ocupacao_agentes_revista)
+        fila_media_revista = 0.0
+        utilizacao_media_catracas = {portao: 0.0 for portao in config.CAPACIDADES_PORTOES.keys()}
+        filas_medias_catracas = {portao: 0.0 for portao in config.CAPACIDADES_PORTOES.keys()}
+        
+        if duracao_total > 0 and self.sistema_revista is not None:
+            inicio, fim = self.tempo_inicio_simulacao, self.tempo_fim_simulacao
+            utilizacao_media_revista = self.sistema_revista.utilizacao_media(inicio, fim) * 100
+            fila_media_revista = self.sistema_revista.fila.tamanho_medio(inicio, fim)
             
-            # Utilização = (tempo total ocupado de todos agentes) / (duração simulação * número de agentes)
-            tempo_total_disponivel = duracao_total * num_agentes_revista
-            utilizacao_media_revista = (tempo_total_ocupado_revista / tempo_total_disponivel) * 100
-        
-        # Utilização das catracas por portão
-        utilizacao_media_catracas = {}
-        for portao in config.CAPACIDADES_PORTOES.keys():
-            utilizacao_media_catracas[portao] = 0.0
-            
-            if duracao_total > 0:
-                # Somar tempo de ocupação de todas as catracas deste portão
-                tempo_total_ocupado_portao = 0.0
-                num_catracas_portao = 0
-                
-                for (p, catraca_id), tempo_ocupado in self.tempo_ocupacao_catracas.items():
-                    if p == portao:
-                        tempo_total_ocupado_portao += tempo_ocupado
-                        num_catracas_portao += 1
-                
-                if num_catracas_portao > 0:
-                    tempo_total_disponivel_portao = duracao_total * num_catracas_portao
-                    utilizacao_media_catracas[portao] = (tempo_total_ocupado_portao / tempo_total_disponivel_portao) * 100
+            for portao in self.sistema_catracas.catracas:
+                utilizacao_media_catracas[portao] = self.sistema_catracas.utilizacao_media(portao, inicio, fim) * 100
+                filas_medias_catracas[portao] = self.sistema_catracas.filas[portao].tamanho_medio(inicio, fim)
         
         return {
             'filas_maximas': {
                 'revista': self.tamanho_max_fila_revista,
                 'catracas': dict(self.tamanho_max_fila_catracas)
             },
+            'filas_medias': {
+                'revista': fila_media_revista,
+                'catracas': filas_medias_catracas
+            },
             'utilizacao_media': {
                 'revista': utilizacao_media_revista,
                 'catracas': utilizacao_media_catracas
@@ -240,220 +252,211 @@ class MonitorDetalhado:
                 'fim': self.tempo_fim_simulacao,
                 'duracao_minutos': duracao_total / 60 if duracao_total > 0 else 0
             },
-            # Manter históricos opcionais para análise detalhada
-            'historicos': {
-                'fila_revista': self.historico_fila_revista,
-                'filas_catracas': self.historico_fila_catracas
-            }
+            # linhas do tempo das filas, se ativadas (config.LINHA_DO_TEMPO)
+            'linha_do_tempo': self.linha_do_tempo.dados() if self.linha_do_tempo else None
         }
 
+# Motores de simulação aceitos por SimuladorMineirao
+MOTORES_SIMULACAO = ('eventos', 'vetorizado')
+
 class SimuladorMineirao:
     """
     Simulador principal do Estádio Mineirão
     """
     
-    def __init__(self, total_torcedores: int = None):
+    def __init__(self, total_torcedores: int = None, semente: int = None, backend_fel: str = None,
+                 antitetico: bool = False, agentes_revista: int = None,
+                 catracas_por_portao: Dict[str, int] = None, proporcao_esplanada_norte: float = None,
+                 motor: str = None, arquivo_rastro: str = None):
         # Usar configuração padrão se não especificado
+        # (agentes, catracas e esplanadas podem ser trocados por cenário, sem mexer na configuração)
         self.total_torcedores = total_torcedores or config.TOTAL_TORCEDORES
+        if agentes_revista is None:
+            agentes_revista = config.AGENTES_REVISTA
+        catracas_por_portao = {**config.CATRACAS_POR_PORTAO, **(catracas_por_portao or {})}
+        if agentes_revista < 1 or min(catracas_por_portao.values()) < 1:
+            # etapa sem servidores: a fila nunca anda e as utilizações não têm denominador
+            raise ValueError(f"Revista e portões precisam de pelo menos 1 servidor "
+                             f"(agentes: {agentes_revista}, catracas: {catracas_por_portao})")
+        
+        # Cada simulador tem seu próprio relógio/FEL e seus fluxos aleatórios
+        # (nada compartilhado em nível de módulo, dá pra ter várias no mesmo processo)
+        self.semente = semente
+        self.fluxos = FluxosAleatorios(semente, antitetico)
+        self.gerenciador_eventos = GerenciadorEventos(backend_fel)
         
         # Inicializar componentes
-        self.gerador_chegadas = GeradorChegadas(self.total_torcedores)
-        self.sistema_revista = SistemaRevista(config.AGENTES_REVISTA)
-        self.sistema_catracas = SistemaCatracas(config.CATRACAS_POR_PORTAO)
-        self.estatisticas = EstatisticasSimulacao()
+        self.gerador_chegadas = GeradorChegadas(self.total_torcedores, self.fluxos.chegadas,
+                                                proporcao_esplanada_norte)
+        self.cadastro = CadastroTorcedores(self.total_torcedores)
+        self.sistema_revista = SistemaRevista(agentes_revista, self.cadastro)
+        self.sistema_catracas = SistemaCatracas(catracas_por_portao, self.cadastro)
+        self.estatisticas = EstatisticasSimulacao(self.cadastro)
         self.monitor = MonitorDetalhado()
-        
-        # Estado da simulação
-        self.torcedores: Dict[int, Torcedor] = {}
+        self.monitor.conectar(self.sistema_revista, self.sistema_catracas)
+        if config.LINHA_DO_TEMPO:
+            self.monitor.linha_do_tempo = RegistradorLinhaDoTempo()
+            self.monitor.linha_do_tempo.conectar(self.sistema_revista, self.sistema_catracas)
+        self.tempos_servico = AmostradorTempos(fluxos=self.fluxos)
+        
+        # 'eventos' (laço de eventos) ou 'vetorizado' (motor_vetorizado.py, mesmos tempos)
+        self.motor = motor or config.MOTOR_SIMULACAO
+        if self.motor not in MOTORES_SIMULACAO:
+            raise ValueError(f"Motor de simulação desconhecido: {self.motor} (opções: {list(MOTORES_SIMULACAO)})")
+        
+        # rastro de eventos em disco (rastreamento.py), só no laço de eventos
+        self.arquivo_rastro = arquivo_rastro
+        if arquivo_rastro is not None and self.motor != 'eventos':
+            raise ValueError("O rastro de eventos só existe no motor 'eventos'")
+        
+        # Estado da simulação (os torcedores ficam no cadastro colunar)
         self.simulacao_finalizada = False
     
+    def sortear_populacao(self) -> Dict[str, np.ndarray]:
+        """Sorteia os torcedores e as durações de cada etapa e carrega no cadastro"""
+        populacao = self.gerador_chegadas.gerar_populacao()
+        self.cadastro.carregar_populacao(populacao)
+        
+        # Tempos de serviço sorteados por torcedor (cada etapa no seu fluxo): com a
+        # mesma semente, o torcedor i tem os mesmos tempos em qualquer configuração
+        ids = populacao['ids']
+        self.cadastro.duracao_revista[ids] = self.tempos_servico.amostrar_revista(len(ids))
+        self.cadastro.duracao_caminhada[ids] = self.tempos_servico.amostrar_caminhada(
+            populacao['esplanadas'], populacao['portoes']
+        )
+        self.cadastro.duracao_catraca[ids] = self.tempos_servico.amostrar_catraca(len(ids))
+        return populacao
+    
     def agendar_chegadas(self):
         """Agenda todos os eventos de chegada"""
-        torcedores = self.gerador_chegadas.gerar_torcedores()
-        
-        for torcedor in torcedores:
-            # Armazenar torcedor
-            self.torcedores[torcedor.id] = torcedor
-            
-            # Agendar evento de chegada
-            gerenciador_eventos.agendar_evento_absoluto(
-                tempo_absoluto=torcedor.tempo_chegada,
-                tipo=TipoEvento.CHEGADA,
-                torcedor_id=torcedor.id
-            )
+        populacao = self.sortear_populacao()
+        
+        # As chegadas já vêm ordenadas: entram como fluxo, puxadas da lista só
+        # quando chega a vez delas (a FEL fica só com os torcedores em atendimento)
+        self.gerenciador_eventos.agendar_fluxo(
+            tempos=populacao['tempos_chegada'].tolist(),
+            tipo=TipoEvento.CHEGADA,
+            torcedor_ids=populacao['ids'].tolist()
+        )
     
-    def processar_evento_chegada(self, evento):
+    def processar_evento_chegada(self, torcedor_id: int):
         """Processa chegada de torcedor"""
-        torcedor = self.torcedores[evento.torcedor_id]
-        
-        # Verificar se há agente de revista livre
-        agente = self.sistema_revista.obter_agente_livre()
+        # Iniciar revista imediatamente se houver agente livre
+        agente = self.sistema_revista.alocar_agente(torcedor_id, self.gerenciador_eventos.tempo_atual)
         
         if agente:
-            # Iniciar revista imediatamente
-            agente.iniciar_servico(torcedor, gerenciador_eventos.tempo_atual)
-            
-            # Registrar início do serviço no monitor
-            self.monitor.registrar_inicio_servico_agente(agente.id, gerenciador_eventos.tempo_atual)
-            
             # Agendar fim da revista
-            tempo_revista = TemposServico.tempo_revista()
-            gerenciador_eventos.agendar_evento(
+            tempo_revista = float(self.cadastro.duracao_revista[torcedor_id])
+            self.gerenciador_eventos.agendar_evento(
                 tempo_delay=tempo_revista,
                 tipo=TipoEvento.FIM_REVISTA,
-                torcedor_id=torcedor.id,
-                dados={'agente_id': agente.id, 'tempo_inicio': gerenciador_eventos.tempo_atual}
+                torcedor_id=torcedor_id,
+                servidor_id=agente.id
             )
         else:
             # Adicionar à fila
-            self.sistema_revista.adicionar_fila(torcedor, gerenciador_eventos.tempo_atual)
+            self.sistema_revista.adicionar_fila(torcedor_id, self.gerenciador_eventos.tempo_atual)
         
         # Atualizar estatísticas detalhadas
-        self.monitor.atualizar_estatisticas(
-            self.sistema_revista, 
-            self.sistema_catracas, 
-            gerenciador_eventos.tempo_atual,
-            TipoEvento.CHEGADA
-        )
+        self.monitor.registrar_evento(self.gerenciador_eventos.tempo_atual, TipoEvento.CHEGADA)
     
-    def processar_evento_fim_revista(self, evento):
+    def processar_evento_fim_revista(self, torcedor_id: int, agente_id: int):
         """Processa fim da revista"""
-        torcedor = self.torcedores[evento.torcedor_id]
-        agente_id = evento.dados['agente_id']
-        tempo_inicio = evento.dados['tempo_inicio']
-        agente = self.sistema_revista.agentes[agente_id]
-        
-        # Registrar fim do serviço no monitor
-        self.monitor.registrar_fim_servico_agente(agente_id, tempo_inicio, gerenciador_eventos.tempo_atual)
-        
-        # Finalizar serviço
-        agente.finalizar_servico(gerenciador_eventos.tempo_atual)
+        # Finalizar serviço (agente volta para a pilha de livres)
+        self.sistema_revista.liberar_agente(agente_id, self.gerenciador_eventos.tempo_atual)
         
         # Verificar se há próximo na fila
-        proximo = self.sistema_revista.proximo_da_fila(gerenciador_eventos.tempo_atual)
-        if proximo:
-            # Iniciar revista do próximo
-            agente.iniciar_servico(proximo, gerenciador_eventos.tempo_atual)
-            
-            # Registrar início do serviço no monitor
-            self.monitor.registrar_inicio_servico_agente(agente.id, gerenciador_eventos.tempo_atual)
+        proximo = self.sistema_revista.proximo_da_fila(self.gerenciador_eventos.tempo_atual)
+        if proximo is not None:
+            # Iniciar revista do próximo (pega o agente que acabou de ser liberado)
+            agente = self.sistema_revista.alocar_agente(proximo, self.gerenciador_eventos.tempo_atual)
             
             # Agendar fim da revista
-            tempo_revista = TemposServico.tempo_revista()
-            gerenciador_eventos.agendar_evento(
+            tempo_revista = float(self.cadastro.duracao_revista[proximo])
+            self.gerenciador_eventos.agendar_evento(
                 tempo_delay=tempo_revista,
                 tipo=TipoEvento.FIM_REVISTA,
-                torcedor_id=proximo.id,
-                dados={'agente_id': agente.id, 'tempo_inicio': gerenciador_eventos.tempo_atual}
+                torcedor_id=proximo,
+                servidor_id=agente.id
             )
         
         # Agendar chegada ao portão (início da caminhada)
-        tempo_caminhada = TemposServico.tempo_caminhada(torcedor.esplanada, torcedor.portao)
-        gerenciador_eventos.agendar_evento(
+        tempo_caminhada = float(self.cadastro.duracao_caminhada[torcedor_id])
+        self.gerenciador_eventos.agendar_evento(
             tempo_delay=tempo_caminhada,
             tipo=TipoEvento.CHEGADA_PORTAO,
-            torcedor_id=torcedor.id
+            torcedor_id=torcedor_id
         )
         
         # Atualizar estatísticas detalhadas
-        self.monitor.atualizar_estatisticas(
-            self.sistema_revista, 
-            self.sistema_catracas, 
-            gerenciador_eventos.tempo_atual,
-            TipoEvento.FIM_REVISTA
-        )
+        self.monitor.registrar_evento(self.gerenciador_eventos.tempo_atual, TipoEvento.FIM_REVISTA)
     
-    def processar_evento_chegada_portao(self, evento):
+    def processar_evento_chegada_portao(self, torcedor_id: int):
         """Processa chegada do torcedor ao portão"""
-        torcedor = self.torcedores[evento.torcedor_id]
-        torcedor.tempo_chegada_portao = gerenciador_eventos.tempo_atual
+        portao = self.cadastro.portao(torcedor_id)
+        self.cadastro.tempo_chegada_portao[torcedor_id] = self.gerenciador_eventos.tempo_atual
         
-        # Verificar se há catraca livre
-        catraca = self.sistema_catracas.obter_catraca_livre(torcedor.portao)
+        # Iniciar passagem imediatamente se houver catraca livre
+        catraca = self.sistema_catracas.alocar_catraca(torcedor_id, portao, self.gerenciador_eventos.tempo_atual)
         
         if catraca:
-            # Iniciar passagem imediatamente
-            catraca.iniciar_servico(torcedor, gerenciador_eventos.tempo_atual)
-            
-            # Registrar início do serviço no monitor
-            self.monitor.registrar_inicio_servico_catraca(torcedor.portao, catraca.id, gerenciador_eventos.tempo_atual)
-            
             # Agendar fim da passagem
-            tempo_catraca = TemposServico.tempo_catraca()
-            gerenciador_eventos.agendar_evento(
+            tempo_catraca = float(self.cadastro.duracao_catraca[torcedor_id])
+            self.gerenciador_eventos.agendar_evento(
                 tempo_delay=tempo_catraca,
                 tipo=TipoEvento.FIM_CATRACA,
-                torcedor_id=torcedor.id,
-                dados={'catraca_id': catraca.id, 'portao': torcedor.portao, 'tempo_inicio': gerenciador_eventos.tempo_atual}
+                torcedor_id=torcedor_id,
+                servidor_id=catraca.id
             )
         else:
             # Adicionar à fila do portão
-            self.sistema_catracas.adicionar_fila(torcedor, gerenciador_eventos.tempo_atual)
+            self.sistema_catracas.adicionar_fila(torcedor_id, portao, self.gerenciador_eventos.tempo_atual)
     
-    def processar_evento_fim_catraca(self, evento):
+    def processar_evento_fim_catraca(self, torcedor_id: int, catraca_id: int):
         """Processa fim da passagem pela catraca"""
-        torcedor = self.torcedores[evento.torcedor_id]
-        catraca_id = evento.dados['catraca_id']
-        portao = evento.dados['portao']
-        tempo_inicio = evento.dados['tempo_inicio']
-        
-        # Registrar fim do serviço no monitor
-        self.monitor.registrar_fim_servico_catraca(portao, catraca_id, tempo_inicio, gerenciador_eventos.tempo_atual)
-        
-        # Encontrar catraca
-        catraca = None
-        for c in self.sistema_catracas.catracas[portao]:
-            if c.id == catraca_id:
-                catraca = c
-                break
-        
-        if not catraca:
-            raise ValueError(f"Catraca {catraca_id} não encontrada no portão {portao}")
+        portao = self.cadastro.portao(torcedor_id)
         
-        # Finalizar serviço
-        catraca.finalizar_servico(gerenciador_eventos.tempo_atual)
+        # Finalizar serviço (catraca volta para a pilha de livres do portão)
+        self.sistema_catracas.liberar_catraca(portao, catraca_id, self.gerenciador_eventos.tempo_atual)
         
         # Adicionar às estatísticas (torcedor completou processo)
-        self.estatisticas.adicionar_torcedor(torcedor)
+        self.estatisticas.adicionar_torcedor(torcedor_id)
         
         # Verificar se há próximo na fila do portão
-        proximo = self.sistema_catracas.proximo_da_fila(portao, gerenciador_eventos.tempo_atual)
-        if proximo:
-            # Iniciar passagem do próximo
-            catraca.iniciar_servico(proximo, gerenciador_eventos.tempo_atual)
-            
-            # Registrar início do serviço no monitor
-            self.monitor.registrar_inicio_servico_catraca(portao, catraca.id, gerenciador_eventos.tempo_atual)
+        proximo = self.sistema_catracas.proximo_da_fila(portao, self.gerenciador_eventos.tempo_atual)
+        if proximo is not None:
+            # Iniciar passagem do próximo (pega a catraca que acabou de ser liberada)
+            catraca = self.sistema_catracas.alocar_catraca(proximo, portao, self.gerenciador_eventos.tempo_atual)
             
             # Agendar fim da passagem
-            tempo_catraca = TemposServico.tempo_catraca()
-            gerenciador_eventos.agendar_evento(
+            tempo_catraca = float(self.cadastro.duracao_catraca[proximo])
+            self.gerenciador_eventos.agendar_evento(
                 tempo_delay=tempo_catraca,
                 tipo=TipoEvento.FIM_CATRACA,
-                torcedor_id=proximo.id,
-                dados={'catraca_id': catraca.id, 'portao': portao, 'tempo_inicio': gerenciador_eventos.tempo_atual}
+                torcedor_id=proximo,
+                servidor_id=catraca.id
             )
         
         # Atualizar estatísticas detalhadas
-        self.monitor.atualizar_estatisticas(
-            self.sistema_revista, 
-            self.sistema_catracas, 
-            gerenciador_eventos.tempo_atual,
-            TipoEvento.FIM_CATRACA
-        )
+        self.monitor.registrar_evento(self.gerenciador_eventos.tempo_atual, TipoEvento.FIM_CATRACA)
     
     def executar_simulacao(self, verbose: bool = True):
         """
         Executa a simulação completa usando event scheduling
+        (ou o motor vetorizado, se self.motor == 'vetorizado')
         """
+        if self.motor == 'vetorizado':
+            executar_vetorizado(self, verbose)
+            return
+        
         if verbose:
             print("🏟️  Iniciando simulação do Estádio Mineirão...")
             print(f"Total de torcedores: {self.total_torcedores:,}")
-            print(f"Agentes de revista: {config.AGENTES_REVISTA}")
+            print(f"Agentes de revista: {len(self.sistema_revista.agentes)}")
             print("=" * 60)
         
         # Resetar sistemas
-        gerenciador_eventos.resetar()
+        self.gerenciador_eventos.resetar()
         
         # Agendar todas as chegadas
         if verbose:
@@ -461,7 +464,7 @@ class SimuladorMineirao:
         self.agendar_chegadas()
         
         if verbose:
-            print(f"✅ {len(self.torcedores)} torcedores agendados")
+            print(f"✅ {self.cadastro.total} torcedores agendados")
             print("🎬 Iniciando loop principal de eventos...")
             print()
         
@@ -469,44 +472,65 @@ class SimuladorMineirao:
         eventos_processados = 0
         ultimo_relatorio = 0
         intervalo_relatorio = 20000  # Mostrar relatório a cada 20k eventos
+        rastro = GravadorRastro(self.arquivo_rastro) if self.arquivo_rastro is not None else None
         
-        while gerenciador_eventos.tem_eventos():
-            evento = gerenciador_eventos.proximo_evento()
-            
-            # Processar evento baseado no tipo
-            if evento.tipo == TipoEvento.CHEGADA:
-                self.processar_evento_chegada(evento)
-            
-            elif evento.tipo == TipoEvento.FIM_REVISTA:
-                self.processar_evento_fim_revista(evento)
-            
-            elif evento.tipo == TipoEvento.CHEGADA_PORTAO:
-                self.processar_evento_chegada_portao(evento)
-            
-            elif evento.tipo == TipoEvento.FIM_CATRACA:
-                self.processar_evento_fim_catraca(evento)
-            
-            eventos_processados += 1
-            
-            # Progress update com estatísticas detalhadas
-            if verbose and eventos_processados - ultimo_relatorio >= intervalo_relatorio:
-                self._imprimir_relatorio_progresso(eventos_processados)
-                ultimo_relatorio = eventos_processados
+        try:
+            while self.gerenciador_eventos.tem_eventos():
+                tempo, _, tipo, torcedor_id, servidor_id = self.gerenciador_eventos.proximo_evento()
+                
+                # Processar evento baseado no tipo
+                if tipo == TipoEvento.CHEGADA:
+                    self.processar_evento_chegada(torcedor_id)
+                
+                elif tipo == TipoEvento.FIM_REVISTA:
+                    self.processar_evento_fim_revista(torcedor_id, servidor_id)
+                
+                elif tipo == TipoEvento.CHEGADA_PORTAO:
+                    self.processar_evento_chegada_portao(torcedor_id)
+                
+                elif tipo == TipoEvento.FIM_CATRACA:
+                    self.processar_evento_fim_catraca(torcedor_id, servidor_id)
+                
+                if rastro is not None:
+                    self._registrar_rastro(rastro, tempo, tipo, torcedor_id, servidor_id)
+                
+                eventos_processados += 1
+                
+                # Progress update com estatísticas detalhadas
+                if verbose and eventos_processados - ultimo_relatorio >= intervalo_relatorio:
+                    self._imprimir_relatorio_progresso(eventos_processados)
+                    ultimo_relatorio = eventos_processados
+        finally:
+            # o rastro fica legível até o último bloco mesmo se a simulação parar no meio
+            if rastro is not None:
+                rastro.fechar()
         
         self.simulacao_finalizada = True
+        if self.monitor.linha_do_tempo:
+            self.monitor.linha_do_tempo.fechar()
         
         if verbose:
             print()
             print("✅ Simulação finalizada!")
             print(f"Total de eventos processados: {eventos_processados:,}")
-            print(f"Tempo final da simulação: {gerenciador_eventos.tempo_atual/60:.4f} minutos")
-            print(f"Torcedores que completaram processo: {len(self.estatisticas.torcedores_completos):,}")
+            print(f"Tempo final da simulação: {self.gerenciador_eventos.tempo_atual/60:.4f} minutos")
+            print(f"Torcedores que completaram processo: {self.estatisticas.total_completos:,}")
             self._imprimir_relatorio_final_detalhado()
             print()
     
+    def _registrar_rastro(self, rastro: GravadorRastro, tempo: float, tipo: TipoEvento,
+                          torcedor_id: int, servidor_id: int):
+        """Grava o evento no rastro com o tamanho da fila da etapa depois dele"""
+        if tipo == TipoEvento.CHEGADA or tipo == TipoEvento.FIM_REVISTA:
+            rastro.registrar(tempo, tipo, torcedor_id, servidor_id, -1, self.sistema_revista.fila.tamanho())
+        else:
+            codigo = int(self.cadastro.codigo_portao[torcedor_id])
+            fila = self.sistema_catracas.filas[self.cadastro.portoes[codigo]]
+            rastro.registrar(tempo, tipo, torcedor_id, servidor_id, codigo, fila.tamanho())
+    
     def _imprimir_relatorio_progresso(self, eventos_processados):
         """Imprime relatório de progresso com estatísticas detalhadas"""
-        tempo_atual_min = gerenciador_eventos.tempo_atual / 60
+        tempo_atual_min = self.gerenciador_eventos.tempo_atual / 60
         
         print(f"\n⏱️  PROGRESSO: {tempo_atual_min:8.4f} min | {eventos_processados:,} eventos processados")
         print("🗺️  SITUAÇÃO ATUAL DAS FILAS:")
@@ -524,7 +548,7 @@ class SimuladorMineirao:
         
         print("\n📈 UTILIZAÇÃO DE RECURSOS:")
         # Utilização de recursos
-        agentes_ocupados = sum(1 for a in self.sistema_revista.agentes if a.ocupado)
+        agentes_ocupados = self.sistema_revista.agentes_ocupados()
         utilizacao_revista = (agentes_ocupados / len(self.sistema_revista.agentes)) * 100
         print(f"   👥 Agentes Revista: {agentes_ocupados}/{len(self.sistema_revista.agentes)} ocupados ({utilizacao_revista:.4f}% utilização)")
         
@@ -549,6 +573,12 @@ class SimuladorMineirao:
         for portao, tamanho in sorted(relatorio['filas_maximas']['catracas'].items()):
             print(f"      → Portão {portao}: {tamanho} pessoas (pico)")
         
+        print("\n📏 TAMANHOS MÉDIOS DAS FILAS (Ponderados pelo Tempo):")
+        print(f"   📋 Fila da Revista: {relatorio['filas_medias']['revista']:.2f} pessoas em média")
+        print("   🚪 Filas dos Portões:")
+        for portao, tamanho in sorted(relatorio['filas_medias']['catracas'].items()):
+            print(f"      → Portão {portao}: {tamanho:.2f} pessoas em média")
+        
         print("\n👥 UTILIZAÇÃO MÉDIA DOS RECURSOS (Durante Toda Simulação):")
         print(f"   📋 Agentes de Revista: {relatorio['utilizacao_media']['revista']:.4f}% (tempo médio ocupados)")
         print("   🚪 Catracas por Portão:")
@@ -579,28 +609,195 @@ class SimuladorMineirao:
             'estatisticas': self.estatisticas.relatorio_completo(),
             'sistema_revista': self.sistema_revista.estatisticas(),
             'sistema_catracas': self.sistema_catracas.estatisticas(),
-            'gerenciador_eventos': gerenciador_eventos.estatisticas_fel(),
+            'gerenciador_eventos': self.gerenciador_eventos.estatisticas_fel(),
             'monitor_detalhado': self.monitor.obter_relatorio_detalhado()
         }
 
+# Parâmetros que um cenário pode trocar (argumentos de SimuladorMineirao)
+PARAMETROS_CENARIO = ('agentes_revista', 'catracas_por_portao', 'proporcao_esplanada_norte')
+
+def validar_cenario(cenario: Dict = None):
+    """Erro claro para parâmetros de cenário desconhecidos (antes de simular ou montar a chave do cache)"""
+    desconhecidos = sorted(set(cenario or {}) - set(PARAMETROS_CENARIO))
+    if desconhecidos:
+        raise ValueError(f"Parâmetros de cenário desconhecidos: {desconhecidos} (opções: {list(PARAMETROS_CENARIO)})")
+
+def executar_replicacao(simulacao_id: int, semente=None, total_torcedores: int = None,
+                        verbose: bool = False, antitetico: bool = False, cenario: Dict = None,
+                        diretorio_exportacao: str = None, usar_cache: bool = True) -> Dict:
+    """
+    Executa uma replicação e devolve o resumo dela.
+    Fica no nível do módulo para poder rodar dentro do ProcessPoolExecutor.
+    `cenario` troca parâmetros da configuração (ver PARAMETROS_CENARIO).
+    Com `diretorio_exportacao`, grava também a tabela de torcedores (exportacao.py).
+    `usar_cache` = False quando a semente não foi fixada pelo usuário (derivada
+    de entropia nova, a chave nunca se repetiria).
+    """
+    validar_cenario(cenario)
+    
+    # com semente fixa o resultado é reprodutível e pode vir do cache em disco
+    cache = chave = None
+    if config.CACHE_RESULTADOS and usar_cache and semente is not None:
+        cache = CacheResultados()
+        chave = chave_replicacao(semente, total_torcedores, antitetico, cenario)
+        # o cache só tem o resumo: para exportar os torcedores é preciso simular
+        resultado = cache.obter(chave) if diretorio_exportacao is None else None
+        if resultado is not None:
+            if verbose:
+                print(f"♻️  Replicação {simulacao_id} recuperada do cache")
+            resultado['simulacao_id'] = simulacao_id
+            return resultado
+    
+    simulador = SimuladorMineirao(total_torcedores, semente=semente, antitetico=antitetico, **(cenario or {}))
+    simulador.executar_simulacao(verbose=verbose)
+    if diretorio_exportacao is not None:
+        exportar_torcedores(simulador.cadastro, diretorio_exportacao, simulacao_id, cenario)
+    
+    resultado = _resumo_replicacao(simulacao_id, antitetico, simulador)
+    if cache is not None:
+        cache.guardar(chave, resultado)
+    return resultado
+
+def _resumo_replicacao(simulacao_id: int, antitetico: bool, simulador: SimuladorMineirao) -> Dict:
+    """Resumo de um simulador já executado (o que o GerenciadorSimulacoes guarda)"""
+    return {
+        'simulacao_id': simulacao_id,
+        'antitetico': antitetico,
+        'relatorio': simulador.estatisticas.relatorio_completo(),
+        'sistema_revista': simulador.sistema_revista.estatisticas(),
+        'sistema_catracas': simulador.sistema_catracas.estatisticas(),
+        'monitor_detalhado': simulador.monitor.obter_relatorio_detalhado(),
+        'dados_chegadas': simulador.cadastro.tempo_chegada[1:].tolist()  # Adicionar dados de chegada
+    }
+
+def executar_replicacoes_em_lote(simulacao_ids: List[int], sementes: List, total_torcedores: int = None,
+                                 espelhadas: List[bool] = None, cenario: Dict = None,
+                                 diretorio_exportacao: str = None, usar_cache: bool = True) -> List[Dict]:
+    """
+    Executa várias replicações do mesmo cenário numa passada do motor
+    vetorizado (executar_lote_vetorizado) e devolve os resumos na ordem
+    dos ids, iguais aos de executar_replicacao (o cache segue as mesmas
+    regras). Também fica no nível do módulo para rodar dentro do
+    ProcessPoolExecutor.
+    """
+    validar_cenario(cenario)
+    espelhadas = espelhadas or [False] * len(simulacao_ids)
+    resultados: List[Dict] = [None] * len(simulacao_ids)
+    
+    # as que estão no cache não entram no lote
+    cache = None
+    chaves = [None] * len(simulacao_ids)
+    if config.CACHE_RESULTADOS and usar_cache:
+        cache = CacheResultados()
+        for k, semente in enumerate(sementes):
+            if semente is None:
+                continue
+            chaves[k] = chave_replicacao(semente, total_torcedores, espelhadas[k], cenario)
+            resultado = cache.obter(chaves[k]) if diretorio_exportacao is None else None
+            if resultado is not None:
+                resultado['simulacao_id'] = simulacao_ids[k]
+                resultados[k] = resultado
+    
+    pendentes = [k for k, resultado in enumerate(resultados) if resultado is None]
+    if pendentes:
+        simuladores = [
+            SimuladorMineirao(total_torcedores, semente=sementes[k], antitetico=espelhadas[k],
+                              motor='vetorizado', **(cenario or {}))
+            for k in pendentes
+        ]
+        executar_lote_vetorizado(simuladores)
+        for k, simulador in zip(pendentes, simuladores):
+            if diretorio_exportacao is not None:
+                exportar_torcedores(simulador.cadastro, diretorio_exportacao, simulacao_ids[k], cenario)
+            resultados[k] = _resumo_replicacao(simulacao_ids[k], espelhadas[k], simulador)
+            if cache is not None and chaves[k] is not None:
+                cache.guardar(chaves[k], resultados[k])
+    return resultados
+
+def metricas_replicacao(resultado: Dict) -> Dict[str, float]:
+    """Métricas principais de uma replicação (saída de executar_replicacao)"""
+    resumo = resultado['relatorio']['resumo_geral']
+    tempos = resultado['relatorio']
+    monitor_det = resultado['monitor_detalhado']
+    
+    # Para catracas, pegar a maior fila entre todos os portões
+    filas_catracas = monitor_det['filas_maximas']['catracas']
+    max_fila_catracas = max(filas_catracas.values()) if filas_catracas else 0
+    
+    # Utilização média ponderada pelo número de catracas de cada portão (do próprio cenário)
+    utilizacao_ponderada = 0
+    total_catracas = 0
+    for portao, utilizacao in monitor_det['utilizacao_media']['catracas'].items():
+        num_catracas = resultado['sistema_catracas'][portao]['total_catracas']
+        utilizacao_ponderada += utilizacao * num_catracas
+        total_catracas += num_catracas
+    
+    return {
+        'percentual_entrada_antes_jogo': resumo['percentual_entrada_antes_jogo'],
+        'tempo_final_entrada': resumo['tempo_final_entrada'],
+        'tempo_medio_fila_total': resumo['tempo_medio_fila_total'],
+        'tempo_medio_entrada_total': resumo['tempo_medio_entrada_total'],
+        'tempo_medio_espera_revista': tempos['tempos_espera_revista']['media'],
+        'tempo_medio_espera_catraca': tempos['tempos_espera_catraca']['media'],
+        'fila_maxima_revista': monitor_det['filas_maximas']['revista'],
+        'utilizacao_media_revista': monitor_det['utilizacao_media']['revista'],
+        'fila_maxima_catracas_global': max_fila_catracas,
+        'utilizacao_media_catracas_global': utilizacao_ponderada / total_catracas if total_catracas > 0 else 0
+    }
+
 class GerenciadorSimulacoes:
     """
     Gerencia a execução de simulações (1 ou múltiplas) e coleta estatísticas
     """
     
-    def __init__(self):
+    def __init__(self, num_processos: int = None, semente: int = None, antitetico: bool = None,
+                 cenario: Dict = None, diretorio_exportacao: str = None):
+        validar_cenario(cenario)
         self.numero_simulacoes = config.NUMERO_SIMULACOES
+        self.cenario = cenario or {}
+        # tabela de torcedores de cada replicação em .npy (None = não exporta)
+        self.diretorio_exportacao = diretorio_exportacao or config.EXPORTACAO_DIRETORIO
+        self.num_processos = num_processos or config.NUM_PROCESSOS
+        self.semente = semente if semente is not None else config.SEMENTE
+        self.antitetico = antitetico if antitetico is not None else config.REPLICACOES_ANTITETICAS
         self.resultados_simulacoes = []
         self.estatisticas_agregadas = None
+        self.tempos_agregados = None
+        self.relatorio_precisao = None
+        
+        # sementes das replicações saem em sequência desta raiz (lote após lote);
+        # sem semente fixa a raiz vem de entropia nova e o cache não é usado
+        self._sequencia_sementes = np.random.SeedSequence(self.semente)
+        self._usar_cache = self.semente is not None
+    
+    def _sementes_replicacoes(self, quantidade: int) -> List[np.random.SeedSequence]:
+        """
+        Sementes das próximas replicações, derivadas da semente do gerenciador.
+        Com a mesma semente, a replicação i de dois cenários usa os mesmos números
+        (números aleatórios comuns). No modo antitético as replicações vêm em pares
+        (2k, 2k+1) com a mesma semente, a segunda espelhada.
+        """
+        if self.antitetico:
+            sementes = self._sequencia_sementes.spawn((quantidade + 1) // 2)
+            return [sementes[i // 2] for i in range(quantidade)]
+        return self._sequencia_sementes.spawn(quantidade)
+    
+    def _replicacao_espelhada(self, i: int) -> bool:
+        return self.antitetico and i % 2 == 1
     
     def executar_simulacoes(self, verbose: bool = True):
         """Executa as simulações e coleta resultados"""
         
+        if self.antitetico and self.numero_simulacoes % 2 != 0:
+            raise ValueError(f"Modo antitético precisa de número par de simulações ({self.numero_simulacoes})")
+        
         if verbose:
             if self.numero_simulacoes == 1:
                 print("🔄 Executando simulação...")
             else:
                 print(f"🔄 Executando {self.numero_simulacoes} simulações...")
+            if self.num_processos > 1 and self.numero_simulacoes > 1:
+                print(f"⚙️  Em paralelo: {self.num_processos} processos")
             
             # Mostrar informações de tempo do jogo
             print(f"⏰ Horário de referência do jogo: 0 minutos (início da partida)")
@@ -608,41 +805,159 @@ class GerenciadorSimulacoes:
             print(f"📅 Chegadas: de -{config.TEMPO_PRE_JOGO} min até 0 min (início do jogo)")
             print("=" * 80)
         
-        for i in range(self.numero_simulacoes):
-            if verbose and self.numero_simulacoes > 1:
-                print(f"\n🎯 SIMULAÇÃO {i+1}/{self.numero_simulacoes}")
-                print("-" * 50)
-            
-            # Executar simulação individual (verbose apenas se for 1 simulação)
-            simulador = SimuladorMineirao()
-            simulador.executar_simulacao(verbose=verbose and self.numero_simulacoes == 1)
-            
-            # Coletar resultados
-            resultado = {
-                'simulacao_id': i + 1,
-                'relatorio': simulador.estatisticas.relatorio_completo(),
-                'sistema_revista': simulador.sistema_revista.estatisticas(),
-                'sistema_catracas': simulador.sistema_catracas.estatisticas(),
-                'monitor_detalhado': simulador.monitor.obter_relatorio_detalhado(),
-                'dados_chegadas': [t.tempo_chegada for t in simulador.torcedores.values()]  # Adicionar dados de chegada
-            }
-            self.resultados_simulacoes.append(resultado)
-            
-            # Mostrar resumo detalhado apenas das primeiras 5 simulações
-            if verbose and self.numero_simulacoes > 1:
-                if i < 5:  # Mostrar detalhes apenas das 5 primeiras
-                    self._imprimir_resumo_simulacao(resultado, i+1)
-                elif i == 5:  # Na 6ª simulação, avisar que os detalhes não serão mais mostrados
-                    print(f"✓ Simulação {i+1} concluída (detalhes ocultados para evitar logs extensos)")
-                    print("💡 Executando simulações restantes... (detalhes serão mostrados no relatório final)")
-                else:  # Da 7ª em diante, apenas indicar conclusão
-                    print(f"✓ Simulação {i+1} concluída")
+        self._executar_lote(self.numero_simulacoes, verbose)
         
         # Sempre calcular estatísticas agregadas (mesmo para N=1)
         self._calcular_estatisticas_agregadas()
         
         return self.resultados_simulacoes
     
+    def _executar_lote(self, quantidade: int, verbose: bool, total_previsto: int = None):
+        """Executa as próximas `quantidade` replicações (em sequência ou em paralelo)"""
+        total_previsto = total_previsto or self.numero_simulacoes
+        inicio = len(self.resultados_simulacoes)
+        sementes = self._sementes_replicacoes(quantidade)
+        espelhadas = [self._replicacao_espelhada(inicio + k) for k in range(quantidade)]
+        
+        if config.REPLICACOES_LOTE_VETORIZADO > 0 and quantidade > 1:
+            # Motor vetorizado em lote: blocos de replicações numa passada só
+            # (os blocos vão para o ProcessPoolExecutor se houver mais de um processo)
+            ids = list(range(inicio + 1, inicio + quantidade + 1))
+            tamanho = config.REPLICACOES_LOTE_VETORIZADO
+            blocos = range(0, quantidade, tamanho)
+            argumentos = (
+                [ids[b:b + tamanho] for b in blocos],
+                [sementes[b:b + tamanho] for b in blocos],
+                [config.TOTAL_TORCEDORES] * len(blocos),
+                [espelhadas[b:b + tamanho] for b in blocos],
+                [self.cenario] * len(blocos),
+                [self.diretorio_exportacao] * len(blocos),
+                [self._usar_cache] * len(blocos)
+            )
+            if self.num_processos > 1 and len(blocos) > 1:
+                with ProcessPoolExecutor(max_workers=self.num_processos) as executor:
+                    resultados = list(executor.map(executar_replicacoes_em_lote, *argumentos))
+            else:
+                resultados = map(executar_replicacoes_em_lote, *argumentos)
+            k = 0
+            for bloco in resultados:
+                for resultado in bloco:
+                    self._registrar_resultado(resultado, inicio + k, verbose)
+                    k += 1
+        elif self.num_processos > 1 and quantidade > 1:
+            # Paralelo: o map devolve os resultados na ordem das replicações
+            ids = range(inicio + 1, inicio + quantidade + 1)
+            totais = [config.TOTAL_TORCEDORES] * quantidade
+            verboses = [False] * quantidade
+            cenarios = [self.cenario] * quantidade
+            exportacoes = [self.diretorio_exportacao] * quantidade
+            caches = [self._usar_cache] * quantidade
+            with ProcessPoolExecutor(max_workers=self.num_processos) as executor:
+                replicacoes = executor.map(executar_replicacao, ids, sementes, totais, verboses, espelhadas, cenarios,
+                                           exportacoes, caches)
+                for k, resultado in enumerate(replicacoes):
+                    self._registrar_resultado(resultado, inicio + k, verbose)
+        else:
+            for k in range(quantidade):
+                i = inicio + k
+                if verbose and total_previsto > 1:
+                    print(f"\n🎯 SIMULAÇÃO {i+1}/{total_previsto}")
+                    print("-" * 50)
+                
+                # Executar simulação individual (verbose apenas se for 1 simulação)
+                resultado = executar_replicacao(
+                    i + 1, sementes[k], config.TOTAL_TORCEDORES,
+                    verbose=verbose and total_previsto == 1,
+                    antitetico=espelhadas[k],
+                    cenario=self.cenario,
+                    diretorio_exportacao=self.diretorio_exportacao,
+                    usar_cache=self._usar_cache
+                )
+                self._registrar_resultado(resultado, i, verbose)
+    
+    def executar_ate_precisao(self, metricas: List[str] = None, precisao_relativa: float = None,
+                              confianca: float = None, tamanho_lote: int = None,
+                              maximo_simulacoes: int = None, verbose: bool = True):
+        """
+        Regra de parada sequencial: executa replicações em lotes até a meia-largura
+        do intervalo de confiança de cada métrica ficar abaixo de
+        precisao_relativa * |média|, ou até maximo_simulacoes.
+        """
+        metricas = metricas or config.PRECISAO_METRICAS
+        precisao_relativa = precisao_relativa or config.PRECISAO_RELATIVA
+        confianca = confianca or config.PRECISAO_CONFIANCA
+        tamanho_lote = tamanho_lote or config.PRECISAO_LOTE
+        maximo_simulacoes = maximo_simulacoes or config.PRECISAO_MAXIMO_SIMULACOES
+        
+        if self.antitetico and tamanho_lote % 2 != 0:
+            raise ValueError(f"Modo antitético precisa de lotes de tamanho par ({tamanho_lote})")
+        
+        if verbose:
+            print(f"🔄 Replicando até precisão relativa de {precisao_relativa:.2%} "
+                  f"({confianca:.0%} de confiança) em {', '.join(metricas)}")
+            print(f"📦 Lotes de {tamanho_lote} | máximo de {maximo_simulacoes} simulações")
+            print("=" * 80)
+        
+        atingiu = False
+        while len(self.resultados_simulacoes) < maximo_simulacoes:
+            quantidade = min(tamanho_lote, maximo_simulacoes - len(self.resultados_simulacoes))
+            self._executar_lote(quantidade, verbose=False)
+            self._calcular_estatisticas_agregadas()
+            
+            self.relatorio_precisao = self._avaliar_precisao(metricas, confianca)
+            atingiu = all(r['relativa'] <= precisao_relativa for r in self.relatorio_precisao.values())
+            
+            if verbose:
+                situacao = " | ".join(
+                    f"{m}: ±{r['relativa']:.2%}" for m, r in self.relatorio_precisao.items()
+                )
+                print(f"📊 {len(self.resultados_simulacoes)} simulações -> {situacao}")
+            if atingiu:
+                break
+        
+        self.numero_simulacoes = len(self.resultados_simulacoes)
+        
+        if verbose:
+            if atingiu:
+                print(f"✅ Precisão atingida com {self.numero_simulacoes} simulações")
+            else:
+                print(f"⚠️  Precisão não atingida; parou no máximo de {self.numero_simulacoes} simulações")
+        
+        return self.resultados_simulacoes
+    
+    def _avaliar_precisao(self, metricas: List[str], confianca: float) -> Dict[str, Dict[str, float]]:
+        """Meia-largura do IC (t de Student) de cada métrica, absoluta e relativa à média"""
+        relatorio = {}
+        for metrica in metricas:
+            stats = self.estatisticas_agregadas[metrica]
+            n = stats['n_independentes']
+            meia_largura = math.inf
+            if n > 1:
+                meia_largura = quantil_t_student(0.5 + confianca / 2, n - 1) * stats['erro_padrao']
+            
+            media = stats['media']
+            relatorio[metrica] = {
+                'media': media,
+                'meia_largura': meia_largura,
+                'relativa': meia_largura / abs(media) if media != 0 else (0.0 if meia_largura == 0 else math.inf),
+                'n_independentes': n
+            }
+        return relatorio
+    
+    def _registrar_resultado(self, resultado: Dict, i: int, verbose: bool):
+        """Guarda o resultado da replicação i e imprime o resumo dela"""
+        self.resultados_simulacoes.append(resultado)
+        
+        # Mostrar resumo detalhado apenas das primeiras 5 simulações
+        if verbose and self.numero_simulacoes > 1:
+            if i < 5:  # Mostrar detalhes apenas das 5 primeiras
+                self._imprimir_resumo_simulacao(resultado, i+1)
+            elif i == 5:  # Na 6ª simulação, avisar que os detalhes não serão mais mostrados
+                print(f"✓ Simulação {i+1} concluída (detalhes ocultados para evitar logs extensos)")
+                print("💡 Executando simulações restantes... (detalhes serão mostrados no relatório final)")
+            else:  # Da 7ª em diante, apenas indicar conclusão
+                print(f"✓ Simulação {i+1} concluída")
+    
     def _imprimir_resumo_simulacao(self, resultado, num_simulacao):
         """Imprime resumo de uma simulação individual"""
         resumo = resultado['relatorio']['resumo_geral']
@@ -675,50 +990,10 @@ class GerenciadorSimulacoes:
             return
         
         # Coletar métricas de todas as simulações
-        metricas = {
-            'percentual_entrada_antes_jogo': [],
-            'tempo_final_entrada': [],
-            'tempo_medio_fila_total': [],
-            'tempo_medio_entrada_total': [],
-            'tempo_medio_espera_revista': [],
-            'tempo_medio_espera_catraca': [],
-            'fila_maxima_revista': [],
-            'utilizacao_media_revista': [],
-            'fila_maxima_catracas_global': [],
-            'utilizacao_media_catracas_global': []
-        }
-        
+        metricas = {}
         for resultado in self.resultados_simulacoes:
-            resumo = resultado['relatorio']['resumo_geral']
-            tempos = resultado['relatorio']
-            monitor_det = resultado['monitor_detalhado']
-            
-            metricas['percentual_entrada_antes_jogo'].append(resumo['percentual_entrada_antes_jogo'])
-            metricas['tempo_final_entrada'].append(resumo['tempo_final_entrada'])
-            metricas['tempo_medio_fila_total'].append(resumo['tempo_medio_fila_total'])
-            metricas['tempo_medio_entrada_total'].append(resumo['tempo_medio_entrada_total'])
-            metricas['tempo_medio_espera_revista'].append(tempos['tempos_espera_revista']['media'])
-            metricas['tempo_medio_espera_catraca'].append(tempos['tempos_espera_catraca']['media'])
-            
-            # Métricas detalhadas
-            metricas['fila_maxima_revista'].append(monitor_det['filas_maximas']['revista'])
-            metricas['utilizacao_media_revista'].append(monitor_det['utilizacao_media']['revista'])
-            
-            # Para catracas, pegar a maior fila entre todos os portões
-            max_fila_catracas = max(monitor_det['filas_maximas']['catracas'].values()) if monitor_det['filas_maximas']['catracas'] else 0
-            metricas['fila_maxima_catracas_global'].append(max_fila_catracas)
-            
-            # Utilização média ponderada das catracas
-            utilizacao_ponderada = 0
-            total_catracas = 0
-            
-            for portao, utilizacao in monitor_det['utilizacao_media']['catracas'].items():
-                num_catracas = config.CATRACAS_POR_PORTAO.get(portao, 1)
-                utilizacao_ponderada += utilizacao * num_catracas
-                total_catracas += num_catracas
-            
-            utilizacao_media_catracas = utilizacao_ponderada / total_catracas if total_catracas > 0 else 0
-            metricas['utilizacao_media_catracas_global'].append(utilizacao_media_catracas)
+            for metrica, valor in metricas_replicacao(resultado).items():
+                metricas.setdefault(metrica, []).append(valor)
         
         # Calcular estatísticas (média, desvio, min, max)
         import statistics
@@ -726,14 +1001,38 @@ class GerenciadorSimulacoes:
         
         for metrica, valores in metricas.items():
             if valores:
+                # no modo antitético as observações independentes são as médias de cada par
+                independentes = valores
+                if self.antitetico:
+                    independentes = [(a + b) / 2 for a, b in zip(valores[::2], valores[1::2])]
+                n_independentes = len(independentes)
+                
                 self.estatisticas_agregadas[metrica] = {
                     'media': statistics.mean(valores),
                     'desvio_padrao': statistics.stdev(valores) if len(valores) > 1 else 0.0,
+                    'erro_padrao': (statistics.stdev(independentes) / math.sqrt(n_independentes)
+                                    if n_independentes > 1 else 0.0),
                     'minimo': min(valores),
                     'maximo': max(valores),
                     'valores': valores,
-                    'n_amostras': len(valores)
+                    'n_amostras': len(valores),
+                    'n_independentes': n_independentes
                 }
+        
+        self.tempos_agregados = self._mesclar_resumos_tempos()
+    
+    def _mesclar_resumos_tempos(self) -> Dict[str, Dict[str, float]]:
+        """Percentis sobre todos os torcedores de todas as replicações (só no modo streaming)"""
+        if 'resumos_tempos' not in self.resultados_simulacoes[0]['relatorio']:
+            return None
+        
+        agregados = {}
+        for nome in METRICAS_TEMPOS:
+            mesclado = ResumoStreaming()
+            for resultado in self.resultados_simulacoes:
+                mesclado.mesclar(resultado['relatorio']['resumos_tempos'][nome])
+            agregados[nome] = mesclado.resumo()
+        return agregados
     
     def imprimir_relatorio_consolidado(self):
         """Imprime relatório consolidado das simulações"""
@@ -821,6 +1120,20 @@ class GerenciadorSimulacoes:
                         " min", True,
                         descricao="Tempo médio que cada torcedor fica na fila das catracas")
         
+        if self.tempos_agregados:
+            print("=== PERCENTIS AGREGADOS (TODAS AS SIMULAÇÕES) ===")
+            print("=" * 60)
+            titulos = {
+                'tempos_espera_revista': "Espera na revista",
+                'tempos_espera_catraca': "Espera na catraca",
+                'tempos_total': "Tempo total para entrar"
+            }
+            for nome, titulo in titulos.items():
+                stats = self.tempos_agregados[nome]
+                print(f"{titulo}: P90 {stats['p90']/60:.1f} min | P95 {stats['p95']/60:.1f} min | "
+                      f"P99 {stats['p99']/60:.1f} min ({stats['count']:,} torcedores)")
+            print()
+        
         print("=" * 80)
         print("🎯 ANÁLISE CONCLUÍDA! 🎯")
         print("=" * 80)
@@ -834,7 +1147,10 @@ def main():
     
     # Executar simulações
     gerenciador = GerenciadorSimulacoes()
-    resultados = gerenciador.executar_simulacoes(verbose=True)
+    if config.PARADA_SEQUENCIAL:
+        resultados = gerenciador.executar_ate_precisao(verbose=True)
+    else:
+        resultados = gerenciador.executar_simulacoes(verbose=True)
     
     # Relatório
     gerenciador.imprimir_relatorio_consolidado()
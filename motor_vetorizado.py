@@ -0,0 +1,209 @@
+import heapq
+from typing import List, Tuple
+
+import numpy as np
+
+def atender_fifo(chegadas: List[float], duracoes: List[float],
+                 servidores: int) -> Tuple[List[float], List[float], List[int]]:
+    """
+    Fila única FIFO com servidores idênticos, percorrida em ordem de chegada
+    em O(n log c): heap (fim, servidor) dos ocupados e a mesma pilha de
+    livres dos sistemas de recursos, então cada torcedor fica com o mesmo
+    servidor que teria no laço de eventos. Em empate, a chegada vem antes do
+    fim de atendimento (como o fluxo de chegadas no GerenciadorEventos).
+    Retorna início, fim e servidor de cada atendimento.
+    """
+    if servidores < 1:
+        raise ValueError(f"Etapa sem servidores ({servidores}): ninguém seria atendido")
+    livres = list(range(servidores - 1, -1, -1))  # topo = próximo a ser usado
+    ocupados: List[Tuple[float, int]] = []
+    inicios: List[float] = []
+    fins: List[float] = []
+    ids_servidores: List[int] = []
+
+    for chegada, duracao in zip(chegadas, duracoes):
+        # quem terminou antes desta chegada volta para a pilha, na ordem em que terminou
+        while ocupados and ocupados[0][0] < chegada:
+            livres.append(heapq.heappop(ocupados)[1])
+
+        if livres:
+            servidor = livres.pop()
+            inicio = chegada
+            fim = inicio + duracao
+            heapq.heappush(ocupados, (fim, servidor))
+        else:
+            # esperou: é atendido pelo primeiro servidor que terminar
+            inicio, servidor = ocupados[0]
+            fim = inicio + duracao
+            heapq.heapreplace(ocupados, (fim, servidor))
+
+        inicios.append(inicio)
+        fins.append(fim)
+        ids_servidores.append(servidor)
+
+    return inicios, fins, ids_servidores
+
+def atender_fifo_lote(chegadas: np.ndarray, duracoes: np.ndarray,
+                      servidores) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    atender_fifo para B filas independentes de uma vez, uma por linha de
+    arrays (B, n) em ordem de chegada. O laço é sobre a posição na fila e
+    cada passo atende a posição i de todas as linhas com operações NumPy,
+    então o custo do interpretador é pago uma vez para as B filas. Cada
+    atendimento vai para o servidor que fica livre primeiro: os tempos são
+    os mesmos de atender_fifo, só a identidade do servidor pode mudar.
+    `servidores` é um número ou um por linha; linhas mais curtas vêm
+    completadas com chegada +inf no fim.
+    """
+    num_filas, n = chegadas.shape
+    servidores = np.broadcast_to(np.asarray(servidores), (num_filas,))
+    if num_filas and servidores.min() < 1:
+        # sem servidores a linha inteira ficaria com fim +inf
+        raise ValueError(f"Etapa sem servidores ({int(servidores.min())}): ninguém seria atendido")
+    # servidores que a linha não tem ficam livres só em +inf
+    livres = np.where(np.arange(int(servidores.max())) < servidores[:, None], -np.inf, np.inf)
+    linhas = np.arange(num_filas)
+
+    # posição na fila no primeiro eixo: cada passo lê e escreve linhas contíguas
+    chegadas = np.ascontiguousarray(chegadas.T)
+    duracoes = np.ascontiguousarray(duracoes.T)
+    inicios = np.empty((n, num_filas))
+    fins = np.empty((n, num_filas))
+    ids_servidores = np.empty((n, num_filas), dtype=np.int64)
+
+    for i in range(n):
+        servidor = livres.argmin(axis=1)
+        inicio = np.maximum(chegadas[i], livres[linhas, servidor])
+        fim = inicio + duracoes[i]
+        livres[linhas, servidor] = fim
+        inicios[i] = inicio
+        fins[i] = fim
+        ids_servidores[i] = servidor
+
+    return inicios.T, fins.T, ids_servidores.T
+
+def _atender(chegadas: np.ndarray, duracoes: np.ndarray, servidores: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    inicios, fins, ids_servidores = atender_fifo(chegadas.tolist(), duracoes.tolist(), servidores)
+    return np.array(inicios), np.array(fins), np.array(ids_servidores, dtype=np.int64)
+
+def _carregar_revista(simulador, ids: np.ndarray, inicios: np.ndarray, fins: np.ndarray, agentes: np.ndarray):
+    """Grava as revistas (em ordem de chegada) no cadastro e no sistema de revista"""
+    cadastro = simulador.cadastro
+    cadastro.tempo_inicio_revista[ids] = inicios
+    cadastro.tempo_fim_revista[ids] = fins
+    simulador.sistema_revista.registrar_atendimentos(cadastro.tempo_chegada[ids], inicios, fins, agentes)
+    cadastro.tempo_chegada_portao[ids] = fins + cadastro.duracao_caminhada[ids]
+
+def _fila_portao(cadastro, ids: np.ndarray, codigo: int) -> np.ndarray:
+    """Torcedores do portão em ordem de chegada ao portão"""
+    do_portao = ids[cadastro.codigo_portao[ids] == codigo]
+    return do_portao[np.argsort(cadastro.tempo_chegada_portao[do_portao], kind='stable')]
+
+def _carregar_portao(simulador, portao: str, ids: np.ndarray, inicios: np.ndarray, fins: np.ndarray,
+                     catracas: np.ndarray):
+    """Grava as passagens de um portão (em ordem de chegada ao portão)"""
+    cadastro = simulador.cadastro
+    cadastro.tempo_inicio_catraca[ids] = inicios
+    cadastro.tempo_fim_catraca[ids] = fins
+    simulador.sistema_catracas.registrar_atendimentos(portao, cadastro.tempo_chegada_portao[ids],
+                                                      inicios, fins, catracas)
+
+def _concluir(simulador, ids: np.ndarray) -> float:
+    """Estatísticas, monitor e relógio depois de todas as etapas; devolve o tempo final"""
+    cadastro = simulador.cadastro
+    fim_catraca = cadastro.tempo_fim_catraca[ids]
+    # estatísticas na ordem em que os torcedores terminaram (a mesma do laço)
+    simulador.estatisticas.adicionar_torcedores(ids[np.argsort(fim_catraca, kind='stable')])
+
+    n = len(ids)
+    tempo_fim = float(fim_catraca.max()) if n else 0.0
+    if n:
+        simulador.monitor.registrar_lote(float(cadastro.tempo_chegada[ids[0]]), tempo_fim, n, n, n)
+    simulador.gerenciador_eventos.tempo_atual = tempo_fim
+    simulador.simulacao_finalizada = True
+    if simulador.monitor.linha_do_tempo:
+        simulador.monitor.linha_do_tempo.fechar()
+    return tempo_fim
+
+def executar_vetorizado(simulador, verbose: bool = True):
+    """
+    Roda o modelo de um SimuladorMineirao sem o laço de eventos. Cada etapa
+    é uma fila FIFO cujos tempos de serviço não dependem do estado, então os
+    tempos de todos os torcedores saem etapa por etapa: revista em ordem de
+    chegada, caminhada somada, catracas em ordem de chegada ao portão.
+    Preenche cadastro, sistemas, monitor e estatísticas como o laço faria.
+    """
+    if verbose:
+        print("🏟️  Iniciando simulação do Estádio Mineirão (motor vetorizado)...")
+        print(f"Total de torcedores: {simulador.total_torcedores:,}")
+        print(f"Agentes de revista: {len(simulador.sistema_revista.agentes)}")
+        print("=" * 60)
+
+    ids = simulador.sortear_populacao()['ids']  # já em ordem de chegada
+    cadastro = simulador.cadastro
+
+    # revista: fila única de todos os agentes
+    _carregar_revista(simulador, ids, *_atender(cadastro.tempo_chegada[ids], cadastro.duracao_revista[ids],
+                                                len(simulador.sistema_revista.agentes)))
+
+    # catracas: uma fila por portão
+    for codigo, portao in enumerate(cadastro.portoes):
+        do_portao = _fila_portao(cadastro, ids, codigo)
+        _carregar_portao(simulador, portao, do_portao,
+                         *_atender(cadastro.tempo_chegada_portao[do_portao], cadastro.duracao_catraca[do_portao],
+                                   len(simulador.sistema_catracas.catracas[portao])))
+
+    tempo_fim = _concluir(simulador, ids)
+
+    if verbose:
+        print("✅ Simulação finalizada!")
+        print(f"Tempo final da simulação: {tempo_fim/60:.4f} minutos")
+        print(f"Torcedores que completaram processo: {simulador.estatisticas.total_completos:,}")
+        simulador._imprimir_relatorio_final_detalhado()
+        print()
+
+def executar_lote_vetorizado(simuladores: List):
+    """
+    Roda várias replicações (um SimuladorMineirao cada, mesmo número de
+    torcedores) numa passada só: as chegadas e durações de todas formam
+    arrays (R, n) e cada etapa usa atender_fifo_lote, com uma linha por
+    replicação na revista e uma por (replicação, portão) nas catracas.
+    Cada simulador termina preenchido como em executar_vetorizado.
+    """
+    if len({s.total_torcedores for s in simuladores}) > 1:
+        raise ValueError("As replicações de um lote precisam do mesmo número de torcedores")
+
+    ids = [s.sortear_populacao()['ids'] for s in simuladores]
+    cadastros = [s.cadastro for s in simuladores]
+
+    # revista: uma linha por replicação
+    inicios, fins, agentes = atender_fifo_lote(
+        np.stack([c.tempo_chegada[i] for c, i in zip(cadastros, ids)]),
+        np.stack([c.duracao_revista[i] for c, i in zip(cadastros, ids)]),
+        [len(s.sistema_revista.agentes) for s in simuladores]
+    )
+    for r, simulador in enumerate(simuladores):
+        _carregar_revista(simulador, ids[r], inicios[r], fins[r], agentes[r])
+
+    # catracas: uma linha por (replicação, portão), completadas até a maior fila
+    filas = [
+        (simulador, portao, _fila_portao(simulador.cadastro, ids[r], codigo))
+        for r, simulador in enumerate(simuladores)
+        for codigo, portao in enumerate(simulador.cadastro.portoes)
+    ]
+    tamanho = max(len(do_portao) for _, _, do_portao in filas)
+    chegadas = np.full((len(filas), tamanho), np.inf)
+    duracoes = np.zeros((len(filas), tamanho))
+    for linha, (simulador, _, do_portao) in enumerate(filas):
+        chegadas[linha, :len(do_portao)] = simulador.cadastro.tempo_chegada_portao[do_portao]
+        duracoes[linha, :len(do_portao)] = simulador.cadastro.duracao_catraca[do_portao]
+
+    inicios, fins, catracas = atender_fifo_lote(
+        chegadas, duracoes, [len(s.sistema_catracas.catracas[portao]) for s, portao, _ in filas]
+    )
+    for linha, (simulador, portao, do_portao) in enumerate(filas):
+        n = len(do_portao)
+        _carregar_portao(simulador, portao, do_portao, inicios[linha, :n], fins[linha, :n], catracas[linha, :n])
+
+    for simulador, ids_replicacao in zip(simuladores, ids):
+        _concluir(simulador, ids_replicacao)
@@ -0,0 +1,138 @@
+import bz2
+import json
+import lzma
+import struct
+import zlib
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import configuracao as config
+from eventos import TipoEvento
+
+# Registro de tamanho fixo (22 bytes, sem alinhamento) por evento processado.
+# portao é o código do portão (-1 nos eventos da revista); servidor é o do
+# evento (-1 nas chegadas); fila é o tamanho da fila da etapa depois do evento.
+REGISTRO_EVENTO = np.dtype([
+    ('tempo', '<f8'),
+    ('tipo', 'u1'),
+    ('portao', 'i1'),
+    ('torcedor', '<i4'),
+    ('servidor', '<i4'),
+    ('fila', '<i4')
+])
+
+# Arquivo: MAGICO, cabeçalho JSON (tamanho em uint32) e depois blocos, cada um
+# com (registros, bytes) em uint32 seguido dos registros, comprimidos ou não
+MAGICO = b'RASTRO\x00\x01'
+_BLOCO = struct.Struct('<II')
+_TAMANHO = struct.Struct('<I')
+
+COMPRESSOES = {
+    None: (lambda dados: dados, lambda dados: dados),
+    'zlib': (zlib.compress, zlib.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+    'bz2': (bz2.compress, bz2.decompress)
+}
+
+# padrão dos parâmetros do gravador: usar a configuração (None já quer dizer "sem compressão")
+_PADRAO = object()
+
+class GravadorRastro:
+    """
+    Grava a sequência de eventos de uma simulação em disco, em blocos de
+    `tamanho_bloco` registros (cada bloco é montado de uma vez como array
+    estruturado e, opcionalmente, comprimido). Só os registros do bloco
+    corrente ficam em memória.
+    """
+
+    def __init__(self, caminho: str, tamanho_bloco: int = None, compressao: Optional[str] = _PADRAO,
+                 portoes: List[str] = None):
+        compressao = config.RASTRO_COMPRESSAO if compressao is _PADRAO else compressao
+        if compressao not in COMPRESSOES:
+            raise ValueError(f"Compressão desconhecida: {compressao} (opções: {list(COMPRESSOES)})")
+        self.caminho = caminho
+        self.tamanho_bloco = tamanho_bloco or config.RASTRO_TAMANHO_BLOCO
+        self._comprimir = COMPRESSOES[compressao][0]
+        self._pendentes: List[Tuple] = []
+        self.total_registros = 0
+
+        self._arquivo = open(caminho, 'wb')
+        cabecalho = json.dumps({
+            'dtype': REGISTRO_EVENTO.descr,
+            'compressao': compressao,
+            'portoes': portoes or config.obter_portoes(),
+            'tipos': {tipo.value: tipo.name for tipo in TipoEvento}
+        }).encode()
+        self._arquivo.write(MAGICO + _TAMANHO.pack(len(cabecalho)) + cabecalho)
+
+    def registrar(self, tempo: float, tipo: int, torcedor: int, servidor: int, portao: int, fila: int):
+        self._pendentes.append((tempo, tipo, portao, torcedor, servidor, fila))
+        if len(self._pendentes) >= self.tamanho_bloco:
+            self._descarregar()
+
+    def _descarregar(self):
+        if not self._pendentes:
+            return
+        dados = self._comprimir(np.array(self._pendentes, dtype=REGISTRO_EVENTO).tobytes())
+        self._arquivo.write(_BLOCO.pack(len(self._pendentes), len(dados)))
+        self._arquivo.write(dados)
+        self.total_registros += len(self._pendentes)
+        self._pendentes = []
+
+    def fechar(self):
+        if not self._arquivo.closed:
+            self._descarregar()
+            self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+class LeitorRastro:
+    """
+    Lê um rastro gravado por GravadorRastro sob demanda: um bloco por vez
+    (array estruturado REGISTRO_EVENTO) ou evento a evento.
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        with open(caminho, 'rb') as f:
+            self._inicio_blocos, self.cabecalho = self._ler_cabecalho(f)
+        self._descomprimir = COMPRESSOES[self.cabecalho['compressao']][1]
+        self.portoes = self.cabecalho['portoes']
+
+    @staticmethod
+    def _ler_cabecalho(f):
+        if f.read(len(MAGICO)) != MAGICO:
+            raise ValueError("Arquivo não é um rastro de eventos")
+        tamanho, = _TAMANHO.unpack(f.read(_TAMANHO.size))
+        cabecalho = json.loads(f.read(tamanho))
+        return f.tell(), cabecalho
+
+    def blocos(self) -> Iterator[np.ndarray]:
+        """Blocos de registros, na ordem em que foram gravados"""
+        with open(self.caminho, 'rb') as f:
+            f.seek(self._inicio_blocos)
+            while True:
+                cabecalho_bloco = f.read(_BLOCO.size)
+                if len(cabecalho_bloco) < _BLOCO.size:
+                    return  # fim (ou bloco incompleto de uma gravação interrompida)
+                registros, tamanho = _BLOCO.unpack(cabecalho_bloco)
+                dados = f.read(tamanho)
+                if len(dados) < tamanho:
+                    return
+                yield np.frombuffer(self._descomprimir(dados), dtype=REGISTRO_EVENTO, count=registros)
+
+    def __iter__(self) -> Iterator[Tuple[float, TipoEvento, int, int, int, int]]:
+        """Eventos um a um: (tempo, tipo, torcedor, servidor, portao, fila)"""
+        for bloco in self.blocos():
+            for tempo, tipo, portao, torcedor, servidor, fila in bloco.tolist():
+                yield tempo, TipoEvento(tipo), torcedor, servidor, portao, fila
+
+    def ler_tudo(self) -> np.ndarray:
+        """Todos os registros num array só (para rastros que cabem na memória)"""
+        blocos = list(self.blocos())
+        return np.concatenate(blocos) if blocos else np.empty(0, dtype=REGISTRO_EVENTO)
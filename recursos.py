@@ -1,7 +1,12 @@
 from collections import deque
-from typing import Optional, Dict, Any
+from functools import partial
+from typing import Optional, Dict, Any, Callable, List
 from dataclasses import dataclass
 
+import numpy as np
+
+import configuracao as config
+
 @dataclass
 class Torcedor:
     id: int
@@ -19,16 +24,131 @@ class Torcedor:
             return self.tempo_fim_catraca - self.tempo_chegada
         return 0.0
 
+class CadastroTorcedores:
+    """
+    Cadastro colunar dos torcedores: um array NumPy por campo, indexado pelo
+    id do torcedor (ids começam em 1, a posição 0 fica sem uso).
+    Tempos ainda não atingidos ficam como NaN; esplanada e portão são códigos
+    (índices de config.obter_esplanadas() e config.obter_portoes()).
+    """
+    
+    COLUNAS_TEMPO = (
+        'tempo_chegada', 'tempo_inicio_revista', 'tempo_fim_revista',
+        'tempo_chegada_portao', 'tempo_inicio_catraca', 'tempo_fim_catraca'
+    )
+    # durações sorteadas antes da simulação (uma por torcedor)
+    COLUNAS_DURACAO = ('duracao_revista', 'duracao_caminhada', 'duracao_catraca')
+    
+    def __init__(self, total_torcedores: int):
+        self.total = total_torcedores
+        self.esplanadas = config.obter_esplanadas()
+        self.portoes = config.obter_portoes()
+        
+        tamanho = total_torcedores + 1
+        for coluna in self.COLUNAS_TEMPO + self.COLUNAS_DURACAO:
+            setattr(self, coluna, np.full(tamanho, np.nan))
+        self.codigo_esplanada = np.zeros(tamanho, dtype=np.int8)
+        self.codigo_portao = np.zeros(tamanho, dtype=np.int8)
+    
+    def carregar_populacao(self, populacao: Dict[str, np.ndarray]):
+        """Preenche chegada, esplanada e portão com a saída de GeradorChegadas.gerar_populacao"""
+        ids = populacao['ids']
+        self.tempo_chegada[ids] = populacao['tempos_chegada']
+        self.codigo_esplanada[ids] = populacao['esplanadas']
+        self.codigo_portao[ids] = populacao['portoes']
+    
+    def ids(self) -> np.ndarray:
+        """Ids de todos os torcedores cadastrados"""
+        return np.arange(1, self.total + 1)
+    
+    def esplanada(self, torcedor_id: int) -> str:
+        return self.esplanadas[self.codigo_esplanada[torcedor_id]]
+    
+    def portao(self, torcedor_id: int) -> str:
+        return self.portoes[self.codigo_portao[torcedor_id]]
+    
+    def torcedor(self, torcedor_id: int) -> Torcedor:
+        """Cópia do torcedor no formato antigo (dataclass), para inspeção"""
+        tempos = {}
+        for coluna in self.COLUNAS_TEMPO:
+            valor = float(getattr(self, coluna)[torcedor_id])
+            tempos[coluna] = None if np.isnan(valor) else valor
+        return Torcedor(
+            id=torcedor_id,
+            esplanada=self.esplanada(torcedor_id),
+            portao=self.portao(torcedor_id),
+            **tempos
+        )
+    
+    def memoria_bytes(self) -> int:
+        """Memória ocupada pelas colunas"""
+        colunas = [getattr(self, c) for c in self.COLUNAS_TEMPO + self.COLUNAS_DURACAO]
+        colunas += [self.codigo_esplanada, self.codigo_portao]
+        return sum(c.nbytes for c in colunas)
+
+class IntegralTemporal:
+    """
+    Área sob a curva de um valor que muda em instantes discretos (tamanho de
+    fila, servidores ocupados). Cada mudança custa O(1); a média ponderada
+    pelo tempo sai da área dividida pela duração.
+    """
+    
+    def __init__(self, valor_inicial: int = 0):
+        self.valor = valor_inicial
+        self.area = 0.0
+        self.tempo_ultima_mudanca: Optional[float] = None
+    
+    def atualizar(self, novo_valor: int, tempo_atual: float):
+        """Fecha o trecho em que o valor anterior valeu e passa a contar o novo"""
+        if self.tempo_ultima_mudanca is not None:
+            self.area += self.valor * (tempo_atual - self.tempo_ultima_mudanca)
+        self.tempo_ultima_mudanca = tempo_atual
+        self.valor = novo_valor
+    
+    def carregar(self, area: float, tempo_ultima_mudanca: float, valor_final: int = 0):
+        """Estado final calculado de uma vez (motor vetorizado): área total e último valor"""
+        self.area = area
+        self.tempo_ultima_mudanca = tempo_ultima_mudanca
+        self.valor = valor_final
+    
+    def area_ate(self, tempo: float) -> float:
+        """Área acumulada até `tempo` (o valor atual vale até lá)"""
+        if self.tempo_ultima_mudanca is None:
+            return 0.0
+        return self.area + self.valor * (tempo - self.tempo_ultima_mudanca)
+    
+    def media(self, tempo_inicio: float, tempo_fim: float) -> float:
+        """Média ponderada pelo tempo no intervalo [tempo_inicio, tempo_fim]"""
+        duracao = tempo_fim - tempo_inicio
+        if duracao <= 0:
+            return 0.0
+        return self.area_ate(tempo_fim) / duracao
+
 class FilaFIFO:
     def __init__(self, nome: str = ""):
         self.nome = nome
         self._fila = deque()
         self._tempo_total_espera = 0.0
         self._total_atendidos = 0
-        self._historico_tamanhos = []
+        self.integral_tamanho = IntegralTemporal()  # área do tamanho da fila no tempo
+        self._observadores = []  # chamados com (tamanho, tempo) quando a fila muda
+        self._observadores_lote = []  # versão opcional de cada um para registrar_lote (arrays)
+    
+    def registrar_observador(self, callback: Callable[[int, float], None],
+                             callback_lote: Callable[[np.ndarray, np.ndarray], None] = None):
+        """
+        Registra função chamada a cada mudança de tamanho da fila. Se houver
+        callback_lote, registrar_lote passa a trajetória inteira de uma vez
+        (arrays de tamanhos e tempos) em vez de chamar callback item a item.
+        """
+        self._observadores.append(callback)
+        self._observadores_lote.append(callback_lote)
     
     def adicionar(self, item: Any, tempo_atual: float):
         self._fila.append((item, tempo_atual))
+        self.integral_tamanho.atualizar(len(self._fila), tempo_atual)
+        for observador in self._observadores:
+            observador(len(self._fila), tempo_atual)
     
     def remover(self, tempo_atual: float) -> Optional[Any]:
         """Remove e retorna próximo item da fila"""
@@ -39,8 +159,39 @@ class FilaFIFO:
         tempo_espera = tempo_atual - tempo_entrada
         self._tempo_total_espera += tempo_espera
         self._total_atendidos += 1
+        self.integral_tamanho.atualizar(len(self._fila), tempo_atual)
+        for observador in self._observadores:
+            observador(len(self._fila), tempo_atual)
         return item
     
+    def registrar_lote(self, tempos_entrada: np.ndarray, tempos_saida: np.ndarray):
+        """
+        Registra de uma vez quem passou pela fila (motor vetorizado, fila ainda
+        sem movimento): espera total, integral do tamanho e os avisos aos
+        observadores na mesma ordem em que o laço de eventos faria.
+        """
+        self._tempo_total_espera += float(np.sum(tempos_saida - tempos_entrada))
+        self._total_atendidos += len(tempos_entrada)
+        if len(tempos_entrada) == 0:
+            return
+        
+        # trajetória do tamanho: +1 em cada entrada, -1 em cada saída, em ordem de tempo
+        tempos = np.concatenate((tempos_entrada, tempos_saida))
+        ordem = np.argsort(tempos, kind='stable')
+        variacoes = np.concatenate((np.ones(len(tempos_entrada), dtype=np.int64),
+                                    -np.ones(len(tempos_saida), dtype=np.int64)))
+        tamanhos = np.cumsum(variacoes[ordem])
+        tempos = tempos[ordem]
+        
+        # área sob o tamanho = soma das esperas; a fila termina vazia
+        self.integral_tamanho.carregar(float(np.sum(tempos_saida - tempos_entrada)), float(tempos[-1]))
+        for observador, observador_lote in zip(self._observadores, self._observadores_lote):
+            if observador_lote is not None:
+                observador_lote(tamanhos, tempos)
+            else:
+                for tamanho, tempo in zip(tamanhos.tolist(), tempos.tolist()):
+                    observador(tamanho, tempo)
+    
     def tamanho(self) -> int:
         """Retorna tamanho atual da fila"""
         return len(self._fila)
@@ -55,9 +206,9 @@ class FilaFIFO:
             return 0.0
         return self._tempo_total_espera / self._total_atendidos
     
-    def registrar_tamanho(self, tempo: float):
-        """Registra tamanho da fila para estatísticas"""
-        self._historico_tamanhos.append((tempo, self.tamanho()))
+    def tamanho_medio(self, tempo_inicio: float, tempo_fim: float) -> float:
+        """Tamanho médio da fila ponderado pelo tempo (L)"""
+        return self.integral_tamanho.media(tempo_inicio, tempo_fim)
     
     def estatisticas(self) -> Dict[str, Any]:
         """Retorna estatísticas da fila"""
@@ -69,33 +220,53 @@ class FilaFIFO:
             'tempo_total_espera': self._tempo_total_espera
         }
 
+def registrar_atendimentos_lote(servidores: List, fila: FilaFIFO, integral_ocupados: IntegralTemporal,
+                                chegadas: np.ndarray, inicios: np.ndarray, fins: np.ndarray,
+                                ids_servidores: np.ndarray):
+    """
+    Estatísticas de uma etapa (servidores, fila e ocupação) a partir dos
+    tempos de todos os atendimentos, calculados pelo motor vetorizado
+    """
+    duracoes = fins - inicios
+    atendidos = np.bincount(ids_servidores, minlength=len(servidores))
+    tempo_servico = np.bincount(ids_servidores, weights=duracoes, minlength=len(servidores))
+    for servidor, quantidade, tempo in zip(servidores, atendidos.tolist(), tempo_servico.tolist()):
+        servidor._total_atendidos += quantidade
+        servidor._tempo_total_servico += tempo
+    
+    esperaram = inicios > chegadas
+    fila.registrar_lote(chegadas[esperaram], inicios[esperaram])
+    if len(fins):
+        integral_ocupados.carregar(float(duracoes.sum()), float(fins.max()))
+
 class ServidorRevista:
     """Representa um agente de revista (servidor)"""
     
-    def __init__(self, id: int):
+    def __init__(self, id: int, cadastro: CadastroTorcedores):
         self.id = id
+        self.cadastro = cadastro
         self.ocupado = False
-        self.torcedor_atual: Optional[Torcedor] = None
+        self.torcedor_atual: Optional[int] = None
         self.tempo_inicio_servico = 0.0
         self._total_atendidos = 0
         self._tempo_total_servico = 0.0
     
-    def iniciar_servico(self, torcedor: Torcedor, tempo_atual: float):
+    def iniciar_servico(self, torcedor_id: int, tempo_atual: float):
         """Inicia atendimento de um torcedor"""
         self.ocupado = True
-        self.torcedor_atual = torcedor
+        self.torcedor_atual = torcedor_id
         self.tempo_inicio_servico = tempo_atual
-        torcedor.tempo_inicio_revista = tempo_atual
+        self.cadastro.tempo_inicio_revista[torcedor_id] = tempo_atual
     
-    def finalizar_servico(self, tempo_atual: float) -> Torcedor:
-        """Finaliza atendimento e retorna o torcedor"""
+    def finalizar_servico(self, tempo_atual: float) -> int:
+        """Finaliza atendimento e retorna o id do torcedor"""
         if not self.ocupado:
             raise ValueError("Servidor não estava ocupado")
         
         torcedor = self.torcedor_atual
         tempo_servico = tempo_atual - self.tempo_inicio_servico
         
-        torcedor.tempo_fim_revista = tempo_atual
+        self.cadastro.tempo_fim_revista[torcedor] = tempo_atual
         self._tempo_total_servico += tempo_servico
         self._total_atendidos += 1
         
@@ -125,31 +296,32 @@ class ServidorRevista:
 class ServidorCatraca:
     """Representa uma catraca (servidor)"""
     
-    def __init__(self, id: int, portao: str):
+    def __init__(self, id: int, portao: str, cadastro: CadastroTorcedores):
         self.id = id
         self.portao = portao
+        self.cadastro = cadastro
         self.ocupado = False
-        self.torcedor_atual: Optional[Torcedor] = None
+        self.torcedor_atual: Optional[int] = None
         self.tempo_inicio_servico = 0.0
         self._total_atendidos = 0
         self._tempo_total_servico = 0.0
     
-    def iniciar_servico(self, torcedor: Torcedor, tempo_atual: float):
+    def iniciar_servico(self, torcedor_id: int, tempo_atual: float):
         """Inicia passagem de um torcedor pela catraca"""
         self.ocupado = True
-        self.torcedor_atual = torcedor
+        self.torcedor_atual = torcedor_id
         self.tempo_inicio_servico = tempo_atual
-        torcedor.tempo_inicio_catraca = tempo_atual
+        self.cadastro.tempo_inicio_catraca[torcedor_id] = tempo_atual
     
-    def finalizar_servico(self, tempo_atual: float) -> Torcedor:
-        """Finaliza passagem e retorna o torcedor"""
+    def finalizar_servico(self, tempo_atual: float) -> int:
+        """Finaliza passagem e retorna o id do torcedor"""
         if not self.ocupado:
             raise ValueError("Catraca não estava ocupada")
         
         torcedor = self.torcedor_atual
         tempo_servico = tempo_atual - self.tempo_inicio_servico
         
-        torcedor.tempo_fim_catraca = tempo_atual
+        self.cadastro.tempo_fim_catraca[torcedor] = tempo_atual
         self._tempo_total_servico += tempo_servico
         self._total_atendidos += 1
         
@@ -180,29 +352,71 @@ class ServidorCatraca:
 class SistemaRevista:
     """Sistema de revista com agentes e fila"""
     
-    def __init__(self, num_agentes: int):
-        self.agentes = [ServidorRevista(i) for i in range(num_agentes)]
+    def __init__(self, num_agentes: int, cadastro: CadastroTorcedores):
+        self.agentes = [ServidorRevista(i, cadastro) for i in range(num_agentes)]
         self.fila = FilaFIFO("Fila Revista")
+        
+        # pilha de agentes livres (topo = próximo a ser usado) e contador de ocupados
+        self._livres = list(range(num_agentes - 1, -1, -1))
+        self._ocupados = 0
+        self.integral_ocupados = IntegralTemporal()  # área de agentes ocupados no tempo
     
     def obter_agente_livre(self) -> Optional[ServidorRevista]:
-        """Retorna um agente livre, se disponível"""
-        for agente in self.agentes:
-            if not agente.ocupado:
-                return agente
-        return None
+        """Retorna um agente livre, se disponível (sem alocá-lo)"""
+        if not self._livres:
+            return None
+        return self.agentes[self._livres[-1]]
     
     def tem_agente_livre(self) -> bool:
         """Verifica se há agente disponível"""
-        return any(not agente.ocupado for agente in self.agentes)
+        return len(self._livres) > 0
+    
+    def agentes_ocupados(self) -> int:
+        """Número de agentes ocupados no momento"""
+        return self._ocupados
+    
+    def alocar_agente(self, torcedor_id: int, tempo_atual: float) -> Optional[ServidorRevista]:
+        """Inicia a revista do torcedor num agente livre; retorna None se não houver"""
+        if not self._livres:
+            return None
+        
+        agente = self.agentes[self._livres.pop()]
+        self._ocupados += 1
+        self.integral_ocupados.atualizar(self._ocupados, tempo_atual)
+        agente.iniciar_servico(torcedor_id, tempo_atual)
+        return agente
     
-    def adicionar_fila(self, torcedor: Torcedor, tempo_atual: float):
+    def liberar_agente(self, agente_id: int, tempo_atual: float) -> int:
+        """Finaliza a revista do agente e devolve ele para a pilha de livres"""
+        torcedor = self.agentes[agente_id].finalizar_servico(tempo_atual)
+        self._livres.append(agente_id)
+        self._ocupados -= 1
+        self.integral_ocupados.atualizar(self._ocupados, tempo_atual)
+        return torcedor
+    
+    def utilizacao_media(self, tempo_inicio: float, tempo_fim: float) -> float:
+        """Fração média de agentes ocupados no intervalo (0 a 1)"""
+        return self.integral_ocupados.media(tempo_inicio, tempo_fim) / len(self.agentes)
+    
+    def registrar_observador_fila(self, callback: Callable[[int, float], None],
+                                  callback_lote: Callable[[np.ndarray, np.ndarray], None] = None):
+        """Avisa callback(tamanho, tempo) sempre que a fila de revista mudar"""
+        self.fila.registrar_observador(callback, callback_lote)
+    
+    def adicionar_fila(self, torcedor_id: int, tempo_atual: float):
         """Adiciona torcedor à fila de revista"""
-        self.fila.adicionar(torcedor, tempo_atual)
+        self.fila.adicionar(torcedor_id, tempo_atual)
     
-    def proximo_da_fila(self, tempo_atual: float) -> Optional[Torcedor]:
+    def proximo_da_fila(self, tempo_atual: float) -> Optional[int]:
         """Remove próximo torcedor da fila"""
         return self.fila.remover(tempo_atual)
     
+    def registrar_atendimentos(self, chegadas: np.ndarray, inicios: np.ndarray, fins: np.ndarray,
+                               agentes: np.ndarray):
+        """Carrega todas as revistas calculadas pelo motor vetorizado (em ordem de chegada)"""
+        registrar_atendimentos_lote(self.agentes, self.fila, self.integral_ocupados,
+                                    chegadas, inicios, fins, agentes)
+    
     def estatisticas(self) -> Dict[str, Any]:
         """Retorna estatísticas completas do sistema"""
         stats_agentes = [agente.estatisticas() for agente in self.agentes]
@@ -210,51 +424,100 @@ class SistemaRevista:
             'fila': self.fila.estatisticas(),
             'agentes': stats_agentes,
             'total_agentes': len(self.agentes),
-            'agentes_ocupados': sum(1 for a in self.agentes if a.ocupado)
+            'agentes_ocupados': self._ocupados
         }
 
 class SistemaCatracas:
     """Sistema de catracas por portão"""
     
-    def __init__(self, catracas_por_portao: Dict[str, int]):
+    def __init__(self, catracas_por_portao: Dict[str, int], cadastro: CadastroTorcedores):
         self.catracas = {}
         self.filas = {}
         
+        # pilhas de catracas livres e contadores de ocupadas, por portão
+        self._livres = {}
+        self._ocupadas = {}
+        self.integrais_ocupadas: Dict[str, IntegralTemporal] = {}
+        
         # Criar catracas e filas para cada portão
+        # (a lista de cada portão é indexada pelo id da catraca)
         for portao, num_catracas in catracas_por_portao.items():
             self.catracas[portao] = [
-                ServidorCatraca(i, portao) for i in range(num_catracas)
+                ServidorCatraca(i, portao, cadastro) for i in range(num_catracas)
             ]
             self.filas[portao] = FilaFIFO(f"Fila Portão {portao}")
+            self._livres[portao] = list(range(num_catracas - 1, -1, -1))
+            self._ocupadas[portao] = 0
+            self.integrais_ocupadas[portao] = IntegralTemporal()
+    
+    def obter_catraca(self, portao: str, catraca_id: int) -> ServidorCatraca:
+        """Acesso direto à catraca pelo id"""
+        return self.catracas[portao][catraca_id]
     
     def obter_catraca_livre(self, portao: str) -> Optional[ServidorCatraca]:
-        """Retorna catraca livre no portão, se disponível"""
-        if portao not in self.catracas:
+        """Retorna catraca livre no portão, se disponível (sem alocá-la)"""
+        livres = self._livres.get(portao)
+        if not livres:
             return None
-        
-        for catraca in self.catracas[portao]:
-            if not catraca.ocupado:
-                return catraca
-        return None
+        return self.catracas[portao][livres[-1]]
     
     def tem_catraca_livre(self, portao: str) -> bool:
         """Verifica se há catraca disponível no portão"""
-        if portao not in self.catracas:
-            return False
-        return any(not c.ocupado for c in self.catracas[portao])
+        return bool(self._livres.get(portao))
+    
+    def catracas_ocupadas(self, portao: str) -> int:
+        """Número de catracas ocupadas no portão"""
+        return self._ocupadas.get(portao, 0)
+    
+    def alocar_catraca(self, torcedor_id: int, portao: str, tempo_atual: float) -> Optional[ServidorCatraca]:
+        """Inicia a passagem do torcedor numa catraca livre do portão"""
+        livres = self._livres.get(portao)
+        if not livres:
+            return None
+        
+        catraca = self.catracas[portao][livres.pop()]
+        self._ocupadas[portao] += 1
+        self.integrais_ocupadas[portao].atualizar(self._ocupadas[portao], tempo_atual)
+        catraca.iniciar_servico(torcedor_id, tempo_atual)
+        return catraca
+    
+    def liberar_catraca(self, portao: str, catraca_id: int, tempo_atual: float) -> int:
+        """Finaliza a passagem e devolve a catraca para a pilha de livres do portão"""
+        torcedor = self.catracas[portao][catraca_id].finalizar_servico(tempo_atual)
+        self._livres[portao].append(catraca_id)
+        self._ocupadas[portao] -= 1
+        self.integrais_ocupadas[portao].atualizar(self._ocupadas[portao], tempo_atual)
+        return torcedor
     
-    def adicionar_fila(self, torcedor: Torcedor, tempo_atual: float):
+    def utilizacao_media(self, portao: str, tempo_inicio: float, tempo_fim: float) -> float:
+        """Fração média de catracas ocupadas no portão durante o intervalo (0 a 1)"""
+        media_ocupadas = self.integrais_ocupadas[portao].media(tempo_inicio, tempo_fim)
+        return media_ocupadas / len(self.catracas[portao])
+    
+    def registrar_observador_filas(self, callback: Callable[[str, int, float], None],
+                                   callback_lote: Callable[[str, np.ndarray, np.ndarray], None] = None):
+        """Avisa callback(portao, tamanho, tempo) sempre que a fila de um portão mudar"""
+        for portao, fila in self.filas.items():
+            fila.registrar_observador(partial(callback, portao),
+                                      partial(callback_lote, portao) if callback_lote else None)
+    
+    def adicionar_fila(self, torcedor_id: int, portao: str, tempo_atual: float):
         """Adiciona torcedor à fila do portão"""
-        portao = torcedor.portao
         if portao in self.filas:
-            self.filas[portao].adicionar(torcedor, tempo_atual)
+            self.filas[portao].adicionar(torcedor_id, tempo_atual)
     
-    def proximo_da_fila(self, portao: str, tempo_atual: float) -> Optional[Torcedor]:
+    def proximo_da_fila(self, portao: str, tempo_atual: float) -> Optional[int]:
         """Remove próximo torcedor da fila do portão"""
         if portao in self.filas:
             return self.filas[portao].remover(tempo_atual)
         return None
     
+    def registrar_atendimentos(self, portao: str, chegadas: np.ndarray, inicios: np.ndarray,
+                               fins: np.ndarray, catracas: np.ndarray):
+        """Carrega todas as passagens de um portão calculadas pelo motor vetorizado (em ordem de chegada)"""
+        registrar_atendimentos_lote(self.catracas[portao], self.filas[portao], self.integrais_ocupadas[portao],
+                                    chegadas, inicios, fins, catracas)
+    
     def estatisticas(self) -> Dict[str, Any]:
         """Retorna estatísticas de todos os portões"""
         stats = {}
@@ -264,6 +527,6 @@ class SistemaCatracas:
                 'fila': self.filas[portao].estatisticas(),
                 'catracas': stats_catracas,
                 'total_catracas': len(self.catracas[portao]),
-                'catracas_ocupadas': sum(1 for c in self.catracas[portao] if c.ocupado)
+                'catracas_ocupadas': self._ocupadas[portao]
             }
         return stats
\ No newline at end of file
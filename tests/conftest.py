@@ -0,0 +1,5 @@
+import os
+import sys
+
+# os testes importam os módulos da raiz do projeto (não é um pacote instalado)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,53 @@
+import statistics
+
+import numpy as np
+import pytest
+
+import configuracao as config
+from aleatorio import FluxosAleatorios, quantil_normal
+from main import GeradorChegadas
+
+def test_quantil_normal():
+    p = np.concatenate([np.linspace(1e-12, 1 - 1e-12, 20001), [1e-300, 0.02425, 0.5, 1 - 0.02425]])
+    esperado = np.array([statistics.NormalDist().inv_cdf(x) for x in p])
+    assert quantil_normal(p) == pytest.approx(esperado, rel=2e-9, abs=2e-9)
+
+def _chegadas(semente, n, antitetico=False):
+    return GeradorChegadas(n, FluxosAleatorios(semente, antitetico).chegadas, proporcao_esplanada_norte=0.5)
+
+def test_chegadas_seguem_a_normal_truncada():
+    tempos = _chegadas(1, 200_000).gerar_tempos_chegada_vetorizado()
+    inicio, fim = -config.CHEGADAS_INICIO_MINUTOS * 60, -config.CHEGADAS_FIM_MINUTOS * 60
+    centro, desvio = -config.CHEGADAS_CENTRO_MINUTOS * 60, config.CHEGADAS_DESVIO_MINUTOS * 60
+    assert np.all(np.diff(tempos) >= 0)
+    assert inicio <= tempos[0] and tempos[-1] <= fim
+    
+    normal = statistics.NormalDist()
+    a, b = (inicio - centro) / desvio, (fim - centro) / desvio
+    massa = normal.cdf(b) - normal.cdf(a)
+    media = centro + desvio * (normal.pdf(a) - normal.pdf(b)) / massa
+    variancia = desvio ** 2 * (1 + (a * normal.pdf(a) - b * normal.pdf(b)) / massa
+                               - ((normal.pdf(a) - normal.pdf(b)) / massa) ** 2)
+    assert tempos.mean() == pytest.approx(media, abs=0.2 * 60)
+    assert tempos.std() == pytest.approx(variancia ** 0.5, rel=0.01)
+
+def test_replicacao_espelhada_continua_alinhada():
+    semente = np.random.SeedSequence(4)
+    original, espelhada = _chegadas(semente, 5000), _chegadas(semente, 5000, antitetico=True)
+    populacao_original = original.gerar_populacao()
+    populacao_espelhada = espelhada.gerar_populacao()
+    
+    # os dois consumiram o mesmo número de sorteios: o próximo ainda é o espelho do outro
+    assert original.rng.random() + espelhada.rng.random() == pytest.approx(1.0)
+    # com 50% para cada esplanada, o torcedor k vai sempre para a esplanada oposta
+    assert np.all(populacao_original['esplanadas'] != populacao_espelhada['esplanadas'])
+
+def test_chegadas_espelhadas_tem_correlacao_negativa():
+    # desvio da chegada do torcedor k em relação à média entre replicações, original x espelhada
+    k = 1000
+    pares = np.array([
+        (_chegadas(semente, 3000).gerar_tempos_chegada_vetorizado()[k],
+         _chegadas(semente, 3000, antitetico=True).gerar_tempos_chegada_vetorizado()[k])
+        for semente in np.random.SeedSequence(9).spawn(200)
+    ])
+    assert np.corrcoef(pares.T)[0, 1] < -0.4
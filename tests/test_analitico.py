@@ -0,0 +1,62 @@
+import math
+
+import numpy as np
+import pytest
+
+import configuracao as config
+from analitico import EstacaoAnalitica, ModeloAnalitico, momentos_catraca, momentos_revista, probabilidade_espera
+from main import AmostradorTempos
+
+AMOSTRAS = 400_000
+
+def _momentos(amostras):
+    return amostras.mean(), (amostras ** 2).mean()
+
+@pytest.fixture(scope='module')
+def amostrador():
+    return AmostradorTempos(np.random.default_rng(2024))
+
+def test_momentos_revista_batem_com_o_amostrador(amostrador):
+    media, segundo = _momentos(amostrador.amostrar_revista(AMOSTRAS))
+    assert momentos_revista() == pytest.approx((media, segundo), rel=0.01)
+
+def test_momentos_catraca_batem_com_o_amostrador(amostrador):
+    media, segundo = _momentos(amostrador.amostrar_catraca(AMOSTRAS))
+    assert momentos_catraca() == pytest.approx((media, segundo), rel=0.02)
+
+def _erlang_c(servidores, carga):
+    """Fórmula fechada do Erlang C, para conferir a recursão"""
+    rho = carga / servidores
+    ultimo = carga ** servidores / math.factorial(servidores) / (1 - rho)
+    return ultimo / (sum(carga ** k / math.factorial(k) for k in range(servidores)) + ultimo)
+
+@pytest.mark.parametrize('servidores, carga, esperado', [
+    (1, 0.5, 0.5),        # M/M/1: espera com probabilidade ρ
+    (2, 1.0, 1 / 3),
+    (10, 8.0, 0.40918),
+])
+def test_erlang_c_valores_conhecidos(servidores, carga, esperado):
+    assert probabilidade_espera(servidores, np.array([carga]))[0] == pytest.approx(esperado, abs=1e-5)
+
+def test_erlang_c_vetorizado_e_saturado():
+    cargas = np.array([0.0, 3.0, 12.5, 19.9, 20.0, 35.0])
+    probabilidades = probabilidade_espera(20, cargas)
+    assert probabilidades[0] == 0.0
+    assert probabilidades[1:4] == pytest.approx([_erlang_c(20, a) for a in cargas[1:4]], rel=1e-9)
+    assert np.all(probabilidades[4:] == 1.0)
+
+def test_etapa_sem_servidores():
+    with pytest.raises(ValueError):
+        EstacaoAnalitica(0, *momentos_revista(), config.ANALITICO_RESOLUCAO)
+    with pytest.raises(ValueError):
+        ModeloAnalitico(5000, agentes_revista=0).avaliar()
+    with pytest.raises(ValueError):
+        ModeloAnalitico(5000, catracas_por_portao={'D': 0}).avaliar()
+
+def test_mais_agentes_nunca_piora():
+    percentuais = [
+        ModeloAnalitico(20000, agentes_revista=agentes).avaliar()['percentual_entrada_antes_jogo']
+        for agentes in (10, 20, 40, 60, 80, 120, 200, 400)
+    ]
+    assert all(a <= b + 1e-9 for a, b in zip(percentuais, percentuais[1:]))
+    assert percentuais[0] < percentuais[-1]
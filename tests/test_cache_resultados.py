@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pytest
+
+import cache_resultados
+import configuracao as config
+import main
+from cache_resultados import CacheResultados, chave_replicacao
+
+SEMENTE = np.random.SeedSequence(11).spawn(2)[1]
+
+def test_chave_muda_com_o_que_afeta_o_resultado(monkeypatch):
+    base = chave_replicacao(SEMENTE, 1000)
+    assert chave_replicacao(SEMENTE, 1000) == base
+    assert chave_replicacao(np.random.SeedSequence(11).spawn(2)[1], 1000) == base  # mesma semente, outro objeto
+    
+    assert chave_replicacao(np.random.SeedSequence(11).spawn(2)[0], 1000) != base
+    assert chave_replicacao(SEMENTE, 2000) != base
+    assert chave_replicacao(SEMENTE, 1000, antitetico=True) != base
+    assert chave_replicacao(SEMENTE, 1000, cenario={'agentes_revista': 150}) != base
+    
+    with monkeypatch.context() as m:
+        m.setattr(config, 'TEMPO_REVISTA_MEDIA', config.TEMPO_REVISTA_MEDIA + 1)
+        assert chave_replicacao(SEMENTE, 1000) != base
+    with monkeypatch.context() as m:
+        m.setattr(cache_resultados, '_versao_codigo', 'outro codigo')
+        assert chave_replicacao(SEMENTE, 1000) != base
+
+def test_chave_ignora_parametros_de_execucao(monkeypatch):
+    base = chave_replicacao(SEMENTE, 1000)
+    monkeypatch.setattr(config, 'NUMERO_SIMULACOES', config.NUMERO_SIMULACOES + 5)
+    monkeypatch.setattr(config, 'NUM_PROCESSOS', 8)
+    monkeypatch.setattr(config, 'PRECISAO_RELATIVA', 0.5)
+    monkeypatch.setattr(config, 'EXPORTACAO_DIRETORIO', 'outro')
+    monkeypatch.setattr(config, 'RASTRO_COMPRESSAO', 'zlib')
+    assert chave_replicacao(SEMENTE, 1000) == base
+
+def test_lru_apaga_os_usados_ha_mais_tempo(tmp_path):
+    cache = CacheResultados(str(tmp_path), tamanho_maximo_mb=1)
+    carga = {'dados': b'x' * 300_000}
+    for i, chave in enumerate(['a', 'b', 'c']):
+        cache.guardar(chave, carga)
+        os.utime(cache._caminho(chave), (1000 + i, 1000 + i))
+    
+    assert cache.obter('a') is not None  # leitura renova 'a': agora 'b' é o mais antigo
+    cache.guardar('d', carga)             # passa de 1 MB
+    
+    assert cache.obter('b') is None
+    assert all(cache.obter(chave) is not None for chave in ['a', 'c', 'd'])
+    assert cache.tamanho_total() <= 1024 * 1024
+
+def test_arquivo_corrompido_conta_como_ausente(tmp_path):
+    cache = CacheResultados(str(tmp_path))
+    with open(cache._caminho('quebrado'), 'wb') as f:
+        f.write(b'\x80\x05')
+    assert cache.obter('quebrado') is None
+
+@pytest.fixture
+def cache_ligado(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_RESULTADOS', True)
+    monkeypatch.setattr(config, 'CACHE_DIRETORIO', str(tmp_path))
+    monkeypatch.setattr(config, 'TOTAL_TORCEDORES', 2000)
+    monkeypatch.setattr(config, 'NUMERO_SIMULACOES', 2)
+    monkeypatch.setattr(config, 'MOTOR_SIMULACAO', 'vetorizado')
+    return tmp_path
+
+@pytest.mark.parametrize('lote', [0, 2])
+def test_sem_semente_nao_usa_o_cache(cache_ligado, monkeypatch, lote):
+    monkeypatch.setattr(config, 'REPLICACOES_LOTE_VETORIZADO', lote)
+    main.GerenciadorSimulacoes(semente=None).executar_simulacoes(verbose=False)
+    assert os.listdir(cache_ligado) == []
+
+@pytest.mark.parametrize('lote', [0, 2])
+def test_com_semente_segunda_execucao_vem_do_cache(cache_ligado, monkeypatch, lote):
+    monkeypatch.setattr(config, 'REPLICACOES_LOTE_VETORIZADO', lote)
+    primeira = main.GerenciadorSimulacoes(semente=3)
+    primeira.executar_simulacoes(verbose=False)
+    assert len(os.listdir(cache_ligado)) == 2
+    
+    def nao_simular(*args, **kwargs):
+        raise AssertionError("deveria ter vindo do cache")
+    monkeypatch.setattr(main, 'SimuladorMineirao', nao_simular)
+    segunda = main.GerenciadorSimulacoes(semente=3)
+    segunda.executar_simulacoes(verbose=False)
+    assert segunda.estatisticas_agregadas == primeira.estatisticas_agregadas
@@ -0,0 +1,112 @@
+import pytest
+
+import configuracao as config
+import dimensionamento
+from dimensionamento import OtimizadorDimensionamento
+
+META = 95.0
+PORTOES = config.obter_portoes()
+
+class Regra:
+    """Cenário viável a partir de um número de agentes e de catracas em cada portão"""
+    
+    def __init__(self, agentes: int, catracas: dict):
+        self.agentes = agentes
+        self.catracas = catracas
+    
+    def portao_ok(self, agentes, catracas, portao):
+        return agentes >= self.agentes and catracas[portao] >= self.catracas[portao]
+    
+    def percentuais(self, agentes, catracas):
+        por_portao = {p: 100.0 if self.portao_ok(agentes, catracas, p) else 80.0 for p in PORTOES}
+        return min(por_portao.values()), por_portao
+
+@pytest.fixture
+def simulacao(monkeypatch):
+    """Troca as replicações por uma regra determinística e monótona e guarda as configurações testadas"""
+    estado = {'regra': Regra(1, {p: 1 for p in PORTOES}), 'testadas': []}
+    
+    def avaliar_replicacao(semente, total_torcedores, agentes, catracas, usar_cache=True):
+        estado['testadas'].append((agentes, dict(catracas)))
+        geral, por_portao = estado['regra'].percentuais(agentes, catracas)
+        return {'geral': geral, **por_portao}
+    
+    monkeypatch.setattr(dimensionamento, 'avaliar_replicacao', avaliar_replicacao)
+    return estado
+
+@pytest.fixture
+def previsao(monkeypatch):
+    """Modelo analítico falso: prevê a meta a partir de limites menores que os da simulação"""
+    estado = {'regra': Regra(1, {p: 1 for p in PORTOES})}
+    
+    class ModeloFalso:
+        def __init__(self, total_torcedores, agentes, catracas):
+            self.agentes, self.catracas = agentes, catracas
+        
+        def avaliar(self):
+            geral, por_portao = estado['regra'].percentuais(self.agentes, self.catracas)
+            return {'percentual_entrada_antes_jogo': geral, 'percentual_antes_jogo_por_portao': por_portao}
+    
+    monkeypatch.setattr(dimensionamento, 'ModeloAnalitico', ModeloFalso)
+    return estado
+
+def _otimizador(**kwargs):
+    parametros = dict(meta=META, semente=1, replicacoes_iniciais=3, tamanho_lote=2, maximo_replicacoes=9,
+                      limites_agentes=(1, 400), maximo_catracas=20, num_processos=1)
+    return OtimizadorDimensionamento(**{**parametros, **kwargs})
+
+@pytest.mark.parametrize('minimo', [1, 2, 137, 399, 400])
+def test_bissecao_acha_o_menor_numero_de_agentes(simulacao, minimo):
+    simulacao['regra'] = Regra(minimo, {p: 1 for p in PORTOES})
+    otimizador = _otimizador()
+    assert otimizador.minimo_agentes({p: 20 for p in PORTOES}) == minimo
+
+def test_sem_agentes_suficientes(simulacao):
+    simulacao['regra'] = Regra(401, {p: 1 for p in PORTOES})
+    assert _otimizador().minimo_agentes({p: 20 for p in PORTOES}) is None
+
+@pytest.mark.parametrize('metas_por_portao', [False, True])
+def test_otimizacao_completa(simulacao, previsao, metas_por_portao):
+    minimas = dict(zip(PORTOES, [7, 3, 12, 9, 5, 14]))
+    simulacao['regra'] = Regra(70, minimas)
+    resultado = _otimizador(metas_por_portao=metas_por_portao).otimizar(verbose=False)
+    assert resultado['agentes_revista'] == 70
+    assert resultado['catracas_por_portao'] == minimas
+
+def test_indefinida_no_maximo_conta_como_nao_atingida(monkeypatch):
+    def oscilante(centro):
+        # replicações pares abaixo e ímpares acima do centro: o IC nunca se decide perto da meta
+        def avaliar_replicacao(semente, total_torcedores, agentes, catracas, usar_cache=True):
+            return {'geral': centro + (5.0 if semente.spawn_key[-1] % 2 else -5.0)}
+        return avaliar_replicacao
+    
+    monkeypatch.setattr(dimensionamento, 'avaliar_replicacao', oscilante(META))
+    otimizador = _otimizador()
+    catracas = {p: 20 for p in PORTOES}
+    assert otimizador._decidir(100, catracas, ['geral']) == {'geral': False}
+    assert len(otimizador._amostras[otimizador._chave(100, catracas)]) == 9
+    assert otimizador.replicacoes_executadas == 9
+    
+    # longe da meta decide já com as replicações iniciais
+    monkeypatch.setattr(dimensionamento, 'avaliar_replicacao', oscilante(META + 30))
+    otimizador = _otimizador()
+    assert otimizador._decidir(100, catracas, ['geral']) == {'geral': True}
+    assert otimizador.replicacoes_executadas == 3
+
+def test_bonferroni_nas_metas_por_portao():
+    assert _otimizador(confianca=0.95)._confianca_teste == pytest.approx(0.95)
+    assert _otimizador(confianca=0.95, metas_por_portao=True)._confianca_teste == pytest.approx(
+        1 - 0.05 / (1 + len(PORTOES)))
+
+@pytest.mark.parametrize('metas_por_portao', [False, True])
+def test_busca_nao_desce_abaixo_da_triagem(simulacao, previsao, metas_por_portao):
+    # a simulação aceita qualquer configuração; só a triagem analítica segura a busca
+    previstas = dict(zip(PORTOES, [4, 2, 6, 5, 3, 6]))
+    previsao['regra'] = Regra(60, previstas)
+    resultado = _otimizador(metas_por_portao=metas_por_portao).otimizar(verbose=False)
+    
+    assert resultado['agentes_revista'] == 60
+    assert resultado['catracas_por_portao'] == previstas
+    for agentes, catracas in simulacao['testadas']:
+        assert agentes >= 60
+        assert all(catracas[p] >= previstas[p] for p in PORTOES), catracas
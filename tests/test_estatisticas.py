@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from estatisticas import AcumuladorWelford, ResumoStreaming, TDigest, quantil_t_student
+
+@pytest.fixture
+def valores():
+    # cauda longa, como os tempos de espera
+    return np.random.default_rng(7).lognormal(3.0, 1.0, 200_000)
+
+def _digest_em_lotes(valores, tamanho_lote=5000):
+    digest = TDigest(200)
+    for inicio in range(0, len(valores), tamanho_lote):
+        digest.adicionar_lote(valores[inicio:inicio + tamanho_lote])
+    return digest
+
+@pytest.mark.parametrize('q', [0.01, 0.1, 0.5, 0.9, 0.95, 0.99, 0.999])
+def test_tdigest_quantis_perto_do_exato(valores, q):
+    estimado = _digest_em_lotes(valores).quantil(q)
+    # erro medido em posto: a fração de valores abaixo da estimativa fica perto de q
+    assert abs(np.mean(valores <= estimado) - q) < 0.002
+    if q <= 0.99:
+        # no valor, só longe da ponta da cauda (lá a densidade é baixa e o valor varia muito)
+        assert estimado == pytest.approx(np.percentile(valores, q * 100), rel=0.02)
+
+def test_tdigest_memoria_limitada_e_mescla(valores):
+    metade = len(valores) // 2
+    a, b = _digest_em_lotes(valores[:metade]), _digest_em_lotes(valores[metade:])
+    a.mesclar(b)
+    assert len(a.medias) < 400
+    assert a.count == len(valores)
+    assert a.quantil(0.0) == valores.min() and a.quantil(1.0) == valores.max()
+    for q in (0.5, 0.95):
+        assert abs(np.mean(valores <= a.quantil(q)) - q) < 0.005
+
+def test_welford_lote_e_mescla(valores):
+    um_a_um = AcumuladorWelford()
+    for valor in valores[:2000].tolist():
+        um_a_um.adicionar(valor)
+    em_lotes = AcumuladorWelford()
+    for inicio in range(0, 2000, 300):
+        em_lotes.adicionar_lote(valores[inicio:min(inicio + 300, 2000)])
+    
+    for acumulador in (um_a_um, em_lotes):
+        assert acumulador.count == 2000
+        assert acumulador.media == pytest.approx(np.mean(valores[:2000]), rel=1e-12)
+        assert acumulador.desvio_padrao == pytest.approx(np.std(valores[:2000], ddof=1), rel=1e-10)
+        assert acumulador.minimo == valores[:2000].min() and acumulador.maximo == valores[:2000].max()
+
+def test_resumo_streaming_no_formato_do_exato(valores):
+    resumo = ResumoStreaming(tamanho_buffer=1000)
+    for valor in valores[:20_000].tolist():
+        resumo.adicionar(valor)
+    obtido = resumo.resumo()
+    assert obtido['count'] == 20_000
+    assert obtido['media'] == pytest.approx(np.mean(valores[:20_000]))
+    assert obtido['p95'] == pytest.approx(np.percentile(valores[:20_000], 95), rel=0.02)
+    assert ResumoStreaming().resumo()['count'] == 0
+
+@pytest.mark.parametrize('graus', [1, 2, 4, 10, 30])
+def test_quantil_t_student(graus):
+    # valores de tabela (bilateral 95% -> quantil 0.975)
+    tabela = {1: 12.706, 2: 4.303, 4: 2.776, 10: 2.228, 30: 2.042}
+    assert quantil_t_student(0.975, graus) == pytest.approx(tabela[graus], abs=2e-3)
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from eventos import BACKENDS_FEL, GerenciadorEventos, TipoEvento
+
+def _rastro(backend: str, semente: int):
+    """Sequência de eventos devolvida por um backend num traço aleatório de agendamentos e remoções"""
+    rng = random.Random(semente)
+    fel = BACKENDS_FEL[backend]()
+    saida = []
+    agora = 0.0
+    for passo in range(3000):
+        if fel.tem_eventos() and rng.random() < 0.45:
+            evento = fel.proximo_evento()
+            agora = evento[0]
+            saida.append(evento)
+        else:
+            # tempos arredondados para forçar empates (desempate pela ordem de agendamento)
+            atraso = round(rng.expovariate(1 / 30), 0) if rng.random() < 0.9 else rng.uniform(0, 5000)
+            fel.agendar(agora + atraso, TipoEvento(rng.randrange(4)), passo, rng.randrange(-1, 10))
+    while fel.tem_eventos():
+        saida.append(fel.proximo_evento())
+    return saida
+
+@pytest.mark.parametrize('semente', range(20))
+def test_calendario_igual_ao_heap(semente):
+    assert _rastro('calendario', semente) == _rastro('heap', semente)
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS_FEL))
+def test_fluxo_sai_antes_da_fel_no_empate(backend):
+    gerenciador = GerenciadorEventos(backend)
+    gerenciador.agendar_fluxo([1.0, 2.0, 2.0], TipoEvento.CHEGADA, [1, 2, 3])
+    gerenciador.agendar_evento_absoluto(2.0, TipoEvento.FIM_REVISTA, 9, 0)
+    gerenciador.agendar_evento_absoluto(1.5, TipoEvento.FIM_REVISTA, 8, 1)
+    
+    ordem = []
+    while gerenciador.tem_eventos():
+        tempo, _, tipo, torcedor, _ = gerenciador.proximo_evento()
+        ordem.append((tempo, torcedor))
+    assert ordem == [(1.0, 1), (1.5, 8), (2.0, 2), (2.0, 3), (2.0, 9)]
+    assert gerenciador.tempo_atual == 2.0
+
+def test_backend_desconhecido():
+    with pytest.raises(ValueError):
+        GerenciadorEventos('lista')
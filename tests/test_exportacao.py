@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+import configuracao as config
+import main
+from exportacao import (COLUNAS_EXPORTACAO, carregar_exportacao, carregar_metadados, carregar_torcedores,
+                        exportar_torcedores, replicacoes_exportadas)
+from main import SimuladorMineirao
+
+TORCEDORES = 2000
+
+@pytest.fixture(scope='module')
+def simulador():
+    simulador = SimuladorMineirao(TORCEDORES, semente=4, agentes_revista=80)
+    simulador.executar_simulacao(verbose=False)
+    return simulador
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_ida_e_volta(tmp_path, simulador, mmap):
+    diretorio = exportar_torcedores(simulador.cadastro, str(tmp_path), cenario={'agentes_revista': 80})
+    colunas = carregar_torcedores(diretorio, mmap=mmap)
+    
+    assert list(colunas) == list(COLUNAS_EXPORTACAO)
+    for coluna, tipo in COLUNAS_EXPORTACAO.items():
+        assert colunas[coluna].dtype == tipo
+        assert isinstance(colunas[coluna], np.memmap) == mmap
+    assert np.array_equal(colunas['id'], np.arange(1, TORCEDORES + 1))
+    for coluna in simulador.cadastro.COLUNAS_TEMPO + ('codigo_esplanada', 'codigo_portao'):
+        assert np.array_equal(colunas[coluna], getattr(simulador.cadastro, coluna)[1:], equal_nan=True), coluna
+    
+    metadados = carregar_metadados(diretorio)
+    assert metadados['total_torcedores'] == TORCEDORES
+    assert metadados['portoes'] == list(simulador.cadastro.portoes)
+    assert metadados['esplanadas'] == list(simulador.cadastro.esplanadas)
+    assert metadados['cenario'] == {'agentes_revista': 80}
+    
+    # os códigos decodificam para os nomes do cadastro
+    portoes = np.array(metadados['portoes'])[colunas['codigo_portao']]
+    assert portoes.tolist() == [simulador.cadastro.portoes[c] for c in simulador.cadastro.codigo_portao[1:]]
+
+def test_exportacao_das_replicacoes(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_RESULTADOS', False)
+    monkeypatch.setattr(config, 'TOTAL_TORCEDORES', TORCEDORES)
+    monkeypatch.setattr(config, 'NUMERO_SIMULACOES', 3)
+    monkeypatch.setattr(config, 'MOTOR_SIMULACAO', 'vetorizado')
+    
+    exportadas = {}
+    for lote in (0, 3):
+        monkeypatch.setattr(config, 'REPLICACOES_LOTE_VETORIZADO', lote)
+        diretorio = str(tmp_path / f'lote_{lote}')
+        main.GerenciadorSimulacoes(semente=8, diretorio_exportacao=diretorio).executar_simulacoes(verbose=False)
+        assert len(replicacoes_exportadas(diretorio)) == 3
+        exportadas[lote] = carregar_exportacao(diretorio)
+    
+    for uma_a_uma, lote in zip(exportadas[0], exportadas[3]):
+        for coluna in COLUNAS_EXPORTACAO:
+            assert np.array_equal(uma_a_uma[coluna], lote[coluna], equal_nan=True), coluna
+    
+    # a primeira replicação é a mesma de um simulador com a primeira semente derivada
+    simulador = SimuladorMineirao(TORCEDORES, semente=np.random.SeedSequence(8).spawn(1)[0], motor='vetorizado')
+    simulador.executar_simulacao(verbose=False)
+    for coluna in simulador.cadastro.COLUNAS_TEMPO:
+        assert np.array_equal(exportadas[0][0][coluna], getattr(simulador.cadastro, coluna)[1:]), coluna
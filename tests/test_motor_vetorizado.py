@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+import configuracao as config
+from estatisticas import ResumoStreaming
+from main import SimuladorMineirao
+from motor_vetorizado import atender_fifo, atender_fifo_lote, executar_lote_vetorizado
+
+TORCEDORES = 3000
+CENARIOS = [
+    (1, {}),
+    (2, {'agentes_revista': 40, 'catracas_por_portao': {'C': 3, 'F': 2}}),
+    (3, {'agentes_revista': 400, 'proporcao_esplanada_norte': 0.8}),
+]
+
+def _simular(semente, cenario, motor):
+    simulador = SimuladorMineirao(TORCEDORES, semente=semente, motor=motor, **cenario)
+    simulador.executar_simulacao(verbose=False)
+    return simulador
+
+def _mesmos_tempos(a, b):
+    for coluna in a.cadastro.COLUNAS_TEMPO:
+        assert np.array_equal(getattr(a.cadastro, coluna), getattr(b.cadastro, coluna), equal_nan=True), coluna
+
+def _achatar(valor, caminho=''):
+    """Relatório como {caminho: número}; os resumos streaming viram seus números"""
+    if isinstance(valor, ResumoStreaming):
+        valor = valor.resumo()
+    if isinstance(valor, dict):
+        return {k: v for chave, item in valor.items() for k, v in _achatar(item, f'{caminho}/{chave}').items()}
+    if isinstance(valor, (list, tuple)):
+        return {k: v for i, item in enumerate(valor) for k, v in _achatar(item, f'{caminho}[{i}]').items()}
+    return {caminho: valor}
+
+def _mesmo_relatorio(a, b):
+    # no modo streaming a ordem em que os torcedores entram nos resumos muda o arredondamento
+    relatorio_a = _achatar(a.estatisticas.relatorio_completo())
+    assert _achatar(b.estatisticas.relatorio_completo()) == pytest.approx(relatorio_a, rel=1e-9)
+
+@pytest.mark.parametrize('streaming', [False, True])
+@pytest.mark.parametrize('semente, cenario', CENARIOS)
+def test_mesmos_tempos_por_torcedor_que_o_laco_de_eventos(monkeypatch, semente, cenario, streaming):
+    monkeypatch.setattr(config, 'ESTATISTICAS_STREAMING', streaming)
+    eventos = _simular(semente, cenario, 'eventos')
+    vetorizado = _simular(semente, cenario, 'vetorizado')
+    
+    _mesmos_tempos(eventos, vetorizado)
+    _mesmo_relatorio(eventos, vetorizado)
+    
+    monitor_eventos = eventos.monitor.obter_relatorio_detalhado()
+    monitor_vetorizado = vetorizado.monitor.obter_relatorio_detalhado()
+    assert monitor_eventos['filas_maximas'] == monitor_vetorizado['filas_maximas']
+    for etapa, utilizacao in monitor_eventos['utilizacao_media'].items():
+        assert monitor_vetorizado['utilizacao_media'][etapa] == pytest.approx(utilizacao, rel=1e-9)
+
+def test_lote_igual_a_replicacoes_uma_a_uma():
+    sementes = np.random.SeedSequence(7).spawn(3)
+    cenario = {'agentes_revista': 60, 'catracas_por_portao': {'A': 2}}
+    uma_a_uma = [_simular(semente, cenario, 'vetorizado') for semente in sementes]
+    lote = [SimuladorMineirao(TORCEDORES, semente=semente, **cenario) for semente in sementes]
+    executar_lote_vetorizado(lote)
+    
+    for a, b in zip(uma_a_uma, lote):
+        _mesmos_tempos(a, b)
+        _mesmo_relatorio(a, b)
+
+def test_fifo_lote_igual_a_fifo():
+    rng = np.random.default_rng(0)
+    tamanhos, servidores = [50, 80, 0, 65], [1, 3, 2, 7]
+    chegadas = np.full((len(tamanhos), max(tamanhos)), np.inf)
+    duracoes = np.zeros_like(chegadas)
+    for linha, n in enumerate(tamanhos):
+        chegadas[linha, :n] = np.sort(rng.uniform(0, 100, n))
+        duracoes[linha, :n] = rng.exponential(5, n)
+    
+    inicios, fins, _ = atender_fifo_lote(chegadas, duracoes, servidores)
+    for linha, n in enumerate(tamanhos):
+        esperados_inicios, esperados_fins, _ = atender_fifo(
+            chegadas[linha, :n].tolist(), duracoes[linha, :n].tolist(), servidores[linha])
+        assert inicios[linha, :n].tolist() == esperados_inicios
+        assert fins[linha, :n].tolist() == esperados_fins
+
+def test_etapa_sem_servidores():
+    with pytest.raises(ValueError):
+        atender_fifo([1.0, 2.0], [1.0, 1.0], 0)
+    with pytest.raises(ValueError):
+        atender_fifo_lote(np.ones((2, 3)), np.ones((2, 3)), [2, 0])
+    with pytest.raises(ValueError):
+        SimuladorMineirao(TORCEDORES, semente=1, catracas_por_portao={'B': 0})
+    with pytest.raises(ValueError):
+        SimuladorMineirao(TORCEDORES, semente=1, agentes_revista=0)
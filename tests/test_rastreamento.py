@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+import configuracao as config
+from eventos import TipoEvento
+from main import SimuladorMineirao
+from rastreamento import REGISTRO_EVENTO, GravadorRastro, LeitorRastro
+
+def _eventos(n, semente=0):
+    rng = np.random.default_rng(semente)
+    tipos = [tipo.value for tipo in TipoEvento]
+    return [
+        (float(t), int(rng.choice(tipos)), int(rng.integers(1, 10**6)),
+         int(rng.integers(-1, 40)), int(rng.integers(-1, 6)), int(rng.integers(0, 500)))
+        for t in np.cumsum(rng.exponential(1.0, n))
+    ]
+
+@pytest.mark.parametrize('compressao', [None, 'zlib', 'lzma', 'bz2'])
+@pytest.mark.parametrize('tamanho_bloco', [1, 7, 1000])
+def test_ida_e_volta(tmp_path, compressao, tamanho_bloco):
+    caminho = str(tmp_path / 'rastro.bin')
+    eventos = _eventos(250)
+    with GravadorRastro(caminho, tamanho_bloco=tamanho_bloco, compressao=compressao) as gravador:
+        for evento in eventos:
+            gravador.registrar(*evento)
+    assert gravador.total_registros == len(eventos)
+    
+    leitor = LeitorRastro(caminho)
+    assert leitor.cabecalho['compressao'] == compressao
+    assert leitor.portoes == config.obter_portoes()
+    lidos = list(leitor)
+    assert [(t, tipo.value, torcedor, servidor, portao, fila) for t, tipo, torcedor, servidor, portao, fila in lidos] == eventos
+    assert all(isinstance(tipo, TipoEvento) for _, tipo, *_ in lidos)
+    assert len(leitor.ler_tudo()) == len(eventos)
+    assert all(len(bloco) <= tamanho_bloco for bloco in leitor.blocos())
+
+def test_rastro_vazio(tmp_path):
+    caminho = str(tmp_path / 'vazio.bin')
+    GravadorRastro(caminho).fechar()
+    assert LeitorRastro(caminho).ler_tudo().dtype == REGISTRO_EVENTO
+    assert len(LeitorRastro(caminho).ler_tudo()) == 0
+
+def test_gravacao_interrompida_le_ate_o_ultimo_bloco_completo(tmp_path):
+    caminho = str(tmp_path / 'rastro.bin')
+    eventos = _eventos(100)
+    with GravadorRastro(caminho, tamanho_bloco=30, compressao='zlib') as gravador:
+        for evento in eventos:
+            gravador.registrar(*evento)
+    
+    with open(caminho, 'rb') as f:
+        conteudo = f.read()
+    for corte in (1, 5, 20):
+        with open(caminho, 'wb') as f:
+            f.write(conteudo[:-corte])
+        assert len(LeitorRastro(caminho).ler_tudo()) == 90  # 3 blocos de 30; o de 10 ficou cortado
+
+def test_compressao_explicita_vence_a_configuracao(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'RASTRO_COMPRESSAO', 'zlib')
+    caminho = str(tmp_path / 'rastro.bin')
+    GravadorRastro(caminho, compressao=None).fechar()
+    assert LeitorRastro(caminho).cabecalho['compressao'] is None
+    GravadorRastro(caminho).fechar()
+    assert LeitorRastro(caminho).cabecalho['compressao'] == 'zlib'
+    with pytest.raises(ValueError):
+        GravadorRastro(caminho, compressao='zip')
+
+def test_arquivo_que_nao_e_rastro(tmp_path):
+    caminho = tmp_path / 'outro.bin'
+    caminho.write_bytes(b'nada a ver')
+    with pytest.raises(ValueError):
+        LeitorRastro(str(caminho))
+
+def test_rastro_da_simulacao_bate_com_o_cadastro(tmp_path):
+    caminho = str(tmp_path / 'rastro.bin')
+    referencia = SimuladorMineirao(3000, semente=9, agentes_revista=60)
+    referencia.executar_simulacao(verbose=False)
+    simulador = SimuladorMineirao(3000, semente=9, agentes_revista=60, arquivo_rastro=caminho)
+    simulador.executar_simulacao(verbose=False)
+    cadastro = simulador.cadastro
+    
+    # gravar o rastro não muda a simulação
+    for coluna in cadastro.COLUNAS_TEMPO:
+        assert np.array_equal(getattr(cadastro, coluna), getattr(referencia.cadastro, coluna), equal_nan=True)
+    
+    registros = LeitorRastro(caminho).ler_tudo()
+    assert len(registros) == 4 * 3000
+    assert np.all(np.diff(registros['tempo']) >= 0)
+    for tipo, coluna in ((TipoEvento.CHEGADA, 'tempo_chegada'), (TipoEvento.FIM_CATRACA, 'tempo_fim_catraca')):
+        do_tipo = registros[registros['tipo'] == tipo]
+        assert np.array_equal(do_tipo['tempo'], getattr(cadastro, coluna)[do_tipo['torcedor']])
+    
+    fins_catraca = registros[registros['tipo'] == TipoEvento.FIM_CATRACA]
+    assert np.array_equal(fins_catraca['portao'], cadastro.codigo_portao[fins_catraca['torcedor']])
+    revista = registros[registros['portao'] == -1]
+    filas_maximas = simulador.monitor.obter_relatorio_detalhado()['filas_maximas']
+    assert revista['fila'].max() == filas_maximas['revista']
+
+def test_rastro_exige_o_laco_de_eventos(tmp_path):
+    with pytest.raises(ValueError):
+        SimuladorMineirao(1000, semente=1, motor='vetorizado', arquivo_rastro=str(tmp_path / 'rastro.bin'))
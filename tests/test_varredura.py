@@ -0,0 +1,102 @@
+import os
+
+import pytest
+
+import configuracao as config
+from varredura import Varredura, carregar_tabela, planejamento_grade, resumo_por_cenario
+
+CENARIOS = planejamento_grade({'agentes_revista': [60, 90], 'catracas_A': [6, 10]})
+
+@pytest.fixture(autouse=True)
+def varredura_pequena(monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_RESULTADOS', False)
+    monkeypatch.setattr(config, 'MOTOR_SIMULACAO', 'vetorizado')
+    monkeypatch.setattr(config, 'VARREDURA_TRIAGEM_MINIMA', None)
+
+def _varredura(arquivo, semente=5):
+    return Varredura(CENARIOS, replicacoes=2, arquivo=str(arquivo), semente=semente,
+                     num_processos=1, total_torcedores=1500)
+
+def _ler(arquivo):
+    with open(arquivo, newline='') as f:
+        return f.read()
+
+def test_retomada_depois_de_linha_cortada(tmp_path):
+    completo = _varredura(tmp_path / 'completo.csv').executar(verbose=False)
+    conteudo = _ler(completo)
+    linhas = conteudo.splitlines(keepends=True)
+    assert len(linhas) == 1 + len(CENARIOS) * 2
+    
+    # gravação interrompida no meio da última linha
+    interrompido = tmp_path / 'interrompido.csv'
+    with open(interrompido, 'w', newline='') as f:
+        f.write(''.join(linhas[:-1]) + linhas[-1][:len(linhas[-1]) // 2])
+    
+    # a semente vem do arquivo, não do argumento
+    retomada = _varredura(interrompido, semente=999)
+    assert retomada.semente == 5
+    assert retomada.celulas_pendentes() == [(CENARIOS[-1], 2)]
+    retomada.executar(verbose=False)
+    
+    assert _ler(interrompido) == conteudo
+    assert len(carregar_tabela(str(interrompido))) == len(CENARIOS) * 2
+
+def test_cabecalho_cortado_recomeca_do_zero(tmp_path):
+    completo = _ler(_varredura(tmp_path / 'completo.csv').executar(verbose=False))
+    
+    interrompido = tmp_path / 'interrompido.csv'
+    with open(interrompido, 'w', newline='') as f:
+        f.write(completo[:10])
+    
+    retomada = _varredura(interrompido)
+    assert len(retomada.celulas_pendentes()) == len(CENARIOS) * 2
+    retomada.executar(verbose=False)
+    assert _ler(interrompido) == completo
+
+def test_arquivo_completo_nao_roda_nada(tmp_path):
+    arquivo = _varredura(tmp_path / 'v.csv').executar(verbose=False)
+    antes = os.path.getmtime(arquivo), _ler(arquivo)
+    assert _varredura(arquivo).celulas_pendentes() == []
+    _varredura(arquivo).executar(verbose=False)
+    assert (os.path.getmtime(arquivo), _ler(arquivo)) == antes
+
+def test_parametro_desconhecido():
+    with pytest.raises(ValueError):
+        planejamento_grade({'catracas_Z': [1]})
+
+def test_cenarios_com_parametros_diferentes(tmp_path):
+    cenarios = [{'agentes_revista': 60}, {'catracas_A': 6}]
+    arquivo = Varredura(cenarios, replicacoes=2, arquivo=str(tmp_path / 'v.csv'), semente=1,
+                        num_processos=1, total_torcedores=1500).executar(verbose=False)
+    
+    linhas = carregar_tabela(arquivo)
+    assert [(linha['agentes_revista'], linha['catracas_A']) for linha in linhas] == [
+        (60.0, None), (60.0, None), (None, 6.0), (None, 6.0)
+    ]
+    resumo = resumo_por_cenario(linhas)
+    assert [(r['agentes_revista'], r['catracas_A'], r['replicacoes']) for r in resumo] == [
+        (60.0, None, 2), (None, 6.0, 2)
+    ]
+
+def test_retomada_com_outro_total_de_torcedores(tmp_path):
+    arquivo = _varredura(tmp_path / 'v.csv').executar(verbose=False)
+    assert {linha['total_torcedores'] for linha in carregar_tabela(arquivo)} == {1500.0}
+    with pytest.raises(ValueError, match='total_torcedores'):
+        Varredura(CENARIOS, replicacoes=2, arquivo=arquivo, semente=5, num_processos=1, total_torcedores=5000)
+
+def test_retomada_com_outros_parametros(tmp_path):
+    arquivo = _varredura(tmp_path / 'v.csv').executar(verbose=False)
+    antes = _ler(arquivo)
+    with pytest.raises(ValueError, match='colunas'):
+        Varredura([{'agentes_revista': 60}], replicacoes=2, arquivo=arquivo, semente=5,
+                  num_processos=1, total_torcedores=1500)
+    assert _ler(arquivo) == antes
+
+def test_retomada_so_com_o_cabecalho(tmp_path):
+    completo = _ler(_varredura(tmp_path / 'completo.csv').executar(verbose=False))
+    
+    interrompido = tmp_path / 'interrompido.csv'
+    with open(interrompido, 'w', newline='') as f:
+        f.write(completo.splitlines(keepends=True)[0])
+    _varredura(interrompido).executar(verbose=False)
+    assert _ler(interrompido) == completo
@@ -0,0 +1,273 @@
+import csv
+import itertools
+import math
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple, Any
+
+import numpy as np
+
+from main import executar_replicacao, metricas_replicacao
+from analitico import ModeloAnalitico
+import configuracao as config
+
+# Colunas de parâmetros aceitas nos planejamentos (catracas de cada portão em colunas próprias)
+PARAMETROS_VARREDURA = (
+    ('agentes_revista', 'proporcao_esplanada_norte')
+    + tuple(f'catracas_{portao}' for portao in config.obter_portoes())
+)
+
+# Colunas da execução gravadas em toda linha (conferidas na retomada)
+COLUNAS_EXECUCAO = ('replicacao', 'semente', 'total_torcedores')
+
+def planejamento_grade(grade: Dict[str, List]) -> List[Dict[str, Any]]:
+    """Todas as combinações dos valores de cada parâmetro (produto cartesiano)"""
+    _validar_parametros(grade)
+    nomes = list(grade)
+    return [dict(zip(nomes, valores)) for valores in itertools.product(*grade.values())]
+
+def planejamento_lhs(intervalos: Dict[str, Tuple[float, float]], num_cenarios: int,
+                     semente: int = None) -> List[Dict[str, Any]]:
+    """
+    Hipercubo latino: cada parâmetro tem seu intervalo dividido em num_cenarios
+    faixas e cada faixa é usada exatamente uma vez. Intervalos com limites
+    inteiros geram valores inteiros.
+    """
+    _validar_parametros(intervalos)
+    rng = np.random.default_rng(semente)
+    colunas = {}
+    for nome, (minimo, maximo) in intervalos.items():
+        u = (rng.permutation(num_cenarios) + rng.random(num_cenarios)) / num_cenarios
+        valores = minimo + u * (maximo - minimo)
+        if isinstance(minimo, int) and isinstance(maximo, int):
+            colunas[nome] = np.rint(valores).astype(int).tolist()
+        else:
+            colunas[nome] = valores.tolist()
+    return [{nome: colunas[nome][k] for nome in intervalos} for k in range(num_cenarios)]
+
+def _validar_parametros(parametros: Dict):
+    desconhecidos = set(parametros) - set(PARAMETROS_VARREDURA)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros de varredura desconhecidos: {sorted(desconhecidos)}")
+
+def cenario_dos_parametros(parametros: Dict[str, Any]) -> Dict[str, Any]:
+    """Converte uma linha do planejamento nos argumentos de SimuladorMineirao"""
+    cenario = {}
+    catracas = {}
+    for nome, valor in parametros.items():
+        if nome.startswith('catracas_'):
+            catracas[nome[len('catracas_'):]] = int(valor)
+        elif nome == 'agentes_revista':
+            cenario[nome] = int(valor)
+        else:
+            cenario[nome] = float(valor)
+    if catracas:
+        cenario['catracas_por_portao'] = catracas
+    return cenario
+
+def executar_celula(parametros: Dict[str, Any], replicacao: int, semente: np.random.SeedSequence,
+                    total_torcedores: int = None) -> Dict[str, Any]:
+    """
+    Roda uma replicação de um cenário e devolve só a linha da tabela
+    (no nível do módulo para rodar no ProcessPoolExecutor).
+    """
+    resultado = executar_replicacao(replicacao, semente, total_torcedores,
+                                    cenario=cenario_dos_parametros(parametros))
+    return {**parametros, 'replicacao': replicacao, **metricas_replicacao(resultado)}
+
+class Varredura:
+    """
+    Executa cenários × replicações em paralelo e grava cada célula numa linha
+    de um CSV (formato "tidy": uma linha por cenário e replicação).
+    A replicação r usa a mesma semente em todos os cenários (números
+    aleatórios comuns). Se o arquivo já existir, as células prontas são
+    puladas e a varredura continua de onde parou (com a mesma semente; o
+    número de torcedores tem que ser o mesmo). Com `triagem_minima`, os
+    cenários em que o modelo analítico prevê menos que esse percentual de
+    torcedores dentro no início do jogo são descartados antes de simular.
+    """
+    
+    def __init__(self, cenarios: List[Dict[str, Any]], replicacoes: int = None, arquivo: str = None,
+                 semente: int = None, num_processos: int = None, total_torcedores: int = None,
+                 triagem_minima: float = None):
+        if not cenarios:
+            raise ValueError("A varredura precisa de pelo menos um cenário")
+        for parametros in cenarios:
+            _validar_parametros(parametros)
+        
+        self.replicacoes = replicacoes or config.VARREDURA_REPLICACOES
+        self.arquivo = arquivo or config.VARREDURA_ARQUIVO
+        self.num_processos = num_processos or config.NUM_PROCESSOS
+        self.total_torcedores = total_torcedores or config.TOTAL_TORCEDORES
+        self.triagem_minima = triagem_minima if triagem_minima is not None else config.VARREDURA_TRIAGEM_MINIMA
+        self.cenarios, self.descartados = self._triagem(cenarios)
+        self.parametros = [nome for nome in PARAMETROS_VARREDURA if any(nome in c for c in cenarios)]
+        
+        linhas_existentes = self._ler_existentes()
+        colunas_esperadas = self.parametros + list(COLUNAS_EXECUCAO)
+        if self._cabecalho and self._cabecalho[:len(colunas_esperadas)] != colunas_esperadas:
+            # linhas novas embaixo de outro cabeçalho sairiam com as colunas trocadas
+            raise ValueError(f"{self.arquivo} tem as colunas {self._cabecalho[:len(colunas_esperadas)]}, "
+                             f"mas estes cenários gravam {colunas_esperadas}; use outro arquivo")
+        if semente is None:
+            semente = config.SEMENTE
+        if linhas_existentes:
+            # retomada: as sementes têm que ser as mesmas da execução interrompida
+            semente = int(linhas_existentes[0]['semente'])
+            gravado = linhas_existentes[0].get('total_torcedores')
+            if gravado != str(self.total_torcedores):
+                raise ValueError(f"{self.arquivo} foi gerado com total_torcedores={gravado}, "
+                                 f"não {self.total_torcedores}; use outro arquivo")
+        elif semente is None:
+            semente = np.random.SeedSequence().entropy
+        self.semente = semente
+        self._prontas = {self._chave(linha, linha['replicacao']) for linha in linhas_existentes}
+    
+    def _triagem(self, cenarios: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Separa os cenários em aprovados e descartados pelo modelo analítico"""
+        if self.triagem_minima is None:
+            return cenarios, []
+        aprovados, descartados = [], []
+        for parametros in cenarios:
+            previsto = ModeloAnalitico(self.total_torcedores, **cenario_dos_parametros(parametros)).avaliar()
+            if previsto['percentual_entrada_antes_jogo'] >= self.triagem_minima:
+                aprovados.append(parametros)
+            else:
+                descartados.append(parametros)
+        if not aprovados:
+            raise ValueError(f"Nenhum cenário passou da triagem analítica ({self.triagem_minima}%)")
+        return aprovados, descartados
+    
+    def _chave(self, parametros: Dict[str, Any], replicacao) -> Tuple:
+        return tuple(str(parametros.get(nome, '')) for nome in self.parametros) + (str(replicacao),)
+    
+    def _ler_existentes(self) -> List[Dict[str, str]]:
+        """
+        Linhas já gravadas (descarta uma última linha cortada por interrupção);
+        o cabeçalho do arquivo fica em self._cabecalho (None se não houver)
+        """
+        self._cabecalho: Optional[List[str]] = None
+        if not os.path.exists(self.arquivo):
+            return []
+        
+        with open(self.arquivo, 'r+', newline='') as f:
+            conteudo = f.read()
+            if conteudo and not conteudo.endswith('\n'):
+                f.truncate(conteudo.rfind('\n') + 1)
+        
+        with open(self.arquivo, newline='') as f:
+            leitor = csv.DictReader(f)
+            linhas = list(leitor)
+            self._cabecalho = leitor.fieldnames
+        return linhas
+    
+    def celulas_pendentes(self) -> List[Tuple[Dict[str, Any], int]]:
+        return [
+            (parametros, r + 1)
+            for parametros in self.cenarios
+            for r in range(self.replicacoes)
+            if self._chave(parametros, r + 1) not in self._prontas
+        ]
+    
+    def executar(self, verbose: bool = True) -> str:
+        """Roda as células pendentes e devolve o caminho do CSV"""
+        sementes = np.random.SeedSequence(self.semente).spawn(self.replicacoes)
+        pendentes = self.celulas_pendentes()
+        total = len(self.cenarios) * self.replicacoes
+        
+        if verbose:
+            print(f"🔬 Varredura: {len(self.cenarios)} cenários × {self.replicacoes} replicações "
+                  f"({total - len(pendentes)} já prontas, {len(pendentes)} a executar)")
+            if self.descartados:
+                print(f"🧮 {len(self.descartados)} cenários descartados pela triagem analítica "
+                      f"(< {self.triagem_minima}% dentro no início do jogo)")
+            if self.num_processos > 1:
+                print(f"⚙️  Em paralelo: {self.num_processos} processos")
+        
+        if not pendentes:
+            return self.arquivo
+        
+        novo = self._cabecalho is None
+        with open(self.arquivo, 'a', newline='') as f:
+            escritor = None
+            concluidas = 0
+            
+            def gravar(linha: Dict[str, Any]):
+                nonlocal escritor, concluidas
+                linha['semente'] = self.semente
+                linha['total_torcedores'] = self.total_torcedores
+                if escritor is None:
+                    # na retomada, as colunas do arquivo (já conferidas no construtor)
+                    colunas = self._cabecalho or self.parametros + list(COLUNAS_EXECUCAO) + [
+                        c for c in linha if c not in self.parametros and c not in COLUNAS_EXECUCAO
+                    ]
+                    escritor = csv.DictWriter(f, fieldnames=colunas)
+                    if novo:
+                        escritor.writeheader()
+                escritor.writerow(linha)
+                f.flush()  # cada célula fica salva assim que termina
+                concluidas += 1
+                if verbose:
+                    print(f"   ✅ {concluidas}/{len(pendentes)} células", end='\r')
+            
+            if self.num_processos > 1:
+                with ProcessPoolExecutor(max_workers=self.num_processos) as executor:
+                    futuros = [
+                        executor.submit(executar_celula, parametros, r, sementes[r - 1], self.total_torcedores)
+                        for parametros, r in pendentes
+                    ]
+                    for futuro in as_completed(futuros):
+                        gravar(futuro.result())
+            else:
+                for parametros, r in pendentes:
+                    gravar(executar_celula(parametros, r, sementes[r - 1], self.total_torcedores))
+        
+        if verbose:
+            print(f"\n💾 Resultados em {self.arquivo}")
+        return self.arquivo
+
+def carregar_tabela(arquivo: str) -> List[Dict[str, Optional[float]]]:
+    """
+    Lê o CSV da varredura convertendo os números. Células vazias (parâmetro
+    que o cenário da linha não define, ficando no valor da configuração) viram None.
+    """
+    with open(arquivo, newline='') as f:
+        return [
+            {chave: float(valor) if valor != '' else None for chave, valor in linha.items()}
+            for linha in csv.DictReader(f)
+        ]
+
+def resumo_por_cenario(linhas: List[Dict[str, float]], metrica: str = 'percentual_entrada_antes_jogo') -> List[Dict[str, float]]:
+    """Média e erro padrão de uma métrica em cada cenário"""
+    parametros = [nome for nome in PARAMETROS_VARREDURA if nome in linhas[0]] if linhas else []
+    grupos: Dict[Tuple, List[float]] = {}
+    for linha in linhas:
+        grupos.setdefault(tuple(linha[nome] for nome in parametros), []).append(linha[metrica])
+    
+    resumo = []
+    for chave, valores in grupos.items():
+        n = len(valores)
+        resumo.append({
+            **dict(zip(parametros, chave)),
+            'replicacoes': n,
+            'media': statistics.mean(valores),
+            'erro_padrao': statistics.stdev(valores) / math.sqrt(n) if n > 1 else 0.0
+        })
+    return resumo
+
+def main():
+    """Varredura da grade definida em configuracao.VARREDURA_GRADE"""
+    print("🏟️ VARREDURA DE PARÂMETROS - ESTÁDIO MINEIRÃO")
+    print("=" * 50)
+    
+    varredura = Varredura(planejamento_grade(config.VARREDURA_GRADE))
+    arquivo = varredura.executar()
+    
+    print("\n🎯 Torcedores presentes no início do jogo, por cenário:")
+    for linha in resumo_por_cenario(carregar_tabela(arquivo)):
+        cenario = ", ".join(f"{nome}={linha[nome]:g}" for nome in varredura.parametros if linha[nome] is not None)
+        print(f"   {cenario}: {linha['media']:.2f}% (±{linha['erro_padrao']:.2f}, {linha['replicacoes']} rep.)")
+
+if __name__ == "__main__":
+    main()